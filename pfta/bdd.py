@@ -0,0 +1,471 @@
+"""
+# Public Fault Tree Analyser: bdd.py
+
+Binary decision diagrams for exact quantification.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import bisect
+import collections
+import math
+import operator
+from typing import Iterable, Sequence
+
+from pfta.boolean import Term, Expression
+from pfta.woe import ImplementationError
+from pfta.zbdd import EMPTY_NODE, BASE_NODE, ZeroSuppressedDiagram
+
+FALSE_NODE = 0
+TRUE_NODE = 1
+
+
+class BinaryDecisionDiagram:
+    """
+    A shared, reduced, ordered binary decision diagram (BDD), whose variables are event indices (in ascending order).
+
+    Each internal node represents the Shannon decomposition
+        f = x f[x=1] + (not x) f[x=0]
+    of a Boolean function f about its lowest variable x, with the cofactors f[x=1] (high) and f[x=0] (low)
+    themselves being nodes. Nodes are integers, with 0 for False and 1 for True.
+    Since a node is only ever created after its children, node order is a topological order (children first).
+
+    Note that all operations are iterative (not recursive), so as not to be limited by recursion depth.
+    """
+    _variables: list[float]
+    _lows: list[int]
+    _highs: list[int]
+    _node_from_triple: dict[tuple[int, int, int], int]
+    _computed_from_operation: dict[str, dict[tuple[int, int], int]]
+
+    def __init__(self):
+        self._variables = [math.inf, math.inf]  # terminals sit below all variables
+        self._lows = [FALSE_NODE, TRUE_NODE]
+        self._highs = [FALSE_NODE, TRUE_NODE]
+        self._node_from_triple = {}
+        self._computed_from_operation = {'and': {}, 'or': {}}
+
+    def __repr__(self):
+        return f'BinaryDecisionDiagram(<{len(self._variables)} nodes>)'
+
+    def make_node(self, variable: int, low: int, high: int) -> int:
+        """
+        Produce the (unique) node for a given variable and pair of cofactors, applying the reduction rules.
+        """
+        if low == high:  # redundant test
+            return low
+
+        triple = (variable, low, high)
+
+        try:
+            return self._node_from_triple[triple]
+        except KeyError:
+            node = len(self._variables)
+
+            self._variables.append(variable)
+            self._lows.append(low)
+            self._highs.append(high)
+            self._node_from_triple[triple] = node
+
+            return node
+
+    def conjunction(self, f: int, g: int) -> int:
+        return self._apply('and', f, g)
+
+    def disjunction(self, f: int, g: int) -> int:
+        return self._apply('or', f, g)
+
+    def from_term(self, term: Term) -> int:
+        """
+        Produce the node for a Boolean term (conjunction of events), built directly from the bottom up.
+        """
+        node = TRUE_NODE
+
+        for event_index in reversed(term.event_indices()):
+            node = self.make_node(event_index, FALSE_NODE, node)
+
+        return node
+
+    def from_expression(self, expression: Expression) -> int:
+        """
+        Produce the node for a Boolean expression (disjunction of terms), by balanced pairwise disjunction.
+        """
+        nodes = [self.from_term(term) for term in sorted(expression.terms)]
+
+        if not nodes:
+            return FALSE_NODE
+
+        while len(nodes) > 1:
+            nodes = [
+                self.disjunction(*nodes[i:i+2]) if i + 1 < len(nodes) else nodes[i]
+                for i in range(0, len(nodes), 2)
+            ]
+
+        return nodes[0]
+
+    def from_cut_set_diagram(self, cut_set_diagram: ZeroSuppressedDiagram, cut_set_node: int) -> int:
+        """
+        Produce the node for a family of cut sets stored in a zero-suppressed diagram, without enumerating the sets.
+
+        Since a cut set family node (x, F₀, F₁) represents the function f = f₀ + x f₁,
+        whose cofactors are f[x=0] = f₀ and f[x=1] = f₀ + f₁ (neither depending on x),
+        the conversion takes one disjunction per cut set family node (visited children first).
+        """
+        node_from_cut_set_node = {EMPTY_NODE: FALSE_NODE, BASE_NODE: TRUE_NODE}
+
+        for internal_node in cut_set_diagram.internal_nodes(cut_set_node):
+            low = node_from_cut_set_node[cut_set_diagram.low(internal_node)]
+            high = node_from_cut_set_node[cut_set_diagram.high(internal_node)]
+            variable = cut_set_diagram.variable(internal_node)
+
+            node_from_cut_set_node[internal_node] = self.make_node(variable, low, self.disjunction(low, high))
+
+        return node_from_cut_set_node[cut_set_node]
+
+    def node_count(self, root: int) -> int:
+        return len(self._reachable_nodes(root))
+
+    def probabilities(self, root: int, qs_from_variable: dict[int, Sequence[float]], size: int) -> list[float]:
+        """
+        Compute failure probabilities for the function at a node, across flattened indices.
+
+        Since the cofactors of a node are independent of its variable x,
+            q[f] = q[x] q[f[x=1]] + (1 − q[x]) q[f[x=0]],
+        which is evaluated once per node (in topological order), in time linear in the size of the diagram.
+        """
+        qs_from_node = {
+            FALSE_NODE: [0.] * size,
+            TRUE_NODE: [1.] * size,
+        }
+
+        for node, low, high, freed_children in self._topological_sweep(root):
+            q_xs = qs_from_variable[self._variables[node]]
+            q_lows = qs_from_node[low]
+            q_highs = qs_from_node[high]
+
+            qs_from_node[node] = [
+                q_x * q_high + (1 - q_x) * q_low
+                for q_x, q_low, q_high in zip(q_xs, q_lows, q_highs)
+            ]
+
+            for child in freed_children:
+                del qs_from_node[child]
+
+        return qs_from_node[root]
+
+    def intensities(self, root: int, qs_from_variable: dict[int, Sequence[float]],
+                    omegas_from_variable: dict[int, Sequence[float]], size: int) -> list[float]:
+        """
+        Compute failure intensities for the function at a node, across flattened indices (see `quantities`).
+        """
+        _, omegas = self.quantities(root, qs_from_variable, omegas_from_variable, size)
+        return omegas
+
+    def quantities(self, root: int, qs_from_variable: dict[int, Sequence[float]],
+                   omegas_from_variable: dict[int, Sequence[float]], size: int) -> tuple[list[float], list[float]]:
+        """
+        Compute failure probabilities and intensities for the function at a node, across flattened indices,
+        in a single sweep.
+
+        Differentiating the decomposition used for probabilities (with the cofactors being independent of x),
+            ω[f] = ω[x] (q[f[x=1]] − q[f[x=0]]) + q[x] ω[f[x=1]] + (1 − q[x]) ω[f[x=0]],
+        which amounts to the sum over events e of ω[e] weighted by the Birnbaum importance ∂q[f]/∂q[e].
+        Since this needs the probabilities of the cofactors anyway, both quantities are returned.
+        """
+        qs_from_node = {
+            FALSE_NODE: [0.] * size,
+            TRUE_NODE: [1.] * size,
+        }
+        omegas_from_node = {
+            FALSE_NODE: [0.] * size,
+            TRUE_NODE: [0.] * size,
+        }
+
+        for node, low, high, freed_children in self._topological_sweep(root):
+            variable = self._variables[node]
+            q_xs = qs_from_variable[variable]
+            omega_xs = omegas_from_variable[variable]
+
+            qs_from_node[node] = [
+                q_x * q_high + (1 - q_x) * q_low
+                for q_x, q_low, q_high in zip(q_xs, qs_from_node[low], qs_from_node[high])
+            ]
+            omegas_from_node[node] = [
+                omega_x * (q_high - q_low) + q_x * omega_high + (1 - q_x) * omega_low
+                for q_x, omega_x, q_low, q_high, omega_low, omega_high in zip(
+                    q_xs, omega_xs,
+                    qs_from_node[low], qs_from_node[high],
+                    omegas_from_node[low], omegas_from_node[high],
+                )
+            ]
+
+            for child in freed_children:
+                del qs_from_node[child]
+                del omegas_from_node[child]
+
+        return qs_from_node[root], omegas_from_node[root]
+
+    def birnbaum_importances(self, root: int, qs_from_variable: dict[int, Sequence[float]],
+                             size: int) -> tuple[list[float], dict[int, list[float]]]:
+        """
+        Compute failure probabilities for the function at a node, along with the Birnbaum importances
+            I_B[x] = ∂q[f]/∂q[x] = q[f[x=1]] − q[f[x=0]]
+        of every variable x, across flattened indices, in a forward sweep followed by a single backward sweep.
+
+        Since the diagram is ordered, only the paths through the nodes for x depend on q[x], whence
+            ∂q[f]/∂q[x] = ∑{nodes n for x} r[n] (q[n[x=1]] − q[n[x=0]]),
+        where the reach probability r[n] of a node accumulates r[m] q[y] from each parent m (for variable y)
+        having n as its high cofactor, and r[m] (1 − q[y]) from each parent having n as its low cofactor,
+        starting from r[root] = 1 (see `_reach_sweep`).
+        """
+        qs_from_node = self._node_probabilities(root, qs_from_variable, size)
+        importances_from_variable = {}
+
+        for node, reaches, _, _ in self._reach_sweep(root, qs_from_variable, size):
+            q_lows = qs_from_node[self._lows[node]]
+            q_highs = qs_from_node[self._highs[node]]
+
+            importances = importances_from_variable.setdefault(self._variables[node], [0.] * size)
+            importances[:] = [
+                importance + reach * (q_high - q_low)
+                for importance, reach, q_low, q_high in zip(importances, reaches, q_lows, q_highs)
+            ]
+
+        return qs_from_node[root], importances_from_variable
+
+    def cofactor_probabilities(
+        self, root: int, qs_from_variable: dict[int, Sequence[float]], variables: Sequence[int], size: int,
+    ) -> tuple[list[float], dict[int, dict[bool, list[float]]]]:
+        """
+        Compute failure probabilities for the function at a node, along with those of its cofactors
+        f[x=1] and f[x=0] about each of the given variables x, across flattened indices,
+        in a forward sweep followed by a single backward sweep.
+
+        Since the diagram is ordered, every path from the root to a terminal passes the level of x exactly once,
+        either through a node for x, or along an edge skipping x (from a node above x to a node below x). Hence
+            q[f[x=b]] = ∑{nodes n for x} r[n] q[n[x=b]] + ∑{edges skipping x} r[edge] q[edge target],
+        with reach probabilities as per `birnbaum_importances` (the root counting as reached by an edge from above).
+        Unlike q[f] − q[x] ∂q[f]/∂q[x], every summand is non-negative, so that there is no cancellation,
+        and a cofactor probability of zero is computed as exactly zero.
+        The skipping edges are accumulated over a segment tree of variable positions,
+        each edge adding to O(log V) segments (for V variables), again without subtraction.
+        """
+        variables = sorted(variables)
+        qs_from_node = self._node_probabilities(root, qs_from_variable, size)
+        leaf_offset = 1 << max(len(variables) - 1, 0).bit_length()  # segment tree leaves, from the left
+        skip_masses_from_segment = collections.defaultdict(lambda: [0.] * size)
+        cofactor_qs_from_boolean_from_variable = {
+            variable: {True: [0.] * size, False: [0.] * size}
+            for variable in variables
+        }
+
+        def accumulate(sums: list[float], values: Iterable[float]):
+            sums[:] = map(operator.add, sums, values)
+
+        def add_skip_masses(upper_variable: float, target: int, reaches: Sequence[float]):
+            if target == FALSE_NODE:
+                return
+
+            start = bisect.bisect_right(variables, upper_variable) + leaf_offset
+            stop = bisect.bisect_left(variables, self._variables[target]) + leaf_offset
+            masses = list(map(operator.mul, reaches, qs_from_node[target]))
+
+            while start < stop:
+                if start & 1:
+                    accumulate(skip_masses_from_segment[start], masses)
+                    start += 1
+
+                if stop & 1:
+                    stop -= 1
+                    accumulate(skip_masses_from_segment[stop], masses)
+
+                start >>= 1
+                stop >>= 1
+
+        add_skip_masses(-math.inf, root, [1.] * size)
+
+        for node, reaches, low_reaches, high_reaches in self._reach_sweep(root, qs_from_variable, size):
+            variable = self._variables[node]
+            low = self._lows[node]
+            high = self._highs[node]
+
+            if variable in cofactor_qs_from_boolean_from_variable:
+                cofactor_qs_from_boolean = cofactor_qs_from_boolean_from_variable[variable]
+                accumulate(cofactor_qs_from_boolean[False], map(operator.mul, reaches, qs_from_node[low]))
+                accumulate(cofactor_qs_from_boolean[True], map(operator.mul, reaches, qs_from_node[high]))
+
+            add_skip_masses(variable, low, low_reaches)
+            add_skip_masses(variable, high, high_reaches)
+
+        for position, variable in enumerate(variables):
+            segment = position + leaf_offset
+
+            while segment:
+                if segment in skip_masses_from_segment:
+                    for cofactor_qs in cofactor_qs_from_boolean_from_variable[variable].values():
+                        accumulate(cofactor_qs, skip_masses_from_segment[segment])
+
+                segment >>= 1
+
+        return qs_from_node[root], cofactor_qs_from_boolean_from_variable
+
+    def _apply(self, operation: str, f: int, g: int) -> int:
+        """
+        Apply a binary operation (`and` or `or`) to a pair of nodes, via an explicit stack with memoisation.
+        """
+        computed = self._computed_from_operation[operation]
+        stack = [(f, g, False)]
+
+        while stack:
+            f, g, is_expanded = stack.pop()
+            key = (f, g) if f <= g else (g, f)  # operations are commutative
+
+            if key in computed:
+                continue
+
+            if (terminal := self._terminal_case(operation, f, g)) is not None:
+                computed[key] = terminal
+                continue
+
+            variable = min(self._variables[f], self._variables[g])
+            f_low, f_high = self._cofactors(f, variable)
+            g_low, g_high = self._cofactors(g, variable)
+
+            if is_expanded:
+                low = computed[(f_low, g_low) if f_low <= g_low else (g_low, f_low)]
+                high = computed[(f_high, g_high) if f_high <= g_high else (g_high, f_high)]
+                computed[key] = self.make_node(variable, low, high)
+            else:
+                stack.append((f, g, True))
+                stack.append((f_low, g_low, False))
+                stack.append((f_high, g_high, False))
+
+        return computed[(f, g) if f <= g else (g, f)]
+
+    def _cofactors(self, node: int, variable: float) -> tuple[int, int]:
+        if self._variables[node] == variable:
+            return self._lows[node], self._highs[node]
+
+        return node, node  # node does not depend on variable
+
+    def _node_probabilities(self, root: int, qs_from_variable: dict[int, Sequence[float]],
+                            size: int) -> dict[int, list[float]]:
+        """
+        Compute failure probabilities for every node reachable from a root (as per `probabilities`),
+        keeping them all for a subsequent backward sweep.
+        """
+        qs_from_node = {
+            FALSE_NODE: [0.] * size,
+            TRUE_NODE: [1.] * size,
+        }
+
+        for node in sorted(self._reachable_nodes(root) - {FALSE_NODE, TRUE_NODE}):
+            q_xs = qs_from_variable[self._variables[node]]
+            qs_from_node[node] = [
+                q_x * q_high + (1 - q_x) * q_low
+                for q_x, q_low, q_high in zip(q_xs, qs_from_node[self._lows[node]], qs_from_node[self._highs[node]])
+            ]
+
+        return qs_from_node
+
+    def _reachable_nodes(self, root: int) -> set[int]:
+        reachable_nodes = set()
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+
+            if node in reachable_nodes:
+                continue
+
+            reachable_nodes.add(node)
+
+            if node not in (FALSE_NODE, TRUE_NODE):
+                stack.append(self._lows[node])
+                stack.append(self._highs[node])
+
+        return reachable_nodes
+
+    def _topological_sweep(self, root: int):
+        """
+        Yield the internal nodes reachable from a root (children first), along with their cofactors,
+        and the internal children whose last use (as a cofactor) is by the node, so that their values may be freed.
+        """
+        internal_nodes = sorted(self._reachable_nodes(root) - {FALSE_NODE, TRUE_NODE})
+        remaining_use_counts = collections.Counter(
+            child
+            for node in internal_nodes
+            for child in {self._lows[node], self._highs[node]}
+            if child not in (FALSE_NODE, TRUE_NODE)
+        )
+
+        for node in internal_nodes:
+            low = self._lows[node]
+            high = self._highs[node]
+            last_used_children = []
+
+            for child in {low, high} - {FALSE_NODE, TRUE_NODE}:
+                remaining_use_counts[child] -= 1
+
+                if remaining_use_counts[child] == 0:
+                    last_used_children.append(child)
+
+            yield node, low, high, last_used_children
+
+    def _reach_sweep(self, root: int, qs_from_variable: dict[int, Sequence[float]], size: int):
+        """
+        Yield the internal nodes reachable from a root (parents first), along with their reach probabilities
+        r[n] (the probability that evaluation passes through the node), and those of their low and high edges,
+            r[n] (1 − q[x]) and r[n] q[x],
+        which are accumulated into the reach probabilities of the cofactors.
+        Since parents are created after their children, each reach probability is complete before it is yielded.
+        """
+        internal_nodes = sorted(self._reachable_nodes(root) - {FALSE_NODE, TRUE_NODE})
+        reaches_from_node = {root: [1.] * size}
+
+        for node in reversed(internal_nodes):
+            q_xs = qs_from_variable[self._variables[node]]
+            reaches = reaches_from_node.pop(node)
+            low_reaches = [reach * (1 - q_x) for reach, q_x in zip(reaches, q_xs)]
+            high_reaches = [reach * q_x for reach, q_x in zip(reaches, q_xs)]
+
+            for child, child_edge_reaches in ((self._lows[node], low_reaches), (self._highs[node], high_reaches)):
+                if child in (FALSE_NODE, TRUE_NODE):
+                    continue
+
+                if child in reaches_from_node:
+                    reaches_from_node[child] = list(map(operator.add, reaches_from_node[child], child_edge_reaches))
+                else:
+                    reaches_from_node[child] = child_edge_reaches
+
+            yield node, reaches, low_reaches, high_reaches
+
+    @staticmethod
+    def _terminal_case(operation: str, f: int, g: int):
+        if operation == 'and':
+            if f == FALSE_NODE or g == FALSE_NODE:
+                return FALSE_NODE
+
+            if f == TRUE_NODE:
+                return g
+
+            if g == TRUE_NODE or f == g:
+                return f
+
+            return None
+
+        if operation == 'or':
+            if f == TRUE_NODE or g == TRUE_NODE:
+                return TRUE_NODE
+
+            if f == FALSE_NODE:
+                return g
+
+            if g == FALSE_NODE or f == g:
+                return f
+
+            return None
+
+        raise ImplementationError(f'bad operation `{operation}`')
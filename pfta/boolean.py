@@ -8,10 +8,11 @@ Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
 This is free software with NO WARRANTY etc. etc., see LICENSE.
 """
 
-import itertools
-from typing import Optional
+import collections
+import math
+from typing import Iterable, Optional
 
-from pfta.utilities import concrete_combinations
+from pfta.utilities import vote_counts
 from pfta.woe import ImplementationError
 
 
@@ -110,22 +111,31 @@ class Term:
 
         Since we only encounter coherent (NOT-free) logic, the result is merely an expression
         with the redundant terms removed as per the absorption law.
+
+        To avoid comparing every pair of terms, the distinct terms are visited in ascending order (by order),
+        so that every term that a given term might imply is decided before it.
+        The necessary terms are indexed by their lowest event index, so that when deciding a given term,
+        only the necessary terms indexed by events present in that term need be checked.
         """
-        undecided_terms = set(terms)
-        necessary_terms = set()
+        necessary_terms = []
+        necessary_terms_from_lowest_bit = collections.defaultdict(list)
+
+        for term in sorted(set(terms)):
+            if term.is_vacuous():  # term is True, which absorbs all other terms
+                return Expression(term)
 
-        while undecided_terms:
-            term = undecided_terms.pop()
+            remaining_encoding = term.encoding
 
-            for other_term in undecided_terms.copy():
-                if term.implies(other_term):  # term is redundant
-                    break
+            while remaining_encoding:
+                bit = remaining_encoding & -remaining_encoding
+                remaining_encoding ^= bit
 
-                if other_term.implies(term):  # other term is redundant
-                    undecided_terms.discard(other_term)
+                if any(term.implies(other_term) for other_term in necessary_terms_from_lowest_bit[bit]):
+                    break  # term is redundant
 
             else:  # term is not redundant (because `break` not executed)
-                necessary_terms.add(term)
+                necessary_terms.append(term)
+                necessary_terms_from_lowest_bit[term.encoding & -term.encoding].append(term)
 
         return Expression(*necessary_terms)
 
@@ -161,14 +171,27 @@ class Expression:
         self.terms = frozenset([*terms])
 
     def __eq__(self, other):
+        if not isinstance(other, Expression):
+            return NotImplemented  # in particular, never equal to a `ZeroSuppressedExpression` (hashed by node)
+
         return self.terms == other.terms
 
+    def __hash__(self):
+        return hash(self.terms)
+
     def __repr__(self):
         return f'Expression({", ".join(repr(t) for t in self.terms)})'
 
     def encodings(self) -> frozenset[int]:
         return frozenset(term.encoding for term in self.terms)
 
+    def event_indices(self) -> tuple[int, ...]:
+        return tuple(sorted(set(
+            event_index
+            for term in self.terms
+            for event_index in term.event_indices()
+        )))
+
     def sole_term_encoding(self) -> Optional[int]:
         if not self.terms:  # expression is False
             return None
@@ -217,35 +240,222 @@ class Expression:
         ))
 
     @staticmethod
-    def conjunction(*expressions: 'Expression') -> 'Expression':
+    def conjunction(*expressions: 'Expression', truncator: Optional['Truncator'] = None) -> 'Expression':
         """
         Compute the conjunction (AND) of a sequence of expressions.
 
         This involves summing (disjunction) over the products (conjunction) of the Cartesian combinations of terms,
         as per the distributive law.
+
+        Rather than materialising the entire Cartesian product before eliminating redundant terms,
+        we fold the expressions in pairwise (fewest terms first), eliminating redundant terms after each step,
+        so that the intermediate results stay close in size to the minimal result.
+        Furthermore, a term of the running result that already implies a term of the next expression
+        is carried over as is, since its products with the other terms of the next expression would be redundant.
+
+        If a truncator is supplied, negligible products are kept out of the elimination and discarded at each step,
+        so that their products with the terms of subsequent expressions are never formed.
         """
-        return Term.disjunction(*(
-            Term.conjunction(*terms)
-            for terms in itertools.product(*(expression.terms for expression in expressions))
-        ))
+        def multiply(term: Term, expression: Expression) -> tuple[Term, ...]:
+            if any(term.implies(other_term) for other_term in expression.terms):
+                return term,
+
+            return tuple(Term.conjunction(term, other_term) for other_term in expression.terms)
+
+        conjunction = Expression(Term(encoding=0))  # True
+
+        for expression in sorted(expressions, key=lambda e: len(e.terms)):
+            products = (
+                product
+                for term in conjunction.terms
+                for product in multiply(term, expression)
+            )
+
+            if truncator is None:
+                conjunction = Term.disjunction(*products)
+            else:
+                conjunction = truncator.disjunction(products)
+
+        return conjunction
 
     @staticmethod
-    def disjunction(*expressions: 'Expression') -> 'Expression':
+    def disjunction(*expressions: 'Expression', truncator: Optional['Truncator'] = None) -> 'Expression':
         """
         Compute the disjunction (OR) of a sequence of expressions.
+
+        If a truncator is supplied, negligible terms are discarded.
         """
-        return Term.disjunction(*(
+        terms = (
             term
             for expression in expressions
             for term in expression.terms
-        ))
+        )
+
+        if truncator is None:
+            return Term.disjunction(*terms)
+
+        return truncator.disjunction(terms)
 
     @staticmethod
-    def vote(*input_expressions: 'Expression', threshold: int) -> 'Expression':
+    def vote(*input_expressions: 'Expression', threshold: int, truncator: Optional['Truncator'] = None) -> 'Expression':
         """
         Compute the vote of a sequence of expressions.
+
+        Rather than conjoining every combination of `threshold` inputs, we use the recurrence
+            (at least k of the first i inputs) = (at least k of the first i−1 inputs)
+                                                 + (at least k−1 of the first i−1 inputs) . (ith input),
+        with redundant terms removed at each step, so that intermediate results are shared between combinations.
+
+        If the ith input is non-vacuous and shares no events with the first i−1 inputs,
+        then a product is redundant only if its factor from (at least k−1 of the first i−1 inputs)
+        is itself a term of (at least k of the first i−1 inputs), so the general removal is skipped for that step.
         """
-        return Expression.disjunction(*(
-            Expression.conjunction(*combo)
-            for combo in concrete_combinations(input_expressions, threshold)
-        ))
+        at_least_expressions = [Expression(Term(encoding=0))] + [Expression()] * threshold
+        input_count = len(input_expressions)
+        seen_encoding = 0
+
+        for i, expression in enumerate(input_expressions, start=1):
+            expression_encoding = 0
+
+            for term in expression.terms:
+                expression_encoding |= term.encoding
+
+            is_fresh = not expression_encoding & seen_encoding and Term(encoding=0) not in expression.terms
+            seen_encoding |= expression_encoding
+
+            for k in vote_counts(i, input_count, threshold):
+                at_least_terms = at_least_expressions[k].terms
+                at_least_fewer_terms = at_least_expressions[k-1].terms
+
+                if is_fresh:
+                    at_least_fewer_terms = at_least_fewer_terms - at_least_terms
+
+                products = (
+                    Term.conjunction(term, other_term)
+                    for term in at_least_fewer_terms
+                    for other_term in expression.terms
+                )
+
+                if truncator is not None:
+                    at_least_expression = truncator.disjunction((*at_least_terms, *products), is_minimal=is_fresh)
+                elif is_fresh:
+                    at_least_expression = Expression(*at_least_terms, *products)
+                else:
+                    at_least_expression = Term.disjunction(*at_least_terms, *products)
+
+                at_least_expressions[k] = at_least_expression
+
+        return at_least_expressions[threshold]
+
+
+class Truncator:
+    """
+    Discarder of negligible terms during expression construction.
+
+    A term is negligible if its order exceeds the maximum order,
+    or if its weight (the product of the weights of its events) falls below the cutoff.
+    Event weights are taken to be upper bounds on event probability (e.g. maxima across flattened indices),
+    so that the accumulated weight of discarded terms bounds the probability lost to truncation.
+
+    Note that since weights do not exceed unity, a term is never heavier (nor of lower order) than a term it implies,
+    so that a negligible term only ever absorbs negligible terms, and truncation commutes with the elimination
+    of redundant terms.
+    """
+    __slots__ = ('weight_from_event_index', 'cutoff', 'max_order', 'discarded_weight')
+
+    weight_from_event_index: dict[int, float]
+    cutoff: float
+    max_order: Optional[int]
+    discarded_weight: float
+
+    def __init__(self, weight_from_event_index: dict[int, float], cutoff: float = 0., max_order: Optional[int] = None):
+        self.weight_from_event_index = {
+            event_index: 1. if math.isnan(weight) else weight  # never discard terms of indeterminate weight
+            for event_index, weight in weight_from_event_index.items()
+        }
+        self.cutoff = cutoff
+        self.max_order = max_order
+        self.discarded_weight = 0.
+
+    def __repr__(self):
+        return (
+            f'Truncator(cutoff={self.cutoff!r}, max_order={self.max_order!r}, '
+            f'discarded_weight={self.discarded_weight!r})'
+        )
+
+    def term_weight(self, term: Term) -> float:
+        return math.prod(self.weight_from_event_index[event_index] for event_index in term.event_indices())
+
+    def admits_order(self, term: Term) -> bool:
+        return self.max_order is None or term.order() <= self.max_order
+
+    def disjunction(self, terms: Iterable[Term], is_minimal: bool = False) -> Expression:
+        """
+        Compute the disjunction of a collection of terms, with redundant terms removed and negligible terms discarded.
+
+        Terms exceeding the maximum order are discarded as they arrive, before the elimination proper
+        (they could only absorb terms that also exceed it). Their weight is accumulated (once per distinct term)
+        without checking whether they are themselves redundant, since that would require eliminating them
+        alongside the retained terms; the accumulated weight is therefore conservative.
+        Terms lighter than the cutoff are discarded after the elimination, so that only non-redundant ones count.
+        """
+        within_order_terms = []
+        beyond_order_terms = set()
+
+        for term in terms:
+            if self.admits_order(term):
+                within_order_terms.append(term)
+            else:
+                beyond_order_terms.add(term)
+
+        if is_minimal:
+            disjunction = Expression(*within_order_terms)
+        else:
+            disjunction = Term.disjunction(*within_order_terms)
+
+        self.discarded_weight += sum(self.term_weight(term) for term in beyond_order_terms)
+
+        if self.cutoff == 0:
+            return disjunction
+
+        retained_terms = []
+
+        for term in disjunction.terms:
+            weight = self.term_weight(term)
+
+            if weight < self.cutoff:
+                self.discarded_weight += weight
+            else:
+                retained_terms.append(term)
+
+        return Expression(*retained_terms)
+
+
+class ExpressionBuilder:
+    """
+    Builder of (explicit) expressions for gates, applying truncation if a truncator is supplied.
+
+    Presents the same interface as `ZeroSuppressedDiagram`, so that gates need not know the representation.
+    """
+    __slots__ = ('truncator',)
+
+    truncator: Optional[Truncator]
+
+    def __init__(self, truncator: Optional[Truncator] = None):
+        self.truncator = truncator
+
+    def __repr__(self):
+        return f'ExpressionBuilder(truncator={self.truncator!r})'
+
+    @staticmethod
+    def from_expression(expression: Expression) -> Expression:
+        return expression
+
+    def conjunction(self, *expressions: Expression) -> Expression:
+        return Expression.conjunction(*expressions, truncator=self.truncator)
+
+    def disjunction(self, *expressions: Expression) -> Expression:
+        return Expression.disjunction(*expressions, truncator=self.truncator)
+
+    def vote(self, *input_expressions: Expression, threshold: int) -> Expression:
+        return Expression.vote(*input_expressions, threshold=threshold, truncator=self.truncator)
@@ -8,96 +8,330 @@ Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
 This is free software with NO WARRANTY etc. etc., see LICENSE.
 """
 
+import array
 import collections
+import itertools
 import math
-from typing import TYPE_CHECKING, Collection, DefaultDict, Iterable, Optional
+from typing import TYPE_CHECKING, Callable, Collection, Iterable, Iterator, Optional, Sequence
 
+from pfta.bdd import BinaryDecisionDiagram
 from pfta.boolean import Term, Expression
 from pfta.common import natural_repr
-from pfta.utilities import robust_divide, descending_product, descending_sum, concrete_combinations
+from pfta.constants import ComputationalMethod, IntensityMethod
+from pfta.simulation import BitParallelSimulator
+from pfta.utilities import (
+    robust_divide, descending_product, descending_sum,
+    elementwise_sum, elementwise_product, elementwise_scale, vote_counts,
+)
+from pfta.woe import ImplementationError
+from pfta.zbdd import AnyExpression, ZeroSuppressedExpression
 
 if TYPE_CHECKING:
     from pfta.core import Event
 
+COMBINATION_CHUNK_SIZE = 1 << 16  # combinations compiled at a time, so as to bound memory usage
+DISJOINT_PRODUCT_LIMIT = 1 << 16  # disjoint products compiled for an expression, beyond which a diagram is used instead
+
 
 class ComputationalCache:
     """
     Class for caching laborious computations.
+
+    Quantities are cached as contiguous columns of floats (of length `flattened_size`), computed whole-column at once,
+    and keyed by term encoding (for terms) or by computational method and expression (for expressions).
+    Combinations of terms are never cached, being generated lazily (see `enumerate_combinations`).
     """
-    _q_from_index_from_encoding: DefaultDict[Optional[int], dict[int, float]]
-    _omega_from_index_from_encoding: DefaultDict[Optional[int], dict[int, float]]
-    _q_from_index_from_encodings: DefaultDict[frozenset[int], dict[int, float]]
-    _omega_from_index_from_encodings: DefaultDict[frozenset[int], dict[int, float]]
-    _combos_from_order_from_terms: DefaultDict[Collection[Term], dict[int, list[tuple[Term, ...]]]]
+    _qs_from_encoding: dict[Optional[int], array.array]
+    _omegas_from_encoding: dict[Optional[int], array.array]
+    _qs_from_expression: dict[tuple[ComputationalMethod, AnyExpression], array.array]
+    _omegas_from_expression: dict[tuple[ComputationalMethod, AnyExpression], array.array]
+    _probability_bounds_from_expression: dict[tuple[ComputationalMethod, AnyExpression],
+                                              tuple[array.array, array.array]]
+    _weight_from_event_index: dict[int, float]
+    _diagram: BinaryDecisionDiagram
+    _diagram_node_from_expression: dict[AnyExpression, int]
+    _disjoint_products_from_expression: dict[AnyExpression, Optional[list[tuple[Term, Term]]]]
+    _simulator: BitParallelSimulator
+    flattened_size: int
+    computational_method: ComputationalMethod
     truncation_tolerance: float
     truncation_order: Optional[int]
-
-    def __init__(self, events: list['Event'], truncation_tolerance: float, truncation_order: Optional[int]):
-        q_from_index_from_encoding = {
-            event.computed_expression.sole_term_encoding(): dict(enumerate(event.computed_probabilities))
+    pruning_fraction: float
+    absolute_gap: float
+    relative_gap: float
+    intensity_method: IntensityMethod
+
+    def __init__(self, events: list['Event'], flattened_size: int, computational_method: ComputationalMethod,
+                 truncation_tolerance: float, truncation_order: Optional[int], pruning_fraction: float = 0.,
+                 absolute_gap: float = 0., relative_gap: float = 0.,
+                 trial_count: int = 1 << 16, seed: Optional[str] = None,
+                 intensity_method: IntensityMethod = IntensityMethod.SERIES):
+        self._qs_from_encoding = {
+            event.computed_expression.sole_term_encoding(): float_column(event.computed_probabilities)
             for event in events
         }
-        omega_from_index_from_encoding = {
-            event.computed_expression.sole_term_encoding(): dict(enumerate(event.computed_intensities))
+        self._omegas_from_encoding = {
+            event.computed_expression.sole_term_encoding(): float_column(event.computed_intensities)
             for event in events
         }
-
-        self._q_from_index_from_encoding = collections.defaultdict(dict, q_from_index_from_encoding)
-        self._omega_from_index_from_encoding = collections.defaultdict(dict, omega_from_index_from_encoding)
-        self._q_from_index_from_encodings = collections.defaultdict(dict)
-        self._omega_from_index_from_encodings = collections.defaultdict(dict)
-        self._combos_from_order_from_terms = collections.defaultdict(dict)
+        self._qs_from_expression = {}
+        self._omegas_from_expression = {}
+        self._probability_bounds_from_expression = {}
+        self._weight_from_event_index = {}
+        self._diagram = BinaryDecisionDiagram()
+        self._diagram_node_from_expression = {}
+        self._disjoint_products_from_expression = {}
+        self._simulator = BitParallelSimulator(events, flattened_size, trial_count, seed)
+        self.flattened_size = flattened_size
+        self.computational_method = computational_method
         self.truncation_tolerance = truncation_tolerance
         self.truncation_order = truncation_order
+        self.pruning_fraction = pruning_fraction
+        self.absolute_gap = absolute_gap
+        self.relative_gap = relative_gap
+        self.intensity_method = intensity_method
 
     def __repr__(self):
-        return natural_repr(self, ellipsis_attributes=('truncation_tolerance', 'truncation_order'))
+        return natural_repr(
+            self,
+            ellipsis_attributes=(
+                'flattened_size', 'computational_method',
+                'truncation_tolerance', 'truncation_order', 'pruning_fraction', 'absolute_gap', 'relative_gap',
+                'intensity_method',
+            ),
+        )
 
     def term_probability(self, term: Term, index: int) -> float:
+        return self.term_probabilities(term)[index]
+
+    def term_intensity(self, term: Term, index: int) -> float:
+        return self.term_intensities(term)[index]
+
+    def term_rate(self, term: Term, index: int) -> float:
+        q = self.term_probability(term, index)
+        omega = self.term_intensity(term, index)
+
+        return robust_divide(omega, 1 - q)
+
+    def expression_probability(self, expression: AnyExpression, index: int,
+                               computational_method: Optional[ComputationalMethod] = None) -> float:
+        return self.expression_probabilities(expression, computational_method)[index]
+
+    def expression_intensity(self, expression: AnyExpression, index: int,
+                             computational_method: Optional[ComputationalMethod] = None) -> float:
+        return self.expression_intensities(expression, computational_method)[index]
+
+    def term_probabilities(self, term: Term) -> array.array:
         encoding = term.encoding
 
-        if index not in self._q_from_index_from_encoding[encoding]:
-            self._q_from_index_from_encoding[encoding][index] = uncached_term_probability(term, index, self)
+        if encoding not in self._qs_from_encoding:
+            self._qs_from_encoding[encoding] = float_column(uncached_term_probabilities(term, self))
 
-        return self._q_from_index_from_encoding[encoding][index]
+        return self._qs_from_encoding[encoding]
 
-    def term_intensity(self, term: Term, index: int) -> float:
+    def term_intensities(self, term: Term) -> array.array:
         encoding = term.encoding
 
-        if index not in self._omega_from_index_from_encoding[encoding]:
-            self._omega_from_index_from_encoding[encoding][index] = uncached_term_intensity(term, index, self)
+        if encoding not in self._omegas_from_encoding:
+            self._omegas_from_encoding[encoding] = float_column(uncached_term_intensities(term, self))
+
+        return self._omegas_from_encoding[encoding]
+
+    def expression_probabilities(self, expression: AnyExpression,
+                                 computational_method: Optional[ComputationalMethod] = None) -> array.array:
+        if computational_method is None:
+            computational_method = self.computational_method
+
+        key = (computational_method, expression)
+
+        if key not in self._qs_from_expression:
+            if computational_method == ComputationalMethod.INCLUSION_EXCLUSION:
+                probabilities, (lower_bounds, upper_bounds) = uncached_expression_probabilities(expression, self)
+                self._probability_bounds_from_expression.setdefault(
+                    key, (float_column(lower_bounds), float_column(upper_bounds)),
+                )
+            elif computational_method == ComputationalMethod.BINARY_DECISION_DIAGRAM:
+                probabilities = diagram_expression_probabilities(expression, self)
+            elif computational_method == ComputationalMethod.MONTE_CARLO:
+                probabilities = self._simulator.expression_probabilities(expression)
+            elif computational_method == ComputationalMethod.SUM_OF_DISJOINT_PRODUCTS:
+                probabilities = disjoint_products_expression_probabilities(expression, self)
+            else:  # approximations are cheap enough to compute intensities alongside
+                probabilities, _ = self.expression_quantities(expression, computational_method)
+
+            self._qs_from_expression[key] = float_column(probabilities)
+
+        return self._qs_from_expression[key]
+
+    def expression_intensities(self, expression: AnyExpression,
+                               computational_method: Optional[ComputationalMethod] = None) -> array.array:
+        _, intensities = self.expression_quantities(expression, computational_method)
+        return intensities
+
+    def expression_quantities(
+        self, expression: AnyExpression, computational_method: Optional[ComputationalMethod] = None,
+    ) -> tuple[array.array, array.array]:
+        """
+        Compute failure probabilities and intensities for an expression together, sharing the computational work
+        (a single sweep of the diagram, or a single enumeration of the combinations of each order).
+
+        For `InclusionExclusion` with intensity method `BirnbaumSum`, the probabilities (and their bounds) are computed
+        alone, and the intensities instead computed exactly from the Birnbaum importances of the events
+        (see `birnbaum_expression_intensities`).
+        """
+        if computational_method is None:
+            computational_method = self.computational_method
+
+        key = (computational_method, expression)
+
+        if key not in self._omegas_from_expression:
+            indeterminates = [float('nan')] * self.flattened_size
+
+            if (
+                computational_method == ComputationalMethod.INCLUSION_EXCLUSION
+                and self.intensity_method == IntensityMethod.BIRNBAUM_SUM
+            ):
+                probabilities = self.expression_probabilities(expression, computational_method)
+                intensities = birnbaum_expression_intensities(expression, self)
+                probability_bounds = self._probability_bounds_from_expression[key]
+            elif computational_method == ComputationalMethod.INCLUSION_EXCLUSION:
+                probabilities, intensities, probability_bounds = uncached_expression_quantities(expression, self)
+            elif computational_method == ComputationalMethod.BINARY_DECISION_DIAGRAM:
+                probabilities, intensities = diagram_expression_quantities(expression, self)
+                probability_bounds = (probabilities, probabilities)  # exact
+            elif computational_method == ComputationalMethod.RARE_EVENT:
+                probabilities, intensities = rare_event_expression_quantities(expression, self)
+                probability_bounds = (indeterminates, probabilities)
+            elif computational_method == ComputationalMethod.MIN_CUT_UPPER_BOUND:
+                probabilities, intensities = min_cut_upper_bound_expression_quantities(expression, self)
+                probability_bounds = (indeterminates, probabilities)
+            elif computational_method == ComputationalMethod.ESARY_PROSCHAN:
+                probabilities, intensities = esary_proschan_expression_quantities(expression, self)
+                probability_bounds = (probabilities, indeterminates)
+            elif computational_method == ComputationalMethod.MONTE_CARLO:
+                probabilities, intensities = self._simulator.expression_quantities(expression)
+                probability_bounds = (indeterminates, indeterminates)
+            elif computational_method == ComputationalMethod.SUM_OF_DISJOINT_PRODUCTS:
+                probabilities, intensities = disjoint_products_expression_quantities(expression, self)
+                probability_bounds = (probabilities, probabilities)  # exact
+            else:
+                raise ImplementationError(f'bad computational method `{computational_method}`')
+
+            lower_bounds, upper_bounds = probability_bounds
+
+            self._qs_from_expression.setdefault(key, float_column(probabilities))
+            self._omegas_from_expression[key] = float_column(intensities)
+            self._probability_bounds_from_expression[key] = (float_column(lower_bounds), float_column(upper_bounds))
+
+        return self._qs_from_expression[key], self._omegas_from_expression[key]
+
+    def expression_probability_bounds(
+        self, expression: AnyExpression, computational_method: Optional[ComputationalMethod] = None,
+    ) -> tuple[array.array, array.array]:
+        """
+        Lower and upper bounds on the failure probabilities for an expression, as reached by the computation
+        (nan where the computational method yields no bound).
+        """
+        if computational_method is None:
+            computational_method = self.computational_method
+
+        key = (computational_method, expression)
+
+        if key not in self._probability_bounds_from_expression:
+            self.expression_quantities(expression, computational_method)
+
+        return self._probability_bounds_from_expression[key]
+
+    def expression_cofactor_probabilities(
+        self, expression: AnyExpression,
+    ) -> tuple[list[float], dict[int, dict[bool, list[float]]]]:
+        """
+        Compute exact failure probabilities for an expression, along with those for the expression with each event
+        substituted by `True` and by `False`, in a single sweep of the diagram
+        (see `diagram_expression_cofactor_probabilities`).
+        """
+        return diagram_expression_cofactor_probabilities(expression, self)
+
+    def is_exact(self, computational_method: Optional[ComputationalMethod] = None) -> bool:
+        """
+        Decide whether a computational method yields exact results, given the truncation settings.
+        """
+        if computational_method is None:
+            computational_method = self.computational_method
+
+        if computational_method == ComputationalMethod.INCLUSION_EXCLUSION:
+            return (
+                self.truncation_order is None
+                and self.truncation_tolerance == 0
+                and self.pruning_fraction == 0
+                and self.absolute_gap == 0
+                and self.relative_gap == 0
+            )
 
-        return self._omega_from_index_from_encoding[encoding][index]
+        return computational_method in (
+            ComputationalMethod.BINARY_DECISION_DIAGRAM,
+            ComputationalMethod.SUM_OF_DISJOINT_PRODUCTS,
+        )
 
-    def term_rate(self, term: Term, index: int) -> float:
-        q = self.term_probability(term, index)
-        omega = self.term_intensity(term, index)
+    def register_term_probabilities(self, term: Term, probabilities: Iterable[float]):
+        """
+        Register failure probabilities for a term computed elsewhere, e.g. for the pseudo-event of a module.
+        """
+        self._qs_from_encoding[term.encoding] = float_column(probabilities)
 
-        return robust_divide(omega, 1 - q)
+    def register_term_intensities(self, term: Term, intensities: Iterable[float]):
+        """
+        Register failure intensities for a term computed elsewhere, e.g. for the pseudo-event of a module.
+        """
+        self._omegas_from_encoding[term.encoding] = float_column(intensities)
+
+    def diagram_node(self, expression: AnyExpression) -> int:
+        if expression not in self._diagram_node_from_expression:
+            if isinstance(expression, ZeroSuppressedExpression):  # convert without enumerating terms
+                node = self._diagram.from_cut_set_diagram(expression.diagram, expression.node)
+            else:
+                node = self._diagram.from_expression(expression)
 
-    def expression_probability(self, expression: Expression, index: int) -> float:
-        encodings = expression.encodings()
+            self._diagram_node_from_expression[expression] = node
 
-        if index not in self._q_from_index_from_encodings[encodings]:
-            probability = uncached_expression_probability(expression, index, self)
-            self._q_from_index_from_encodings[encodings][index] = probability
+        return self._diagram_node_from_expression[expression]
 
-        return self._q_from_index_from_encodings[encodings][index]
+    def diagram(self) -> BinaryDecisionDiagram:
+        return self._diagram
 
-    def expression_intensity(self, expression: Expression, index: int) -> float:
-        encodings = expression.encodings()
+    def disjoint_products(self, expression: AnyExpression) -> Optional[list[tuple[Term, Term]]]:
+        if expression not in self._disjoint_products_from_expression:
+            self._disjoint_products_from_expression[expression] = compile_disjoint_products(
+                expression.terms, DISJOINT_PRODUCT_LIMIT,
+            )
+
+        return self._disjoint_products_from_expression[expression]
+
+    def simulator(self) -> BitParallelSimulator:
+        return self._simulator
+
+    def encoding_weight(self, encoding: int) -> float:
+        """
+        Compute an upper bound (across flattened indices) on the failure probability of the term with given encoding,
+        being the product of the maximum failure probabilities of its events (with indeterminate values taken as unity).
+        """
+        weight = 1.
 
-        if index not in self._omega_from_index_from_encodings[encodings]:
-            intensity = uncached_expression_intensity(expression, index, self)
-            self._omega_from_index_from_encodings[encodings][index] = intensity
+        for event_index in Term(encoding).event_indices():
+            if event_index not in self._weight_from_event_index:
+                qs = self.term_probabilities(Term.create_from_event_index(event_index))
+                self._weight_from_event_index[event_index] = max((1. if math.isnan(q) else q for q in qs), default=1.)
 
-        return self._omega_from_index_from_encodings[encodings][index]
+            weight *= self._weight_from_event_index[event_index]
 
-    def term_combinations(self, terms: Collection[Term], order: int) -> list[tuple[Term, ...]]:
-        if order not in self._combos_from_order_from_terms[terms]:
-            self._combos_from_order_from_terms[terms][order] = concrete_combinations(terms, order)
+        return weight
 
-        return self._combos_from_order_from_terms[terms][order]
+
+def float_column(values: Iterable[float]) -> array.array:
+    """
+    Convert values to a contiguous column of double-precision floats (8 bytes per value).
+    """
+    return array.array('d', values)
 
 
 def constant_rate_model_probability(t: float, lambda_: float, mu: float) -> float:
@@ -207,24 +441,26 @@ def constant_rate_model_intensity(t: float, lambda_: float, mu: float) -> float:
     return lambda_ * (1 - q)
 
 
-def uncached_term_probability(term: Term, flattened_index: int, computational_cache: ComputationalCache) -> float:
+def uncached_term_probabilities(term: Term, computational_cache: ComputationalCache) -> list[float]:
     """
-    Instantaneous failure probability of a Boolean term (representing a minimal cut set).
+    Instantaneous failure probabilities of a Boolean term (representing a minimal cut set), across flattened indices.
 
     From `MATHS.md`, the failure probability of a minimal cut set `C = x y z ...` is given by
         q[C] = q[x] q[y] q[z] ...
              = ∏{e|C} q[e],
     a straight product of the failure probabilities of its constituent primary events (i.e. factors).
     """
-    def q(factor: Term) -> float:
-        return computational_cache.term_probability(factor, flattened_index)
+    factor_columns = [computational_cache.term_probabilities(factor) for factor in term.factors()]
+
+    if not factor_columns:  # term is True
+        return [descending_product(()) for _ in range(computational_cache.flattened_size)]
 
-    return descending_product(q(factor) for factor in term.factors())
+    return [descending_product(qs) for qs in zip(*factor_columns)]
 
 
-def uncached_term_intensity(term: Term, flattened_index: int, computational_cache: ComputationalCache) -> float:
+def uncached_term_intensities(term: Term, computational_cache: ComputationalCache) -> list[float]:
     """
-    Instantaneous failure intensity of a Boolean term (representing a minimal cut set).
+    Instantaneous failure intensities of a Boolean term (representing a minimal cut set), across flattened indices.
 
     From `MATHS.md`, the failure intensity of a minimal cut set `C = x y z ...`
     is given by a product-rule-style expression, where each term is the product of
@@ -235,22 +471,192 @@ def uncached_term_intensity(term: Term, flattened_index: int, computational_cach
                + ...
              = ∑{e|C} ω[e] q[C ÷ e].
     """
-    def q(factor: Term) -> float:
-        return computational_cache.term_probability(factor, flattened_index)
+    contribution_columns = [
+        elementwise_product(
+            computational_cache.term_intensities(factor),
+            computational_cache.term_probabilities(term / factor),
+        )
+        for factor in term.factors()
+    ]
 
-    def omega(reduced_term: Term) -> float:
-        return computational_cache.term_intensity(reduced_term, flattened_index)
+    if not contribution_columns:  # term is True
+        return [descending_sum(()) for _ in range(computational_cache.flattened_size)]
 
-    return descending_sum(
-        omega(factor) * q(term / factor)
-        for factor in term.factors()
-    )
+    return [descending_sum(contributions) for contributions in zip(*contribution_columns)]
+
+
+def event_disjoint_components(terms: Collection[Term]) -> list[Expression]:
+    """
+    Partition terms into components that share no events,
+    being the connected components of the graph in which terms sharing an event are adjacent.
+    """
+    components = []  # pairs of (union of encodings, terms)
+
+    for term in sorted(terms):
+        component_encoding = term.encoding
+        component_terms = [term]
+        disjoint_components = []
+
+        for encoding, other_terms in components:
+            if encoding & term.encoding:  # shares an event with the term, hence merged into the term's component
+                component_encoding |= encoding
+                component_terms.extend(other_terms)
+            else:
+                disjoint_components.append((encoding, other_terms))
+
+        components = [*disjoint_components, (component_encoding, component_terms)]
+
+    return [
+        Expression(*component_terms)
+        for _, component_terms in sorted(components, key=lambda component: min(component[1]))
+    ]
+
+
+def enumerate_combinations(terms: Sequence[Term], order: int, weight: Optional[Callable[[int], float]] = None,
+                           pruning_threshold: float = 0., pruning_cover: int = 0) -> Iterator[tuple[int, int]]:
+    """
+    Generate the conjunction and greatest common divisor (as encodings) of each combination of terms of a given order,
+    lazily by depth-first search (so that no list of combinations is ever materialised).
+
+    Each conjunction (resp. gcd) extends that of its prefix (the combination less its last term)
+    by a single bitwise OR (resp. AND), rather than being computed from scratch.
 
+    If a weight is given (an upper bound on failure probability, multiplicative over events),
+    the weight of each conjunction likewise extends that of its prefix (by the weight of the newly added events),
+    and a combination whose weight falls below the pruning threshold is pruned along with every extension of it
+    (since extending a conjunction can only decrease its weight).
 
-def uncached_expression_probability(expression: Expression, flattened_index: int,
-                                    computational_cache: ComputationalCache) -> float:
+    Similarly, if a pruning cover (encoding) is given, a combination whose conjunction covers it
+    (i.e. contains every one of its events) is pruned along with every extension of it.
+
+    The sole combination of order zero (the empty combination) has conjunction 0 (True) and gcd −1 (all bits set).
+    """
+    if order == 0:
+        yield 0, -1
+        return
+
+    encodings = [term.encoding for term in terms]
+    count = len(encodings)
+    stack = [(0, 0, 0, -1, 1.)]  # (next position, depth, prefix conjunction, prefix gcd, prefix weight)
+
+    while stack:
+        start, depth, prefix_conjunction, prefix_gcd, prefix_weight = stack.pop()
+
+        for position in range(start, count - order + depth + 1):
+            conjunction = prefix_conjunction | encodings[position]
+            gcd = prefix_gcd & encodings[position]
+
+            if pruning_cover and not pruning_cover & ~conjunction:
+                continue
+
+            if weight is None:
+                conjunction_weight = prefix_weight
+            elif (conjunction_weight := prefix_weight * weight(conjunction & ~prefix_conjunction)) < pruning_threshold:
+                continue
+
+            if depth + 1 == order:
+                yield conjunction, gcd
+            else:
+                stack.append((position + 1, depth + 1, conjunction, gcd, conjunction_weight))
+
+
+def compile_probability_polynomials(terms: Collection[Term], order: int,
+                                    weight: Optional[Callable[[int], float]] = None,
+                                    pruning_threshold: float = 0.) -> Iterator[list[tuple[int, Term]]]:
     """
-    Instantaneous failure probability for a general Boolean expression (a disjunction (OR) of terms).
+    Compile the rth-order inclusion–exclusion contribution for a disjunction of terms,
+        (−1)^(r−1) ∑{1≤i<j<...≤N} q[C_i C_j ...],
+    into (signed coefficient, conjunction) pairs, merging combinations that conjoin to the same term,
+    and omitting combinations pruned by weight (see `enumerate_combinations`).
+
+    Since many combinations conjoin to the same term (e.g. whenever terms share most of their events),
+    the contribution is then evaluated as a weighted sum over far fewer term probability columns.
+    So that memory usage is bounded, the combinations are compiled in successive chunks of limited size
+    (with merging happening within each chunk), rather than all at once.
+    """
+    sign = (-1) ** (order - 1)
+    combinations = enumerate_combinations(sorted(terms), order, weight, pruning_threshold)
+
+    while chunk := list(itertools.islice(combinations, COMBINATION_CHUNK_SIZE)):
+        count_from_encoding = collections.Counter(conjunction for conjunction, _ in chunk)
+
+        yield [
+            (sign * count, Term(encoding))
+            for encoding, count in sorted(count_from_encoding.items())
+        ]
+
+
+def compile_quantity_polynomials(terms: Sequence[Term], order: int,
+                                 weight: Optional[Callable[[int], float]] = None,
+                                 pruning_threshold: float = 0.) -> Iterator[tuple[list[tuple[int, Term]],
+                                                                                  list[tuple[int, Term, Term]]]]:
+    """
+    Compile the rth-order inclusion–exclusion contributions for both probability and intensity,
+        (−1)^(r−1) ∑{1≤i<j<...≤N} q[C_i C_j ...],
+        (−1)^(r−1) ∑{1≤i<j<...≤N} ω[gcd(C_i,C_j,...)] q[C_i C_j ... ÷ gcd(C_i,C_j,...)],
+    from a single enumeration of the combinations of terms (rather than one enumeration for each).
+
+    The probability contribution is compiled into (signed coefficient, conjunction) pairs,
+    as per `compile_probability_polynomials` (with combinations pruned by weight, along with their extensions,
+    omitted from both contributions). The intensity contribution is compiled into
+    (signed coefficient, gcd, conjunction ÷ gcd) triples, merging combinations with the same gcd and quotient,
+    and omitting combinations whose gcd is True (for which ω vanishes).
+    """
+    sign = (-1) ** (order - 1)
+    combinations = enumerate_combinations(terms, order, weight, pruning_threshold)
+
+    while chunk := list(itertools.islice(combinations, COMBINATION_CHUNK_SIZE)):
+        count_from_encoding = collections.Counter(conjunction for conjunction, _ in chunk)
+        count_from_encoding_pair = collections.Counter(
+            (gcd, conjunction & ~gcd)
+            for conjunction, gcd in chunk
+            if gcd
+        )
+
+        yield (
+            [
+                (sign * count, Term(encoding))
+                for encoding, count in sorted(count_from_encoding.items())
+            ],
+            [
+                (sign * count, Term(gcd_encoding), Term(quotient_encoding))
+                for (gcd_encoding, quotient_encoding), count in sorted(count_from_encoding_pair.items())
+            ],
+        )
+
+
+def compile_omega_dagger_polynomials(terms: Sequence[Term], order: int, gcd_encoding: int,
+                                     quotient_encoding: int) -> Iterator[list[tuple[int, Term, Term]]]:
+    """
+    Compile the tth-order contribution to ω^† for a combination with given gcd and quotient (conjunction ÷ gcd),
+        (−1)^(t−1) ∑{1≤a<b<...≤N} ω[gcd ÷ (C_a C_b ...)] q[(C_a C_b ...) quotient],
+    into (signed coefficient, gcd ÷ failed conjunction, failed conjunction × quotient) triples,
+    merging combinations that give the same pair.
+
+    Since ω of True vanishes, combinations (of failed terms) whose conjunction covers the gcd are omitted,
+    being pruned along with every extension of them (see `enumerate_combinations`).
+    """
+    sign = (-1) ** (order - 1)
+    combinations = enumerate_combinations(terms, order, pruning_cover=gcd_encoding)
+
+    while chunk := list(itertools.islice(combinations, COMBINATION_CHUNK_SIZE)):
+        count_from_encoding_pair = collections.Counter(
+            (gcd_encoding & ~failed_conjunction, failed_conjunction | quotient_encoding)
+            for failed_conjunction, _ in chunk
+        )
+
+        yield [
+            (sign * count, Term(divided_gcd_encoding), Term(product_encoding))
+            for (divided_gcd_encoding, product_encoding), count in sorted(count_from_encoding_pair.items())
+        ]
+
+
+def uncached_expression_probabilities(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], tuple[list[float], list[float]]]:
+    """
+    Instantaneous failure probabilities for a general Boolean expression (a disjunction (OR) of terms),
+    across flattened indices, along with the lower and upper bounds on the probabilities reached.
 
     From `MATHS.md`, for a gate `T` represented as a disjunction of `N` minimal cut sets,
         T = C_1 + C_2 + ... + C_N,
@@ -261,44 +667,98 @@ def uncached_expression_probability(expression: Expression, flattened_index: int
                − ... .
     In the implementation, we truncate if the truncation order is reached,
     or after the latest contribution divided by the partial sum falls below the truncation tolerance.
+
+    Each order's contribution is compiled into a weighted sum of conjunctions
+    with combinations having the same conjunction merged (see `compile_probability_polynomials`),
+    which is then evaluated over entire columns of values (rather than once per flattened index).
+    Truncation by tolerance is decided per flattened index, with the truncated indices masked from accumulation,
+    and we stop early once every flattened index has been truncated.
+    Furthermore, combinations whose probability is bounded (across flattened indices) below the pruning fraction
+    times the smallest untruncated partial sum are pruned (along with every combination extending them);
+    this threshold is never lowered from one order to the next, so that every superset of a pruned combination
+    (at a higher order) is pruned as well. Unlike truncation by tolerance, the resulting error is not bounded.
+
+    By the Bonferroni inequalities, the partial sums truncated at odd orders are upper bounds on `q[T]`,
+    and those truncated at even orders are lower bounds (see `BonferroniBounds`).
+    We also truncate (per flattened index) once the gap between the tightest bounds reached
+    falls within the absolute gap target, or within the relative gap target times the upper bound.
+
+    If the terms split into components that share no events, the components are independent,
+    and are quantified separately (each with its own truncation) and combined as for an OR gate,
+        q[T] = 1 − ∏{k} (1 − q[T_k]),
+    which replaces combinations of all N terms with combinations within each (much smaller) component.
     """
     terms = expression.terms
+    size = computational_cache.flattened_size
+
+    if len(components := event_disjoint_components(terms)) > 1:
+        component_qs = [
+            computational_cache.expression_probabilities(component, ComputationalMethod.INCLUSION_EXCLUSION)
+            for component in components
+        ]
+        component_bounds = [
+            computational_cache.expression_probability_bounds(component, ComputationalMethod.INCLUSION_EXCLUSION)
+            for component in components
+        ]
+        return (
+            disjunction_probabilities(component_qs, size),
+            (
+                disjunction_probabilities([lower_bounds for lower_bounds, _ in component_bounds], size),
+                disjunction_probabilities([upper_bounds for _, upper_bounds in component_bounds], size),
+            ),
+        )
 
-    and_ = Term.conjunction
-    combinations = computational_cache.term_combinations
+    def qs(term: Term) -> array.array:
+        return computational_cache.term_probabilities(term)
 
-    def q(term: Term) -> float:
-        return computational_cache.term_probability(term, flattened_index)
+    def q_contributions(order: int, pruning_threshold: float) -> list[float]:
+        weight = computational_cache.encoding_weight if pruning_threshold > 0 else None
 
-    def q_contribution(order: int) -> float:
-        return (
-            (-1) ** (order - 1)
-            * sum(
-                q(and_(*combo))
-                for combo in combinations(terms, order)
-            )
+        return elementwise_sum(
+            (
+                elementwise_scale(coefficient, qs(conjunction))
+                for polynomial in compile_probability_polynomials(terms, order, weight, pruning_threshold)
+                for coefficient, conjunction in polynomial
+            ),
+            size,
         )
 
-    partial_sum = 0.
+    partial_sums = [0.] * size
+    truncation_mask = [False] * size
+    bounds = BonferroniBounds(size, 1., len(terms), computational_cache.absolute_gap, computational_cache.relative_gap)
 
-    for r in range(1, len(terms) + 1):
-        latest = q_contribution(order=r)
+    pruning_threshold = 0.  # never lowered from one order to the next
 
-        partial_sum += latest
+    for r in range(1, len(terms) + 1):
+        untruncated_magnitudes = [abs(s) for s, is_truncated in zip(partial_sums, truncation_mask) if not is_truncated]
+        running_magnitude = min(untruncated_magnitudes, default=0.)
+        pruning_threshold = max(pruning_threshold, computational_cache.pruning_fraction * running_magnitude)
+        latests = q_contributions(order=r, pruning_threshold=pruning_threshold)
+        is_bounding = pruning_threshold == 0  # pruned partial sums are not bounds
+
+        accumulate_unmasked(
+            partial_sums, latests, truncation_mask, computational_cache.truncation_tolerance,
+            bounds if is_bounding else None, r,
+        )
 
         if r == computational_cache.truncation_order:
             break
 
-        if is_within_truncation_tolerance(latest, partial_sum, computational_cache.truncation_tolerance):
+        if all(truncation_mask):
             break
 
-    return partial_sum
+    return partial_sums, (bounds.lower_bounds, bounds.upper_bounds)
 
 
-def uncached_expression_intensity(expression: Expression, flattened_index: int,
-                                  computational_cache: ComputationalCache) -> float:
+def uncached_expression_quantities(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], list[float], tuple[list[float], list[float]]]:
     """
-    Instantaneous failure intensity for a general Boolean expression (a disjunction (OR) of terms).
+    Instantaneous failure probabilities and intensities for a general Boolean expression
+    (a disjunction (OR) of terms), across flattened indices,
+    along with the lower and upper bounds on the probabilities reached.
+
+    The probabilities (and their bounds) are as per `uncached_expression_probabilities`.
 
     From `MATHS.md`, for a gate `T` represented as a disjunction of `N` minimal cut sets,
         T = C_1 + C_2 + ... + C_N,
@@ -332,77 +792,739 @@ def uncached_expression_intensity(expression: Expression, flattened_index: int,
     Thus, we truncate if the truncation order is reached, or after the latest contribution
         (ω^1 rth-order contribution) − (ω^2 (1,...,r−2)th-order contributions' ω^† (r−1)th-order contribution)
                                      − (ω^2 (r−1)th-order contribution with ω^† truncated at (r−1)th-order)
-    divided by the partial sum falls below the truncation tolerance.
+    divided by the partial sum falls below the truncation tolerance (decided per flattened index, as for probability),
+    or once the gap between the successive bounds falls within the gap targets (as for probability).
+
+    The probabilities and intensities are computed in a single pass, with each order's combinations enumerated once
+    for both the probability contribution and the ω^1 contribution (see `compile_quantity_polynomials`).
+    The probabilities and intensities are truncated independently, the pass continuing until both have been truncated.
+
+    Since ω^† depends on a combination only through its gcd and quotient (conjunction ÷ gcd),
+    combinations are merged by this key (with those having gcd True, for which ω^† vanishes, skipped outright),
+    within chunks of bounded size. The ω^2 contributions are regrouped so that each key's ω^† contribution
+    of each order is computed once, without holding keys (or their ω^† partial sums) across orders,
+    and failed combinations whose conjunction covers the gcd are pruned (see `compile_omega_dagger_polynomials`).
+
+    If the terms split into components that share no events, the components are quantified separately,
+    and combined as for an OR gate (see `disjunction_intensities`),
+    with the probability bounds combined likewise (the OR gate probability being increasing in each input probability).
     """
     terms = expression.terms
+    size = computational_cache.flattened_size
+
+    if len(components := event_disjoint_components(terms)) > 1:
+        component_quantities = [
+            computational_cache.expression_quantities(component, ComputationalMethod.INCLUSION_EXCLUSION)
+            for component in components
+        ]
+        component_bounds = [
+            computational_cache.expression_probability_bounds(component, ComputationalMethod.INCLUSION_EXCLUSION)
+            for component in components
+        ]
+        component_qs = [qs for qs, _ in component_quantities]
+        component_omegas = [omegas for _, omegas in component_quantities]
+        component_lower_bounds = [lower_bounds for lower_bounds, _ in component_bounds]
+        component_upper_bounds = [upper_bounds for _, upper_bounds in component_bounds]
+        return (
+            disjunction_probabilities(component_qs, size),
+            disjunction_intensities(component_qs, component_omegas, size),
+            (
+                disjunction_probabilities(component_lower_bounds, size),
+                disjunction_probabilities(component_upper_bounds, size),
+            ),
+        )
 
-    gcd = Term.gcd
-    and_ = Term.conjunction
-    combinations = computational_cache.term_combinations
-
-    def q(term: Term) -> float:
-        return computational_cache.term_probability(term, flattened_index)
-
-    def omega(term: Term) -> float:
-        return computational_cache.term_intensity(term, flattened_index)
+    sorted_terms = sorted(terms)
 
-    def omega_1_contribution(order: int) -> float:
+    def intensity_products(polynomial: Iterable[tuple[int, Term, Term]]) -> Iterator[list[float]]:
         return (
-            (-1) ** (order - 1)
-            * sum(
-                omega(combo_gcd) * q(and_(*combo) / combo_gcd)
-                for combo in combinations(terms, order)
-                if not (combo_gcd := gcd(*combo)).is_vacuous()  # skip q computation if omega is zero
+            elementwise_scale(
+                coefficient,
+                elementwise_product(
+                    computational_cache.term_intensities(omega_factor),
+                    computational_cache.term_probabilities(q_factor),
+                ),
             )
+            for coefficient, omega_factor, q_factor in polynomial
         )
 
-    def omega_2_contribution(order: int, omega_dagger_orders: Iterable[int]) -> float:
-        return (
-            (-1) ** (order - 1)
-            * sum(
-                omega_dagger_contributions(combo, omega_dagger_orders)
-                for combo in combinations(terms, order)
-            )
+    def q_contributions(order: int, pruning_threshold: float) -> list[float]:
+        weight = computational_cache.encoding_weight if pruning_threshold > 0 else None
+
+        return elementwise_sum(
+            (
+                elementwise_scale(coefficient, computational_cache.term_probabilities(conjunction))
+                for polynomial in compile_probability_polynomials(sorted_terms, order, weight, pruning_threshold)
+                for coefficient, conjunction in polynomial
+            ),
+            size,
         )
 
-    def omega_dagger_contributions(combo: tuple[Term, ...], orders: Iterable[int]) -> float:
-        return sum(
-            omega_dagger_contribution(combo, order)
-            for order in orders
+    def q_and_omega_1_contributions(order: int, pruning_threshold: float) -> tuple[list[float], list[float]]:
+        weight = computational_cache.encoding_weight if pruning_threshold > 0 else None
+        q_contributions = [0.] * size
+        omega_1_contributions = [0.] * size
+
+        for q_polynomial, omega_1_polynomial in compile_quantity_polynomials(
+            sorted_terms, order, weight, pruning_threshold,
+        ):
+            q_contributions = elementwise_sum(
+                [
+                    q_contributions,
+                    *(
+                        elementwise_scale(coefficient, computational_cache.term_probabilities(conjunction))
+                        for coefficient, conjunction in q_polynomial
+                    ),
+                ],
+                size,
+            )
+            omega_1_contributions = elementwise_sum(
+                [omega_1_contributions, *intensity_products(omega_1_polynomial)],
+                size,
+            )
+
+        return q_contributions, omega_1_contributions
+
+    def omega_1_keys(order: int) -> Iterator[tuple[int, Term, Term]]:
+        """
+        Generate the (signed coefficient, gcd, quotient) keys of the ω^1 contribution of a given order, chunk by chunk,
+        as enumerated when that order was reached (i.e. pruned by the same threshold).
+        """
+        pruning_threshold = pruning_threshold_from_order[order]
+        weight = computational_cache.encoding_weight if pruning_threshold > 0 else None
+
+        for _, omega_1_polynomial in compile_quantity_polynomials(sorted_terms, order, weight, pruning_threshold):
+            yield from omega_1_polynomial
+
+    def omega_dagger_contributions(gcd: Term, quotient: Term, order: int) -> list[float]:
+        return elementwise_sum(
+            (
+                column
+                for polynomial in compile_omega_dagger_polynomials(sorted_terms, order, gcd.encoding, quotient.encoding)
+                for column in intensity_products(polynomial)
+            ),
+            size,
         )
 
-    def omega_dagger_contribution(combo: tuple[Term, ...], order: int) -> float:
-        return (
-            (-1) ** (order - 1)
-            * sum(
-                omega(combo_gcd_divided_by_failed) * q(and_(*failed, and_(*combo) / combo_gcd))
-                for failed in combinations(terms, order)
-                if not (combo_gcd := gcd(*combo)).is_vacuous()  # skip q computation if omega is zero
-                if not (combo_gcd_divided_by_failed := combo_gcd / and_(*failed)).is_vacuous()  # ditto
+    def omega_2_contributions(order: int) -> list[float]:
+        """
+        Compute the ω^2 terms of the rth-order contribution to ω.
+
+        Writing X(j,t) for the sum, over the keys of the jth-order ω^1 contribution, of their coefficients
+        times their tth-order ω^† contributions, the ω^2 truncated at (r−1)th-order with ω^† truncated at (r−1)th-order
+        is ∑{j≤r−1,t≤r−1} X(j,t), so that the rth-order contribution is
+            ∑{t≤r−1} X(r−1,t) + ∑{j≤r−2} X(j,r−1).
+        The keys of each order are re-enumerated (chunk by chunk) rather than held across orders
+        along with their partial sums of ω^†, so that memory does not grow with the number of keys,
+        while each key's ω^† contribution of each order is still computed once.
+        """
+        if order == 1:  # no keys of earlier orders
+            return [0.] * size
+
+        newest_key_contributions = (
+            elementwise_scale(
+                coefficient,
+                elementwise_sum((omega_dagger_contributions(gcd, quotient, t) for t in range(1, order)), size),
             )
+            for coefficient, gcd, quotient in omega_1_keys(order - 1)
+        )
+        earlier_key_contributions = (
+            elementwise_scale(coefficient, omega_dagger_contributions(gcd, quotient, order - 1))
+            for j in range(1, order - 1)
+            for coefficient, gcd, quotient in omega_1_keys(j)
         )
 
-    partial_sum = 0.
+        return elementwise_sum(itertools.chain(newest_key_contributions, earlier_key_contributions), size)
+
+    absolute_gap = computational_cache.absolute_gap
+    relative_gap = computational_cache.relative_gap
+
+    q_partial_sums = [0.] * size
+    q_truncation_mask = [False] * size
+    q_bounds = BonferroniBounds(size, 1., len(terms), absolute_gap, relative_gap)
+    omega_partial_sums = [0.] * size
+    omega_truncation_mask = [False] * size
+    omega_bounds = BonferroniBounds(size, math.inf, len(terms), absolute_gap, relative_gap)
+    pruning_threshold = 0.  # never lowered from one order to the next
+    pruning_threshold_from_order = {}  # for re-enumerating the ω^1 keys of earlier orders
 
     for r in range(1, len(terms) + 1):
-        latest = (
-            omega_1_contribution(order=r)
-            - sum(
-                omega_2_contribution(order=s, omega_dagger_orders=[r-1])
-                for s in range(1, r-1)
+        untruncated_magnitudes = [
+            abs(s)
+            for s, is_truncated in zip(q_partial_sums, q_truncation_mask)
+            if not is_truncated
+        ]
+        running_magnitude = min(untruncated_magnitudes, default=0.)
+        pruning_threshold = max(pruning_threshold, computational_cache.pruning_fraction * running_magnitude)
+        is_bounding = pruning_threshold == 0  # pruned partial sums are not bounds
+        pruning_threshold_from_order[r] = pruning_threshold
+
+        if all(omega_truncation_mask):  # only probabilities remain
+            q_latests = q_contributions(order=r, pruning_threshold=pruning_threshold)
+        else:
+            q_latests, omega_1_latests = q_and_omega_1_contributions(order=r, pruning_threshold=pruning_threshold)
+            omega_latests = elementwise_sum(
+                [omega_1_latests, elementwise_scale(-1, omega_2_contributions(order=r))],
+                size,
+            )
+
+            accumulate_unmasked(
+                omega_partial_sums, omega_latests, omega_truncation_mask, computational_cache.truncation_tolerance,
+                omega_bounds if is_bounding else None, r,
             )
-            - omega_2_contribution(order=r-1, omega_dagger_orders=range(1, r))
-        )
 
-        partial_sum += latest
+        accumulate_unmasked(
+            q_partial_sums, q_latests, q_truncation_mask, computational_cache.truncation_tolerance,
+            q_bounds if is_bounding else None, r,
+        )
 
         if r == computational_cache.truncation_order:
             break
 
-        if is_within_truncation_tolerance(latest, partial_sum, computational_cache.truncation_tolerance):
+        if all(q_truncation_mask) and all(omega_truncation_mask):
             break
 
-    return partial_sum
+    return q_partial_sums, omega_partial_sums, (q_bounds.lower_bounds, q_bounds.upper_bounds)
+
+
+def diagram_expression_probabilities(expression: AnyExpression, computational_cache: ComputationalCache) -> list[float]:
+    """
+    Exact instantaneous failure probabilities for a general Boolean expression, across flattened indices,
+    via its binary decision diagram (BDD).
+
+    Unlike inclusion–exclusion, this is not subject to truncation,
+    and takes time linear in the size of the diagram (rather than exponential in the number of terms).
+    """
+    node = computational_cache.diagram_node(expression)
+    diagram = computational_cache.diagram()
+    qs_from_event_index = {
+        event_index: computational_cache.term_probabilities(Term.create_from_event_index(event_index))
+        for event_index in expression.event_indices()
+    }
+
+    return diagram.probabilities(node, qs_from_event_index, computational_cache.flattened_size)
+
+
+def diagram_expression_quantities(expression: AnyExpression,
+                                  computational_cache: ComputationalCache) -> tuple[list[float], list[float]]:
+    """
+    Exact instantaneous failure probabilities and intensities for a general Boolean expression,
+    across flattened indices, via its binary decision diagram (BDD) in a single sweep.
+    """
+    node = computational_cache.diagram_node(expression)
+    diagram = computational_cache.diagram()
+    event_indices = expression.event_indices()
+    qs_from_event_index = {
+        event_index: computational_cache.term_probabilities(Term.create_from_event_index(event_index))
+        for event_index in event_indices
+    }
+    omegas_from_event_index = {
+        event_index: computational_cache.term_intensities(Term.create_from_event_index(event_index))
+        for event_index in event_indices
+    }
+
+    return diagram.quantities(node, qs_from_event_index, omegas_from_event_index, computational_cache.flattened_size)
+
+
+def birnbaum_expression_intensities(expression: AnyExpression, computational_cache: ComputationalCache) -> list[float]:
+    """
+    Exact instantaneous failure intensities for a general Boolean expression, across flattened indices,
+    as the Birnbaum-weighted sum
+        ω[T] = ∑{e} I_B[e] ω[e],
+    where the Birnbaum importances I_B[e] = ∂q[T]/∂q[e] of all the events are computed together
+    in a single backward sweep of the binary decision diagram (BDD) of the expression
+    (see `BinaryDecisionDiagram.birnbaum_importances`).
+
+    This replaces the (nested) ω^1, ω^2 and ω^† series of inclusion–exclusion (see `uncached_expression_quantities`)
+    at roughly the cost of one probability evaluation.
+    """
+    _, importances_from_event_index = diagram_expression_birnbaum_importances(expression, computational_cache)
+
+    return elementwise_sum(
+        (
+            elementwise_product(
+                importances,
+                computational_cache.term_intensities(Term.create_from_event_index(event_index)),
+            )
+            for event_index, importances in importances_from_event_index.items()
+        ),
+        computational_cache.flattened_size,
+    )
+
+
+def diagram_expression_birnbaum_importances(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], dict[int, list[float]]]:
+    """
+    Exact instantaneous failure probabilities for a general Boolean expression, along with the Birnbaum importances
+    of each of its events, across flattened indices, via its binary decision diagram (BDD).
+    """
+    node = computational_cache.diagram_node(expression)
+    diagram = computational_cache.diagram()
+    event_indices = expression.event_indices()
+    qs_from_event_index = {
+        event_index: computational_cache.term_probabilities(Term.create_from_event_index(event_index))
+        for event_index in event_indices
+    }
+    qs, importances_from_event_index = diagram.birnbaum_importances(
+        node, qs_from_event_index, computational_cache.flattened_size,
+    )
+
+    return qs, {
+        event_index: importances_from_event_index.get(event_index, [0.] * computational_cache.flattened_size)
+        for event_index in event_indices
+    }
+
+
+def diagram_expression_cofactor_probabilities(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], dict[int, dict[bool, list[float]]]]:
+    """
+    Exact instantaneous failure probabilities for a general Boolean expression, along with those for the expression
+    with each of its events substituted by `True` and by `False`, across flattened indices,
+    via a single backward sweep of its binary decision diagram (BDD) (see `cofactor_probabilities`).
+
+    This replaces the separate quantification of `substitute_true` and `substitute_false` for each event.
+    Since the expression is monotone, the cofactor probabilities are clamped to bracket the expression probability,
+    so that rounding cannot make differences between them (and hence importances) negative,
+    and a cofactor for an event value that is certain is the expression probability itself.
+    """
+    node = computational_cache.diagram_node(expression)
+    diagram = computational_cache.diagram()
+    event_indices = expression.event_indices()
+    qs_from_event_index = {
+        event_index: computational_cache.term_probabilities(Term.create_from_event_index(event_index))
+        for event_index in event_indices
+    }
+    qs, cofactor_qs_from_boolean_from_event_index = diagram.cofactor_probabilities(
+        node, qs_from_event_index, event_indices, computational_cache.flattened_size,
+    )
+
+    return qs, {
+        event_index: {
+            True: [
+                q if q_event == 1 else max(q_true, q)
+                for q_true, q, q_event in zip(cofactor_qs_from_boolean[True], qs, qs_from_event_index[event_index])
+            ],
+            False: [
+                q if q_event == 0 else min(q_false, q)
+                for q_false, q, q_event in zip(cofactor_qs_from_boolean[False], qs, qs_from_event_index[event_index])
+            ],
+        }
+        for event_index, cofactor_qs_from_boolean in cofactor_qs_from_boolean_from_event_index.items()
+    }
+
+
+def disjoint_products_expression_probabilities(expression: AnyExpression,
+                                               computational_cache: ComputationalCache) -> list[float]:
+    """
+    Exact instantaneous failure probabilities for a general Boolean expression, across flattened indices,
+    via a sum of disjoint products (see `compile_disjoint_products`).
+
+    Since the products are mutually exclusive, the failure probability is their plain sum,
+        q[T] = ∑{k} q[P_k] ∏{e|N_k} (1 − q[e]),
+    for products P_k ∏{e|N_k} (not e) (with P_k the positive part and N_k the negated events).
+    If there are too many products, the expression is quantified via a binary decision diagram instead.
+    """
+    products = computational_cache.disjoint_products(expression)
+
+    if products is None:
+        return diagram_expression_probabilities(expression, computational_cache)
+
+    size = computational_cache.flattened_size
+    complement_qs_from_event_index = {}
+
+    def complement_qs(event_index: int) -> list[float]:
+        if event_index not in complement_qs_from_event_index:
+            qs = computational_cache.term_probabilities(Term.create_from_event_index(event_index))
+            complement_qs_from_event_index[event_index] = [1 - q for q in qs]
+
+        return complement_qs_from_event_index[event_index]
+
+    return elementwise_sum(
+        (
+            conjunction_probabilities(
+                [
+                    computational_cache.term_probabilities(positive),
+                    *(complement_qs(event_index) for event_index in negative.event_indices()),
+                ],
+                size,
+            )
+            for positive, negative in products
+        ),
+        size,
+    )
+
+
+def disjoint_products_expression_quantities(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], list[float]]:
+    """
+    Exact instantaneous failure probabilities and intensities for a general Boolean expression,
+    across flattened indices, via a sum of disjoint products.
+
+    The probabilities are as per `disjoint_products_expression_probabilities`.
+    The intensities follow by the product rule (see `conjunction_intensities`) applied to each product,
+    with each negated event (not e) having probability 1 − q[e] and intensity −ω[e].
+    """
+    products = computational_cache.disjoint_products(expression)
+
+    if products is None:
+        return diagram_expression_quantities(expression, computational_cache)
+
+    size = computational_cache.flattened_size
+    complements_from_event_index = {}
+
+    def complements(event_index: int) -> tuple[list[float], list[float]]:
+        if event_index not in complements_from_event_index:
+            term = Term.create_from_event_index(event_index)
+            complements_from_event_index[event_index] = (
+                [1 - q for q in computational_cache.term_probabilities(term)],
+                [-omega for omega in computational_cache.term_intensities(term)],
+            )
+
+        return complements_from_event_index[event_index]
+
+    qs = [0.] * size
+    omegas = [0.] * size
+
+    for positive, negative in products:
+        factor_qs = [computational_cache.term_probabilities(positive)]
+        factor_omegas = [computational_cache.term_intensities(positive)]
+
+        for event_index in negative.event_indices():
+            complement_qs, complement_omegas = complements(event_index)
+            factor_qs.append(complement_qs)
+            factor_omegas.append(complement_omegas)
+
+        qs = elementwise_sum([qs, conjunction_probabilities(factor_qs, size)], size)
+        omegas = elementwise_sum([omegas, conjunction_intensities(factor_qs, factor_omegas, size)], size)
+
+    return qs, omegas
+
+
+def rare_event_expression_quantities(expression: AnyExpression,
+                                     computational_cache: ComputationalCache) -> tuple[list[float], list[float]]:
+    """
+    Approximate instantaneous failure probabilities and intensities for a general Boolean expression,
+    across flattened indices, via the rare event approximation.
+
+    This is the first-order truncation of inclusion–exclusion,
+        q[T] ≈ ∑{1≤i≤N} q[C_i],
+        ω[T] ≈ ∑{1≤i≤N} ω[C_i],
+    which is an upper bound (for probability), and accurate when the cut sets are individually rare.
+    """
+    terms = sorted(expression.terms)
+    size = computational_cache.flattened_size
+
+    return (
+        elementwise_sum((computational_cache.term_probabilities(term) for term in terms), size),
+        elementwise_sum((computational_cache.term_intensities(term) for term in terms), size),
+    )
+
+
+def min_cut_upper_bound_expression_quantities(
+    expression: AnyExpression, computational_cache: ComputationalCache,
+) -> tuple[list[float], list[float]]:
+    """
+    Approximate instantaneous failure probabilities and intensities for a general Boolean expression,
+    across flattened indices, via the minimal cut set upper bound (MCUB).
+
+    This treats the cut sets as if they were independent,
+        q[T] ≈ 1 − ∏{1≤i≤N} (1 − q[C_i]),
+    which is an upper bound (for probability) that is tighter than the rare event approximation,
+    with intensities following by the product rule (see `disjunction_intensities`).
+    """
+    terms = sorted(expression.terms)
+    size = computational_cache.flattened_size
+    term_qs = [computational_cache.term_probabilities(term) for term in terms]
+    term_omegas = [computational_cache.term_intensities(term) for term in terms]
+
+    return disjunction_probabilities(term_qs, size), disjunction_intensities(term_qs, term_omegas, size)
+
+
+def esary_proschan_expression_quantities(expression: AnyExpression,
+                                         computational_cache: ComputationalCache) -> tuple[list[float], list[float]]:
+    """
+    Approximate instantaneous failure probabilities and intensities for a general Boolean expression,
+    across flattened indices, via the Esary–Proschan lower bound.
+
+    This treats the minimal path sets P_1, P_2, ..., P_M (see `minimal_path_sets`) as if they were independent,
+        q[T] ≈ ∏{1≤j≤M} (1 − ∏{e|P_j} (1 − q[e])),
+    i.e. the failure of T as a conjunction (AND) of path set failures, each a disjunction (OR) of its events.
+    This is a lower bound (for probability), complementing the minimal cut set upper bound,
+    with intensities following by the product rule (see `conjunction_intensities` and `disjunction_intensities`).
+    """
+    size = computational_cache.flattened_size
+    path_qs = []
+    path_omegas = []
+
+    for path_set in sorted(minimal_path_sets(expression).terms):
+        event_qs = [computational_cache.term_probabilities(factor) for factor in path_set.factors()]
+        event_omegas = [computational_cache.term_intensities(factor) for factor in path_set.factors()]
+
+        path_qs.append(disjunction_probabilities(event_qs, size))
+        path_omegas.append(disjunction_intensities(event_qs, event_omegas, size))
+
+    return conjunction_probabilities(path_qs, size), conjunction_intensities(path_qs, path_omegas, size)
+
+
+def minimal_path_sets(expression: AnyExpression) -> Expression:
+    """
+    Compute the minimal path sets of a general Boolean expression (a disjunction (OR) of minimal cut sets),
+    i.e. the minimal sets of events that intersect every cut set (so that T is false if all of them are false).
+
+    These are the terms of the dual expression, being a conjunction (AND) over the cut sets C_i
+    of the disjunction (OR) of the events of C_i, which is expanded (and minimised) by the distributive law.
+    Note that the number of path sets may be much larger than the number of cut sets.
+    """
+    return Expression.conjunction(*(
+        Expression(*term.factors())
+        for term in sorted(expression.terms)
+    ))
+
+
+def compile_disjoint_products(terms: Collection[Term], size_limit: int) -> Optional[list[tuple[Term, Term]]]:
+    """
+    Compile a disjunction (OR) of terms into a sum of disjoint (mutually exclusive) products,
+    each product being a pair of terms (P, N) representing P ∏{e|N} (not e),
+    or return None if the number of products would exceed the size limit.
+
+    With the terms ordered C_1, C_2, ..., C_N (by ascending order, since shorter terms tend to give fewer products),
+        T = C_1 + (not C_1) C_2 + (not C_1) (not C_2) C_3 + ... ,
+    where each summand C_k (not C_1) ... (not C_{k−1}) is made disjoint by single-variable inversion.
+    That is, for each earlier term C_j in turn, a product already containing some (not e) with e in C_j is unaffected,
+    a product containing all of C_j is dropped, and otherwise the events a, b, c, ... of C_j missing from the product
+    expand the complement of C_j into disjoint products
+        (not C_j) = (not a) + a (not b) + a b (not c) + ... .
+    The expansion is carried out with an explicit stack, so as not to be limited by recursion depth.
+    """
+    encodings = [term.encoding for term in sorted(terms, key=lambda term: (term.order(), term.encoding))]
+    products = []
+
+    for k, encoding in enumerate(encodings):
+        stack = [(encoding, 0, 0)]  # positive encoding, negated encoding, index of next earlier term
+
+        while stack:
+            positive, negative, j = stack.pop()
+
+            while j < k and encodings[j] & negative:  # already disjoint from C_j
+                j += 1
+
+            if j == k:
+                products.append((Term(positive), Term(negative)))
+
+                if len(products) > size_limit:
+                    return None
+
+                continue
+
+            for event_index in Term(encodings[j] & ~positive).event_indices():  # empty if product implies C_j
+                bit = 1 << event_index
+                stack.append((positive, negative | bit, j + 1))
+                positive |= bit
+
+    return products
+
+
+def conjunction_probabilities(input_qs: list[Sequence[float]], size: int) -> list[float]:
+    """
+    Exact instantaneous failure probabilities for a conjunction (AND) of independent inputs, across flattened indices.
+
+    Since the inputs are independent, the failure probability is the straight product
+        q = ∏{i} q_i.
+    """
+    qs = [1.] * size
+
+    for input_q_column in input_qs:
+        qs = elementwise_product(qs, input_q_column)
+
+    return qs
+
+
+def conjunction_intensities(input_qs: list[Sequence[float]], input_omegas: list[Sequence[float]],
+                            size: int) -> list[float]:
+    """
+    Exact instantaneous failure intensities for a conjunction (AND) of independent inputs, across flattened indices.
+
+    By the product rule, the failure intensity is
+        ω = ∑{i} ω_i ∏{j≠i} q_j,
+    which is accumulated one input at a time (with Q the product of the failure probabilities so far) as
+        W' = W q + Q ω,
+    so as to avoid dividing by failure probabilities.
+    """
+    qs = [1.] * size
+    omegas = [0.] * size
+
+    for input_q_column, input_omega_column in zip(input_qs, input_omegas):
+        omegas = [
+            w * q_input + q * omega_input
+            for q, w, q_input, omega_input in zip(qs, omegas, input_q_column, input_omega_column)
+        ]
+        qs = elementwise_product(qs, input_q_column)
+
+    return omegas
+
+
+def disjunction_probabilities(input_qs: list[Sequence[float]], size: int) -> list[float]:
+    """
+    Exact instantaneous failure probabilities for a disjunction (OR) of independent inputs, across flattened indices.
+
+    Since the inputs are independent, the gate survives if and only if every input survives, hence
+        q = 1 − ∏{i} (1 − q_i).
+    """
+    survival_qs = [1.] * size
+
+    for input_q_column in input_qs:
+        survival_qs = [s * (1 - q_input) for s, q_input in zip(survival_qs, input_q_column)]
+
+    return [1 - s for s in survival_qs]
+
+
+def disjunction_intensities(input_qs: list[Sequence[float]], input_omegas: list[Sequence[float]],
+                            size: int) -> list[float]:
+    """
+    Exact instantaneous failure intensities for a disjunction (OR) of independent inputs, across flattened indices.
+
+    By the product rule (applied to the survival probability), the failure intensity is
+        ω = ∑{i} ω_i ∏{j≠i} (1 − q_j),
+    which is accumulated one input at a time (with S the survival probability so far) as
+        W' = W (1 − q) + S ω.
+    """
+    survival_qs = [1.] * size
+    omegas = [0.] * size
+
+    for input_q_column, input_omega_column in zip(input_qs, input_omegas):
+        omegas = [
+            w * (1 - q_input) + s * omega_input
+            for s, w, q_input, omega_input in zip(survival_qs, omegas, input_q_column, input_omega_column)
+        ]
+        survival_qs = [s * (1 - q_input) for s, q_input in zip(survival_qs, input_q_column)]
+
+    return omegas
+
+
+def vote_probabilities(input_qs: list[Sequence[float]], threshold: int, size: int) -> list[float]:
+    """
+    Exact instantaneous failure probabilities for a vote of independent inputs, across flattened indices.
+
+    With A[k] the failure probability of at least k of the first i−1 inputs, and q the failure probability
+    of the ith input, we have (for the Poisson binomial distribution) the recurrence
+        A'[k] = A[k] + q (A[k−1] − A[k]),
+    where A[0] = 1, which is evaluated in time proportional to the product of input count and threshold.
+    """
+    at_least_qs = [[1.] * size] + [[0.] * size] * threshold
+    input_count = len(input_qs)
+
+    for i, qs in enumerate(input_qs, start=1):
+        for k in vote_counts(i, input_count, threshold):
+            at_least_qs[k] = [
+                a + q * (a_fewer - a)
+                for q, a, a_fewer in zip(qs, at_least_qs[k], at_least_qs[k-1])
+            ]
+
+    return at_least_qs[threshold]
+
+
+def vote_intensities(input_qs: list[Sequence[float]], input_omegas: list[Sequence[float]],
+                     threshold: int, size: int) -> list[float]:
+    """
+    Exact instantaneous failure intensities for a vote of independent inputs, across flattened indices.
+
+    Differentiating the recurrence used for probabilities (with A[k] being independent of the ith input),
+        W'[k] = W[k] + ω (A[k−1] − A[k]) + q (W[k−1] − W[k]),
+    where W[0] = 0, and ω is the failure intensity of the ith input.
+    """
+    at_least_qs = [[1.] * size] + [[0.] * size] * threshold
+    at_least_omegas = [[0.] * size] * (threshold + 1)
+    input_count = len(input_qs)
+
+    for i, (qs, omegas) in enumerate(zip(input_qs, input_omegas), start=1):
+        for k in vote_counts(i, input_count, threshold):
+            at_least_omegas[k] = [
+                w + omega * (a_fewer - a) + q * (w_fewer - w)
+                for q, omega, a, a_fewer, w, w_fewer in zip(
+                    qs, omegas,
+                    at_least_qs[k], at_least_qs[k-1],
+                    at_least_omegas[k], at_least_omegas[k-1],
+                )
+            ]
+            at_least_qs[k] = [
+                a + q * (a_fewer - a)
+                for q, a, a_fewer in zip(qs, at_least_qs[k], at_least_qs[k-1])
+            ]
+
+    return at_least_omegas[threshold]
+
+
+class BonferroniBounds:
+    """
+    Class for the tightest bounds reached by the successive partial sums of an inclusion–exclusion series,
+    across flattened indices.
+
+    By the Bonferroni inequalities, the partial sum truncated at odd order `r` is an upper bound,
+    and that truncated at even order `r` is a lower bound, with the partial sum at the final order being exact.
+    The bounds are initialised to zero and the ceiling (the trivial bounds),
+    and are only to be tightened by partial sums from which no combinations have been pruned
+    (otherwise they would not be bounds, nor the partial sum at the final order exact),
+    so that pruning leaves the last valid bounds in place.
+    """
+    lower_bounds: list[float]
+    upper_bounds: list[float]
+    final_order: int
+    absolute_gap: float
+    relative_gap: float
+
+    def __init__(self, size: int, ceiling: float, final_order: int, absolute_gap: float, relative_gap: float):
+        self.lower_bounds = [0.] * size
+        self.upper_bounds = [ceiling] * size
+        self.final_order = final_order
+        self.absolute_gap = absolute_gap
+        self.relative_gap = relative_gap
+
+    def __repr__(self):
+        return natural_repr(self)
+
+    def tighten(self, index: int, partial_sum: float, order: int) -> bool:
+        """
+        Tighten the bounds at a flattened index by the partial sum truncated at the given order,
+        returning whether the gap between the bounds has met the absolute or relative gap target.
+        """
+        if math.isnan(partial_sum) or order == self.final_order:
+            self.lower_bounds[index] = self.upper_bounds[index] = partial_sum
+        elif order % 2 == 1:
+            self.upper_bounds[index] = min(self.upper_bounds[index], partial_sum)
+        else:
+            self.lower_bounds[index] = max(self.lower_bounds[index], partial_sum)
+
+        gap = self.upper_bounds[index] - self.lower_bounds[index]
+
+        return (
+            self.absolute_gap > 0 and gap <= self.absolute_gap
+            or self.relative_gap > 0 and gap <= self.relative_gap * self.upper_bounds[index]
+        )
+
+
+def accumulate_unmasked(partial_sums: list[float], latests: list[float], truncation_mask: list[bool],
+                        tolerance: float, bounds: Optional[BonferroniBounds] = None, order: int = 0):
+    """
+    Accumulate the latest contributions into the partial sums (in place) at unmasked (untruncated) flattened indices,
+    and mask the flattened indices that have newly fallen within the truncation tolerance.
+
+    If bounds are given, they are tightened by the partial sums (truncated at the given order),
+    and the flattened indices whose bounds have newly met the gap target are masked also.
+    """
+    for index, latest in enumerate(latests):
+        if truncation_mask[index]:
+            continue
+
+        partial_sums[index] += latest
+
+        if is_within_truncation_tolerance(latest, partial_sums[index], tolerance):
+            truncation_mask[index] = True
+
+        if bounds is not None and bounds.tighten(index, partial_sums[index], order):
+            truncation_mask[index] = True
 
 
 def is_within_truncation_tolerance(latest: float, partial_sum: float, tolerance: float) -> bool:
@@ -45,6 +45,26 @@ class ModelType(enum.Enum):
     FALSE = 3
 
 
+class ComputationalMethod(enum.Enum):
+    INCLUSION_EXCLUSION = 0
+    BINARY_DECISION_DIAGRAM = 1
+    RARE_EVENT = 2
+    MIN_CUT_UPPER_BOUND = 3
+    ESARY_PROSCHAN = 4
+    MONTE_CARLO = 5
+    SUM_OF_DISJOINT_PRODUCTS = 6
+
+
+class IntensityMethod(enum.Enum):
+    SERIES = 0
+    BIRNBAUM_SUM = 1
+
+
+class CutSetRepresentation(enum.Enum):
+    EXPLICIT = 0
+    ZERO_SUPPRESSED_DIAGRAM = 1
+
+
 class SymbolType(enum.Enum):
     NULL_GATE = 0
     OR_GATE = 1
@@ -123,14 +143,46 @@ VALID_MODEL_KEYS = tuple({
 })
 MODEL_TYPE_EXPLAINER = f'Recognised model types are {natural_join_backticks(VALID_MODEL_TYPES)}'
 
+COMPUTATIONAL_METHOD_FROM_STRING = {
+    'InclusionExclusion': ComputationalMethod.INCLUSION_EXCLUSION,
+    'BinaryDecisionDiagram': ComputationalMethod.BINARY_DECISION_DIAGRAM,
+    'RareEvent': ComputationalMethod.RARE_EVENT,
+    'MinCutUpperBound': ComputationalMethod.MIN_CUT_UPPER_BOUND,
+    'EsaryProschan': ComputationalMethod.ESARY_PROSCHAN,
+    'MonteCarlo': ComputationalMethod.MONTE_CARLO,
+    'SumOfDisjointProducts': ComputationalMethod.SUM_OF_DISJOINT_PRODUCTS,
+}
+COMPUTATIONAL_METHOD_EXPLAINER = (
+    f'Recognised computational methods are {natural_join_backticks(tuple(COMPUTATIONAL_METHOD_FROM_STRING))}.'
+)
+
+INTENSITY_METHOD_FROM_STRING = {
+    'Series': IntensityMethod.SERIES,
+    'BirnbaumSum': IntensityMethod.BIRNBAUM_SUM,
+}
+INTENSITY_METHOD_EXPLAINER = (
+    f'Recognised intensity methods are {natural_join_backticks(tuple(INTENSITY_METHOD_FROM_STRING))}.'
+)
+
+CUT_SET_REPRESENTATION_FROM_STRING = {
+    'Explicit': CutSetRepresentation.EXPLICIT,
+    'ZeroSuppressedDiagram': CutSetRepresentation.ZERO_SUPPRESSED_DIAGRAM,
+}
+CUT_SET_REPRESENTATION_EXPLAINER = (
+    f'Recognised cut set representations are {natural_join_backticks(tuple(CUT_SET_REPRESENTATION_FROM_STRING))}.'
+)
+
 VALID_KEYS_FROM_CLASS = {
     'FaultTree': (
-        'times', 'time_unit', 'seed', 'sample_size', 'computational_order', 'computational_tolerance',
+        'times', 'time_unit', 'seed', 'sample_size',
+        'computational_method', 'computational_order', 'computational_tolerance', 'computational_pruning',
+        'computational_absolute_gap', 'computational_relative_gap', 'computational_trials', 'intensity_method',
+        'cut_set_representation', 'cut_set_cutoff', 'max_cut_set_order',
         'significant_figures', 'scientific_exponent',
     ),
     'Model': ('label', 'comment', 'model_type', *VALID_MODEL_KEYS),
     'Event': ('label', 'comment', 'model_type', *VALID_MODEL_KEYS, 'model', 'appearance'),
-    'Gate': ('label', 'comment', 'is_paged', 'type', 'inputs'),
+    'Gate': ('label', 'comment', 'is_paged', 'type', 'inputs', 'computational_method'),
 }
 KEY_EXPLAINER_FROM_CLASS = {
     'FaultTree': f'Recognised keys are {natural_join_backticks(VALID_KEYS_FROM_CLASS["FaultTree"])}.',
@@ -8,26 +8,33 @@ Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
 This is free software with NO WARRANTY etc. etc., see LICENSE.
 """
 
+import math
 import random
 import statistics
 import traceback
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
-from pfta.boolean import Term, Expression
+from pfta.boolean import Term, Expression, ExpressionBuilder, Truncator
 from pfta.common import natural_repr, format_cut_set, natural_join_backticks
 from pfta.computation import (
     ComputationalCache,
     constant_rate_model_probability, constant_rate_model_intensity,
+    conjunction_probabilities, conjunction_intensities, disjunction_probabilities, disjunction_intensities,
+    vote_probabilities, vote_intensities,
+)
+from pfta.constants import (
+    EventAppearance, GateType, ModelType, ComputationalMethod, IntensityMethod, CutSetRepresentation,
+    VALID_KEY_COMBOS_FROM_MODEL_TYPE, VALID_MODEL_KEYS,
 )
-from pfta.constants import EventAppearance, GateType, ModelType, VALID_KEY_COMBOS_FROM_MODEL_TYPE, VALID_MODEL_KEYS
 from pfta.parsing import (
     parse_lines, parse_paragraphs, parse_assemblies,
     parse_fault_tree_properties, parse_model_properties, parse_event_properties, parse_gate_properties,
 )
 from pfta.presentation import Figure, Table
 from pfta.sampling import Distribution
-from pfta.utilities import robust_divide, robust_invert, descending_sum, find_cycles
+from pfta.utilities import robust_divide, robust_invert, descending_sum, find_cycles, find_modules
 from pfta.woe import ImplementationError, FaultTreeTextException
+from pfta.zbdd import AnyExpression, AnyExpressionBuilder, ZeroSuppressedDiagram
 
 
 def memoise(attribute_name: str):
@@ -74,6 +81,18 @@ class InvalidComputationalToleranceException(FaultTreeTextException):
     pass
 
 
+class InvalidComputationalPruningException(FaultTreeTextException):
+    pass
+
+
+class InvalidComputationalGapException(FaultTreeTextException):
+    pass
+
+
+class InvalidCutSetCutoffException(FaultTreeTextException):
+    pass
+
+
 class UnknownModelException(FaultTreeTextException):
     pass
 
@@ -106,8 +125,17 @@ class FaultTree:
     time_unit: str
     seed: str
     sample_size: int
+    computational_method: ComputationalMethod
     computational_order: Optional[int]
     computational_tolerance: float
+    computational_pruning: float
+    computational_absolute_gap: float
+    computational_relative_gap: float
+    computational_trials: int
+    intensity_method: IntensityMethod
+    cut_set_representation: CutSetRepresentation
+    cut_set_cutoff: float
+    max_cut_set_order: Optional[int]
     significant_figures: int
     scientific_exponent: int
     models: list['Model']
@@ -170,10 +198,39 @@ class FaultTree:
         sample_size: int = fault_tree_properties.get('sample_size', 1)
         sample_size_raw: str = fault_tree_properties.get('sample_size_raw')
         sample_size_line_number: int = fault_tree_properties.get('sample_size_line_number')
+        computational_method: ComputationalMethod = fault_tree_properties.get(
+            'computational_method', ComputationalMethod.INCLUSION_EXCLUSION,
+        )
         computational_order: Optional[int] = fault_tree_properties.get('computational_order')
         computational_tolerance: float = fault_tree_properties.get('computational_tolerance', 0.)
         computational_tolerance_raw: str = fault_tree_properties.get('computational_tolerance_raw')
         computational_tolerance_line_number: int = fault_tree_properties.get('computational_tolerance_line_number')
+        computational_pruning: float = fault_tree_properties.get('computational_pruning', 0.)
+        computational_pruning_raw: str = fault_tree_properties.get('computational_pruning_raw')
+        computational_pruning_line_number: int = fault_tree_properties.get('computational_pruning_line_number')
+        computational_absolute_gap: float = fault_tree_properties.get('computational_absolute_gap', 0.)
+        computational_absolute_gap_raw: str = fault_tree_properties.get('computational_absolute_gap_raw')
+        computational_absolute_gap_line_number: int = fault_tree_properties.get(
+            'computational_absolute_gap_line_number',
+        )
+        computational_relative_gap: float = fault_tree_properties.get('computational_relative_gap', 0.)
+        computational_relative_gap_raw: str = fault_tree_properties.get('computational_relative_gap_raw')
+        computational_relative_gap_line_number: int = fault_tree_properties.get(
+            'computational_relative_gap_line_number',
+        )
+        computational_trials: int = fault_tree_properties.get('computational_trials', 1 << 16)
+        computational_trials_raw: str = fault_tree_properties.get('computational_trials_raw')
+        computational_trials_line_number: int = fault_tree_properties.get('computational_trials_line_number')
+        intensity_method: IntensityMethod = fault_tree_properties.get('intensity_method', IntensityMethod.SERIES)
+        cut_set_representation: CutSetRepresentation = fault_tree_properties.get(
+            'cut_set_representation', CutSetRepresentation.EXPLICIT,
+        )
+        cut_set_cutoff: float = fault_tree_properties.get('cut_set_cutoff', 0.)
+        cut_set_cutoff_raw: str = fault_tree_properties.get('cut_set_cutoff_raw')
+        cut_set_cutoff_line_number: int = fault_tree_properties.get('cut_set_cutoff_line_number')
+        max_cut_set_order: Optional[int] = fault_tree_properties.get('max_cut_set_order')
+        max_cut_set_order_raw: str = fault_tree_properties.get('max_cut_set_order_raw')
+        max_cut_set_order_line_number: int = fault_tree_properties.get('max_cut_set_order_line_number')
         significant_figures: int = fault_tree_properties.get('significant_figures', 3)
         significant_figures_raw: str = fault_tree_properties.get('significant_figures_raw')
         significant_figures_line_number: int = fault_tree_properties.get('significant_figures_line_number')
@@ -198,6 +255,16 @@ class FaultTree:
         FaultTree.validate_sample_size(sample_size, sample_size_raw, sample_size_line_number)
         FaultTree.validate_computational_tolerance(computational_tolerance, computational_tolerance_raw,
                                                    computational_tolerance_line_number)
+        FaultTree.validate_computational_pruning(computational_pruning, computational_pruning_raw,
+                                                 computational_pruning_line_number)
+        FaultTree.validate_computational_gap('computational_absolute_gap', computational_absolute_gap,
+                                             computational_absolute_gap_raw, computational_absolute_gap_line_number)
+        FaultTree.validate_computational_gap('computational_relative_gap', computational_relative_gap,
+                                             computational_relative_gap_raw, computational_relative_gap_line_number)
+        FaultTree.validate_computational_trials(computational_trials, computational_trials_raw,
+                                                computational_trials_line_number)
+        FaultTree.validate_cut_set_cutoff(cut_set_cutoff, cut_set_cutoff_raw, cut_set_cutoff_line_number)
+        FaultTree.validate_max_cut_set_order(max_cut_set_order, max_cut_set_order_raw, max_cut_set_order_line_number)
         FaultTree.validate_significant_figures(significant_figures, significant_figures_raw,
                                                significant_figures_line_number)
         FaultTree.validate_scientific_exponent(scientific_exponent, scientific_exponent_raw,
@@ -223,9 +290,7 @@ class FaultTree:
         FaultTree.determine_actual_model_types(events, model_from_id)
         FaultTree.generate_parameter_samples(events, model_from_id, seed, flattened_size)
 
-        # Computation of expressions
-        FaultTree.compute_event_expressions(events)
-        FaultTree.compute_gate_expressions(event_from_id, gate_from_id)
+        FaultTree.determine_actual_computational_methods(gates, computational_method)
 
         # Computation of event quantities
         FaultTree.compute_event_probabilities(events, times, sample_size)
@@ -235,12 +300,26 @@ class FaultTree:
         FaultTree.compute_event_expected_intensities(events)
         FaultTree.compute_event_expected_rates(events)
 
+        # Computation of expressions (after event quantities, which are needed for truncation)
+        expression_builder = FaultTree.create_expression_builder(
+            events, cut_set_representation, cut_set_cutoff, max_cut_set_order,
+        )
+        FaultTree.compute_event_expressions(events)
+        FaultTree.compute_gate_expressions(event_from_id, gate_from_id, expression_builder)
+
+        # Modularisation (substitution of independent subtrees by pseudo-events)
+        FaultTree.mark_modules(events, gate_from_id, expression_builder)
+        FaultTree.compute_gate_modular_expressions(event_from_id, gate_from_id, expression_builder)
+
         # Prepare cache for computation of gate quantities
-        computational_cache = ComputationalCache(events, computational_tolerance, computational_order)
+        computational_cache = ComputationalCache(
+            events, flattened_size,
+            computational_method, computational_tolerance, computational_order, computational_pruning,
+            computational_absolute_gap, computational_relative_gap, computational_trials, seed, intensity_method,
+        )
 
         # Computation of gate quantities
-        FaultTree.compute_gate_probabilities(gates, computational_cache)
-        FaultTree.compute_gate_intensities(gates, computational_cache)
+        FaultTree.compute_gate_quantities(event_from_id, gate_from_id, computational_cache)
         FaultTree.compute_gate_rates(gates)
         FaultTree.compute_gate_expected_probabilities(gates)
         FaultTree.compute_gate_expected_intensities(gates)
@@ -251,8 +330,17 @@ class FaultTree:
         self.time_unit = time_unit
         self.seed = seed
         self.sample_size = sample_size
+        self.computational_method = computational_method
         self.computational_order = computational_order
         self.computational_tolerance = computational_tolerance
+        self.computational_pruning = computational_pruning
+        self.computational_absolute_gap = computational_absolute_gap
+        self.computational_relative_gap = computational_relative_gap
+        self.computational_trials = computational_trials
+        self.intensity_method = intensity_method
+        self.cut_set_representation = cut_set_representation
+        self.cut_set_cutoff = cut_set_cutoff
+        self.max_cut_set_order = max_cut_set_order
         self.significant_figures = significant_figures
         self.scientific_exponent = scientific_exponent
         self.models = models
@@ -303,8 +391,12 @@ class FaultTree:
             'type', 'inputs',
             'time', 'sample',
             'computed_probability',
+            'computed_probability_lower_bound',
+            'computed_probability_upper_bound',
+            'computed_probability_standard_error',
             'computed_intensity',
             'computed_rate',
+            'computed_cutoff_error',
         ]
         data = [
             [
@@ -312,8 +404,12 @@ class FaultTree:
                 gate.type_.name, ','.join(gate.input_ids),
                 time, sample_index,
                 gate.get_computed_probability(time_index, sample_index),
+                gate.get_computed_probability_lower_bound(time_index, sample_index),
+                gate.get_computed_probability_upper_bound(time_index, sample_index),
+                gate.get_computed_probability_standard_error(time_index, sample_index),
                 gate.get_computed_intensity(time_index, sample_index),
                 gate.get_computed_rate(time_index, sample_index),
+                gate.computed_cutoff_error,
             ]
             for gate in self.gates
             for time_index, time in enumerate(self.times)
@@ -370,6 +466,50 @@ class FaultTree:
                 f'computational_tolerance `{computational_tolerance_raw}` negative or not less than unity',
             )
 
+    @staticmethod
+    def validate_computational_pruning(computational_pruning: float, computational_pruning_raw: str,
+                                       computational_pruning_line_number: int):
+        if not 0 <= computational_pruning < 1:
+            raise InvalidComputationalPruningException(
+                computational_pruning_line_number,
+                f'computational_pruning `{computational_pruning_raw}` negative or not less than unity',
+            )
+
+    @staticmethod
+    def validate_computational_gap(key: str, computational_gap: float, computational_gap_raw: str,
+                                   computational_gap_line_number: int):
+        if not 0 <= computational_gap < 1:
+            raise InvalidComputationalGapException(
+                computational_gap_line_number,
+                f'{key} `{computational_gap_raw}` negative or not less than unity',
+            )
+
+    @staticmethod
+    def validate_computational_trials(computational_trials: int, computational_trials_raw: str,
+                                      computational_trials_line_number: int):
+        if computational_trials < 1:
+            raise SubUnitValueException(
+                computational_trials_line_number,
+                f'computational_trials `{computational_trials_raw}` less than unity',
+            )
+
+    @staticmethod
+    def validate_cut_set_cutoff(cut_set_cutoff: float, cut_set_cutoff_raw: str, cut_set_cutoff_line_number: int):
+        if not 0 <= cut_set_cutoff < 1:
+            raise InvalidCutSetCutoffException(
+                cut_set_cutoff_line_number,
+                f'cut_set_cutoff `{cut_set_cutoff_raw}` negative or not less than unity',
+            )
+
+    @staticmethod
+    def validate_max_cut_set_order(max_cut_set_order: Optional[int], max_cut_set_order_raw: str,
+                                   max_cut_set_order_line_number: int):
+        if max_cut_set_order is not None and max_cut_set_order < 1:
+            raise SubUnitValueException(
+                max_cut_set_order_line_number,
+                f'max_cut_set_order `{max_cut_set_order_raw}` less than unity',
+            )
+
     @staticmethod
     def validate_significant_figures(significant_figures: int, significant_figures_raw: str,
                                      significant_figures_line_number: int):
@@ -458,6 +598,11 @@ class FaultTree:
         for event in events:
             event.determine_actual_model_type(model_from_id)
 
+    @staticmethod
+    def determine_actual_computational_methods(gates: list['Gate'], computational_method: ComputationalMethod):
+        for gate in gates:
+            gate.determine_actual_computational_method(computational_method)
+
     @staticmethod
     def generate_parameter_samples(events: list['Event'], model_from_id: dict[str, 'Model'],
                                    seed: str, flattened_size: int):
@@ -466,15 +611,54 @@ class FaultTree:
         for event in events:
             event.generate_parameter_samples(model_from_id, flattened_size)
 
+    @staticmethod
+    def create_expression_builder(events: list['Event'], cut_set_representation: CutSetRepresentation,
+                                  cut_set_cutoff: float, max_cut_set_order: Optional[int]) -> AnyExpressionBuilder:
+        if cut_set_cutoff == 0 and max_cut_set_order is None:
+            truncator = None
+        else:
+            weight_from_event_index = {
+                event.index: max(event.computed_probabilities, key=lambda q: math.inf if math.isnan(q) else q)
+                for event in events
+            }
+            truncator = Truncator(weight_from_event_index, cut_set_cutoff, max_cut_set_order)
+
+        if cut_set_representation == CutSetRepresentation.ZERO_SUPPRESSED_DIAGRAM:
+            return ZeroSuppressedDiagram(truncator)
+
+        return ExpressionBuilder(truncator)
+
     @staticmethod
     def compute_event_expressions(events: list['Event']):
         for event in events:
             event.compute_expression()
 
     @staticmethod
-    def compute_gate_expressions(event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate']):
+    def compute_gate_expressions(event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                                 expression_builder: AnyExpressionBuilder):
         for gate in gate_from_id.values():
-            gate.compute_expression(event_from_id, gate_from_id)
+            gate.compute_expression(event_from_id, gate_from_id, expression_builder)
+
+    @staticmethod
+    def mark_modules(events: list['Event'], gate_from_id: dict[str, 'Gate'], expression_builder: AnyExpressionBuilder):
+        if expression_builder.truncator is None:
+            module_ids = find_modules({id_: gate.input_ids for id_, gate in gate_from_id.items()})
+        else:  # truncation weights are only known for events, so modules would escape truncation
+            module_ids = set()
+
+        module_index_from_id = {
+            id_: len(events) + module_number  # pseudo-event indices follow the event indices
+            for module_number, id_ in enumerate(sorted(module_ids))
+        }
+
+        for id_, gate in gate_from_id.items():
+            gate.module_index = module_index_from_id.get(id_)
+
+    @staticmethod
+    def compute_gate_modular_expressions(event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                                         expression_builder: AnyExpressionBuilder):
+        for gate in gate_from_id.values():
+            gate.compute_modular_expression(event_from_id, gate_from_id, expression_builder)
 
     @staticmethod
     def compute_event_probabilities(events: list['Event'], times: list[float], sample_size: int):
@@ -507,14 +691,10 @@ class FaultTree:
             event.compute_expected_rates()
 
     @staticmethod
-    def compute_gate_probabilities(gates: list['Gate'], computational_cache: ComputationalCache):
-        for gate in gates:
-            gate.compute_probabilities(computational_cache)
-
-    @staticmethod
-    def compute_gate_intensities(gates: list['Gate'], computational_cache: ComputationalCache):
-        for gate in gates:
-            gate.compute_intensities(computational_cache)
+    def compute_gate_quantities(event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                                computational_cache: ComputationalCache):
+        for gate in gate_from_id.values():
+            gate.compute_quantities(event_from_id, gate_from_id, computational_cache)
 
     @staticmethod
     def compute_gate_rates(gates: list['Gate']):
@@ -671,7 +851,7 @@ class Object:
     comment: Optional[str]
 
     flattened_indexer: Optional['FlattenedIndexer']
-    computed_expression: Optional[Expression]
+    computed_expression: Optional[AnyExpression]
     computed_probabilities: Optional[list[float]]
     computed_intensities: Optional[list[float]]
     computed_rates: Optional[list[float]]
@@ -955,9 +1135,17 @@ class Gate(Object):
     vote_threshold: Optional[int]
     input_ids: list[str]
     input_ids_line_number: int
+    computational_method: Optional[ComputationalMethod]
     comment: Optional[str]
 
     is_top_gate: Optional[bool]
+    actual_computational_method: Optional[ComputationalMethod]
+    module_index: Optional[int]
+    computed_cutoff_error: Optional[float]
+    computed_modular_expression: Optional[AnyExpression]
+    computed_probability_lower_bounds: Optional[list[float]]
+    computed_probability_upper_bounds: Optional[list[float]]
+    computed_probability_standard_errors: Optional[list[float]]
 
     def __init__(self, id_: str, properties: dict[str, Any]):
         label: str = properties.get('label')
@@ -966,6 +1154,7 @@ class Gate(Object):
         vote_threshold: int = properties.get('vote_threshold')
         input_ids: list[str] = properties.get('input_ids')
         input_ids_line_number: int = properties.get('input_ids_line_number')
+        computational_method: Optional[ComputationalMethod] = properties.get('computational_method')
         comment: str = properties.get('comment')
         unset_property_line_number: int = properties.get('unset_property_line_number')
 
@@ -980,10 +1169,18 @@ class Gate(Object):
         self.vote_threshold = vote_threshold
         self.input_ids = input_ids
         self.input_ids_line_number = input_ids_line_number
+        self.computational_method = computational_method
         self.comment = None  # placeholder assigned here for __dict__ order; to be reassigned by super()
 
         # Fields to be set by fault tree
         self.is_top_gate = None
+        self.actual_computational_method = None
+        self.module_index = None
+        self.computed_cutoff_error = None
+        self.computed_modular_expression = None
+        self.computed_probability_lower_bounds = None
+        self.computed_probability_upper_bounds = None
+        self.computed_probability_standard_errors = None
 
         # Fields shared with class Event
         super().__init__(id_, label, comment)
@@ -996,61 +1193,286 @@ class Gate(Object):
                 'computed_expected_probabilities', 'computed_expected_intensities', 'computed_expected_rates',
             ),
             ellipsis_attributes=(
-                'computed_expression', 'computed_probabilities', 'computed_intensities', 'computed_rates',
+                'computed_expression', 'computed_modular_expression',
+                'computed_probability_lower_bounds', 'computed_probability_upper_bounds',
+                'computed_probability_standard_errors',
+                'computed_probabilities', 'computed_intensities', 'computed_rates',
             ),
         )
 
+    def get_computed_probability_lower_bound(self, time_index: int, sample_index: int) -> float:
+        flattened_index = self.flattened_indexer.get_index(time_index, sample_index)
+        return self.computed_probability_lower_bounds[flattened_index]
+
+    def get_computed_probability_upper_bound(self, time_index: int, sample_index: int) -> float:
+        flattened_index = self.flattened_indexer.get_index(time_index, sample_index)
+        return self.computed_probability_upper_bounds[flattened_index]
+
+    def get_computed_probability_standard_error(self, time_index: int, sample_index: int) -> float:
+        flattened_index = self.flattened_indexer.get_index(time_index, sample_index)
+        return self.computed_probability_standard_errors[flattened_index]
+
+    @memoise('actual_computational_method')
+    def determine_actual_computational_method(self, default_computational_method: ComputationalMethod):
+        if self.computational_method is None:
+            return default_computational_method
+
+        return self.computational_method
+
     @memoise('computed_expression')
-    def compute_expression(self, event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate']) -> Expression:
+    def compute_expression(self, event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                           expression_builder: AnyExpressionBuilder) -> AnyExpression:
         object_from_id = {**event_from_id, **gate_from_id}
         input_expressions = [
-            object_from_id[input_id].compute_expression(event_from_id, gate_from_id)
+            expression_builder.from_expression(
+                object_from_id[input_id].compute_expression(event_from_id, gate_from_id, expression_builder)
+            )
             for input_id in self.input_ids
         ]
+        truncator = expression_builder.truncator
+        discarded_weight_before = 0. if truncator is None else truncator.discarded_weight
 
+        expression = self.combine_expressions(input_expressions, expression_builder)
+
+        discarded_weight = 0. if truncator is None else truncator.discarded_weight - discarded_weight_before
+        self.computed_cutoff_error = discarded_weight + sum(
+            gate_from_id[input_id].computed_cutoff_error
+            for input_id in self.input_ids
+            if input_id in gate_from_id
+        )
+
+        return expression
+
+    @memoise('computed_modular_expression')
+    def compute_modular_expression(self, event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                                   expression_builder: AnyExpressionBuilder) -> AnyExpression:
+        """
+        Compute the expression with each module (independent subtree) below the gate substituted by its pseudo-event,
+        so that a module is quantified once (and then as a single event) rather than expanded into its cut sets.
+        """
+        input_expressions = []
+
+        for input_id in self.input_ids:
+            if input_id in event_from_id:
+                input_expression = event_from_id[input_id].computed_expression
+            elif (input_gate := gate_from_id[input_id]).module_index is not None:
+                input_expression = Expression(Term.create_from_event_index(input_gate.module_index))
+            else:
+                input_expression = input_gate.compute_modular_expression(
+                    event_from_id, gate_from_id, expression_builder,
+                )
+
+            input_expressions.append(input_expression)
+
+        object_from_id = {**event_from_id, **gate_from_id}
+
+        if all(
+            input_expression is object_from_id[input_id].computed_expression
+            for input_id, input_expression in zip(self.input_ids, input_expressions)
+        ):  # nothing substituted below the gate
+            return self.computed_expression
+
+        return self.combine_expressions(
+            [expression_builder.from_expression(input_expression) for input_expression in input_expressions],
+            expression_builder,
+        )
+
+    def combine_expressions(self, input_expressions: list[AnyExpression],
+                            expression_builder: AnyExpressionBuilder) -> AnyExpression:
         if self.type_ == GateType.NULL:
             return input_expressions[0]
 
         if self.type_ == GateType.AND:
-            return Expression.conjunction(*input_expressions)
+            return expression_builder.conjunction(*input_expressions)
 
         if self.type_ == GateType.OR:
-            return Expression.disjunction(*input_expressions)
+            return expression_builder.disjunction(*input_expressions)
 
         if self.type_ == GateType.VOTE:
-            return Expression.vote(*input_expressions, threshold=self.vote_threshold)
+            return expression_builder.vote(*input_expressions, threshold=self.vote_threshold)
 
         raise ImplementationError(f'bad gate type `{self.type_}`')
 
-    @memoise('computed_probabilities')
-    def compute_probabilities(self, computational_cache: ComputationalCache) -> list[float]:
-        return [
-            computational_cache.expression_probability(self.computed_expression, flattened_index)
-            for flattened_index in range(self.flattened_indexer.flattened_size)
-        ]
+    def compute_quantities(self, event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate'],
+                           computational_cache: ComputationalCache) -> tuple[list[float], list[float]]:
+        """
+        Compute failure probabilities and intensities together (memoised into their respective attributes),
+        so that the quantification of the expression (or combination of inputs) is shared between them.
+
+        Lower and upper bounds on the failure probabilities are recorded alongside.
+        For inputs that are independent, these are combined from the bounds of the inputs
+        (the gate probability being increasing in each input probability).
+        Otherwise they are those reached by the computational method
+        (see `ComputationalCache.expression_probability_bounds`), with modules taken at their computed probabilities.
+
+        For `MonteCarlo` (with inputs that are not independent), the gate is simulated directly from the gate graph
+        (see `BitParallelSimulator.gate_quantities`), with no bounds but with standard errors on the probabilities.
+        Standard errors are otherwise zero, or propagated from those of independent inputs.
+        """
+        if self.computed_probabilities is not None and self.computed_intensities is not None:
+            return self.computed_probabilities, self.computed_intensities
+
+        for input_gate in self.input_gates(gate_from_id):
+            input_qs, input_omegas = input_gate.compute_quantities(event_from_id, gate_from_id, computational_cache)
+
+            if input_gate.module_index is not None:
+                pseudo_event_term = Term.create_from_event_index(input_gate.module_index)
+                computational_cache.register_term_probabilities(pseudo_event_term, input_qs)
+                computational_cache.register_term_intensities(pseudo_event_term, input_omegas)
+
+        if self.has_independent_inputs(event_from_id, gate_from_id):
+            object_from_id = {**event_from_id, **gate_from_id}
+            input_objects = [object_from_id[input_id] for input_id in self.input_ids]
+            input_qs = [input_object.computed_probabilities for input_object in input_objects]
+            input_omegas = [input_object.computed_intensities for input_object in input_objects]
+            input_lower_qs = [
+                input_object.computed_probability_lower_bounds if isinstance(input_object, Gate) else input_qs[i]
+                for i, input_object in enumerate(input_objects)
+            ]
+            input_upper_qs = [
+                input_object.computed_probability_upper_bounds if isinstance(input_object, Gate) else input_qs[i]
+                for i, input_object in enumerate(input_objects)
+            ]
+            input_standard_errors = [
+                input_object.computed_probability_standard_errors if isinstance(input_object, Gate) else None
+                for input_object in input_objects
+            ]
+            size = computational_cache.flattened_size
+
+            self.computed_probabilities = self.combine_independent_probabilities(input_qs, size)
+            self.computed_intensities = self.combine_independent_intensities(input_qs, input_omegas, size)
+            self.computed_probability_lower_bounds = self.combine_independent_probabilities(input_lower_qs, size)
+            self.computed_probability_upper_bounds = self.combine_independent_probabilities(input_upper_qs, size)
+            self.computed_probability_standard_errors = self.combine_independent_standard_errors(
+                input_qs, input_standard_errors, size,
+            )
+        elif self.actual_computational_method == ComputationalMethod.MONTE_CARLO:
+            probabilities, intensities, standard_errors = computational_cache.simulator().gate_quantities(
+                self, event_from_id, gate_from_id,
+            )
+            indeterminates = [float('nan')] * computational_cache.flattened_size
+
+            self.computed_probabilities = probabilities
+            self.computed_intensities = intensities
+            self.computed_probability_lower_bounds = indeterminates
+            self.computed_probability_upper_bounds = list(indeterminates)
+            self.computed_probability_standard_errors = standard_errors
+        else:
+            probabilities, intensities = computational_cache.expression_quantities(
+                self.computed_modular_expression, self.actual_computational_method,
+            )
+            lower_bounds, upper_bounds = computational_cache.expression_probability_bounds(
+                self.computed_modular_expression, self.actual_computational_method,
+            )
 
-    @memoise('computed_intensities')
-    def compute_intensities(self, computational_cache: ComputationalCache) -> list[float]:
-        return [
-            computational_cache.expression_intensity(self.computed_expression, flattened_index)
-            for flattened_index in range(self.flattened_indexer.flattened_size)
-        ]
+            self.computed_probabilities = list(probabilities)
+            self.computed_intensities = list(intensities)
+            self.computed_probability_lower_bounds = list(lower_bounds)
+            self.computed_probability_upper_bounds = list(upper_bounds)
+            self.computed_probability_standard_errors = [0.] * computational_cache.flattened_size
+
+        return self.computed_probabilities, self.computed_intensities
+
+    def combine_independent_probabilities(self, input_qs: list[list[float]], size: int) -> list[float]:
+        if self.type_ == GateType.NULL:
+            return list(input_qs[0])
+
+        if self.type_ == GateType.AND:
+            return conjunction_probabilities(input_qs, size)
+
+        if self.type_ == GateType.OR:
+            return disjunction_probabilities(input_qs, size)
 
-    def get_partials_from_event_index(self) -> dict[int, dict[bool, Expression]]:
+        if self.type_ == GateType.VOTE:
+            return vote_probabilities(input_qs, self.vote_threshold, size)
+
+        raise ImplementationError(f'bad gate type `{self.type_}`')
+
+    def combine_independent_standard_errors(self, input_qs: list[list[float]],
+                                            input_standard_errors: list[Optional[list[float]]],
+                                            size: int) -> list[float]:
+        """
+        Propagate the standard errors of independent inputs to the gate probability, to first order,
+            σ² = ∑{i} (∂q/∂q_i)² σ_i²,
+        where ∂q/∂q_i = q[q_i=1] − q[q_i=0] since the gate probability is linear in each input probability.
+        Inputs without standard errors (events) contribute nothing.
+        """
+        variances = [0.] * size
+
+        for i, standard_errors in enumerate(input_standard_errors):
+            if standard_errors is None or not any(standard_errors):
+                continue
+
+            qs_true = self.combine_independent_probabilities([*input_qs[:i], [1.] * size, *input_qs[i+1:]], size)
+            qs_false = self.combine_independent_probabilities([*input_qs[:i], [0.] * size, *input_qs[i+1:]], size)
+            variances = [
+                variance + ((q_true - q_false) * standard_error) ** 2
+                for variance, q_true, q_false, standard_error in zip(variances, qs_true, qs_false, standard_errors)
+            ]
+
+        return [math.sqrt(variance) for variance in variances]
+
+    def combine_independent_intensities(self, input_qs: list[list[float]], input_omegas: list[list[float]],
+                                        size: int) -> list[float]:
+        if self.type_ == GateType.NULL:
+            return list(input_omegas[0])
+
+        if self.type_ == GateType.AND:
+            return conjunction_intensities(input_qs, input_omegas, size)
+
+        if self.type_ == GateType.OR:
+            return disjunction_intensities(input_qs, input_omegas, size)
+
+        if self.type_ == GateType.VOTE:
+            return vote_intensities(input_qs, input_omegas, self.vote_threshold, size)
+
+        raise ImplementationError(f'bad gate type `{self.type_}`')
+
+    def input_gates(self, gate_from_id: dict[str, 'Gate']) -> list['Gate']:
+        return [gate_from_id[input_id] for input_id in self.input_ids if input_id in gate_from_id]
+
+    def has_independent_inputs(self, event_from_id: dict[str, 'Event'], gate_from_id: dict[str, 'Gate']) -> bool:
+        """
+        Decide whether the inputs are independent, i.e. whether their expressions share no events.
+        """
+        object_from_id = {**event_from_id, **gate_from_id}
+        seen_event_indices = set()
+
+        for input_id in self.input_ids:
+            event_indices = set(object_from_id[input_id].computed_expression.event_indices())
+
+            if event_indices & seen_event_indices:
+                return False
+
+            seen_event_indices |= event_indices
+
+        return True
+
+    def get_partial_probabilities_from_event_index(
+        self, computational_method: ComputationalMethod, computational_cache: ComputationalCache,
+    ) -> tuple[Sequence[float], dict[int, dict[bool, Sequence[float]]]]:
+        """
+        Compute failure probabilities for the gate, along with those for the gate with each event substituted by
+        `True` and by `False`, across flattened indices.
+
+        For `BinaryDecisionDiagram`, these are all obtained from a single sweep of the diagram
+        (rather than quantifying the substituted expressions for each event).
+        Otherwise, each substituted expression is quantified separately (so as to be truncated as is the gate).
+        """
         expression = self.computed_expression
 
-        implicated_event_indices = set(
-            index
-            for term in expression.terms
-            for index in term.event_indices()
-        )
+        if computational_method == ComputationalMethod.BINARY_DECISION_DIAGRAM:
+            return computational_cache.expression_cofactor_probabilities(expression)
 
-        return {
+        def qs(expression_: AnyExpression) -> Sequence[float]:
+            return computational_cache.expression_probabilities(expression_, computational_method)
+
+        return qs(expression), {
             event_index: {
-                True: expression.substitute_true(event_index),
-                False: expression.substitute_false(event_index),
+                True: qs(expression.substitute_true(event_index)),
+                False: qs(expression.substitute_false(event_index)),
             }
-            for event_index in sorted(implicated_event_indices)
+            for event_index in expression.event_indices()
         }
 
     def compile_cut_set_table(self, events: list[Event], times: list[float], sample_size: int,
@@ -1106,10 +1528,19 @@ class Gate(Object):
             'risk_reduction_worth',
         ]
 
-        partial_from_boolean_from_event_index = self.get_partials_from_event_index()
+        computational_method = (  # exact results being the same by any exact method, quantify via the diagram
+            ComputationalMethod.BINARY_DECISION_DIAGRAM
+            if computational_cache.is_exact(self.actual_computational_method)
+            else self.actual_computational_method
+        )
+        q_gates, partial_qs_from_boolean_from_event_index = self.get_partial_probabilities_from_event_index(
+            computational_method, computational_cache,
+        )
         gate_expression = self.computed_expression
         flattened_index = self.flattened_indexer.get_index
-        q = computational_cache.expression_probability
+
+        def q(expression: AnyExpression, index: int) -> float:
+            return computational_cache.expression_probability(expression, index, computational_method)
 
         data = [
             [
@@ -1122,7 +1553,7 @@ class Gate(Object):
                 robust_divide(q_partial_true, q_gate),
                 robust_divide(q_gate, q_partial_false),
             ]
-            for event_index, partial_from_boolean in partial_from_boolean_from_event_index.items()
+            for event_index, partial_qs_from_boolean in partial_qs_from_boolean_from_event_index.items()
             if (
                 event := events[event_index],
                 filtered_expression := gate_expression.filter_terms(event_index),
@@ -1131,10 +1562,10 @@ class Gate(Object):
             for sample_index in range(sample_size)
             if (
                 i := flattened_index(time_index, sample_index),
-                q_partial_true := q(partial_from_boolean[True], i),
-                q_partial_false := q(partial_from_boolean[False], i),
+                q_partial_true := partial_qs_from_boolean[True][i],
+                q_partial_false := partial_qs_from_boolean[False][i],
                 q_event := event.get_computed_probability(time_index, sample_index),
-                q_gate := self.get_computed_probability(time_index, sample_index),
+                q_gate := q_gates[i],  # quantified as are the partials, for consistent truncation
                 q_filtered := q(filtered_expression, i),
             )
         ]
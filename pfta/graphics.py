@@ -16,11 +16,11 @@ import textwrap
 from typing import TYPE_CHECKING, Optional
 
 import pfta.core
-from pfta.boolean import Term, Expression
 from pfta.common import format_quantity
 from pfta.constants import EventAppearance, GateType, SymbolType
 from pfta.utilities import format_number
 from pfta.woe import ImplementationError
+from pfta.zbdd import AnyExpression
 
 if TYPE_CHECKING:
     from pfta.core import FaultTree, Object
@@ -559,7 +559,7 @@ class QuantityBoxGraphic(Graphic):
 class QuantityTextGraphic(Graphic):
     x: int
     y: int
-    expression: Expression
+    expression: AnyExpression
     probability: float
     intensity: float
     sample_size: int
@@ -582,10 +582,10 @@ class QuantityTextGraphic(Graphic):
         centre = self.x
         middle = self.y + QUANTITY_BOX_Y_OFFSET
 
-        if self.expression == Expression(Term(encoding=0)):
-            return f'<text x="{centre}" y="{middle}">True</text>'
+        if not self.expression.event_indices():  # expression is constant
+            if self.expression.sole_term_encoding() == 0:
+                return f'<text x="{centre}" y="{middle}">True</text>'
 
-        if self.expression == Expression():
             return f'<text x="{centre}" y="{middle}">False</text>'
 
         line_half_gap = DEFAULT_FONT_SIZE * DEFAULT_LINE_SPACING / 2
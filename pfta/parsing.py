@@ -18,6 +18,9 @@ from pfta.constants import (
     BOOLEAN_FROM_STRING, IS_PAGED_EXPLAINER,
     EVENT_APPEARANCE_FROM_STRING, EVENT_APPEARANCE_EXPLAINER,
     GATE_TYPE_EXPLAINER,
+    COMPUTATIONAL_METHOD_FROM_STRING, COMPUTATIONAL_METHOD_EXPLAINER,
+    INTENSITY_METHOD_FROM_STRING, INTENSITY_METHOD_EXPLAINER,
+    CUT_SET_REPRESENTATION_FROM_STRING, CUT_SET_REPRESENTATION_EXPLAINER,
     MODEL_TYPE_FROM_STRING, VALID_MODEL_KEYS, MODEL_TYPE_EXPLAINER,
     VALID_KEYS_FROM_CLASS, KEY_EXPLAINER_FROM_CLASS,
     VALID_ID_REGEX, ID_EXPLAINER,
@@ -79,6 +82,18 @@ class InvalidGateTypeException(FaultTreeTextException):
     pass
 
 
+class InvalidComputationalMethodException(FaultTreeTextException):
+    pass
+
+
+class InvalidIntensityMethodException(FaultTreeTextException):
+    pass
+
+
+class InvalidCutSetRepresentationException(FaultTreeTextException):
+    pass
+
+
 class InvalidDistributionException(FaultTreeTextException):
     pass
 
@@ -338,6 +353,17 @@ def parse_fault_tree_properties(parsed_assembly: ParsedAssembly) -> dict[str, An
             properties['sample_size_line_number'] = parsed_line.number
             continue
 
+        if key == 'computational_method':
+            try:
+                properties['computational_method'] = COMPUTATIONAL_METHOD_FROM_STRING[value]
+            except KeyError:
+                raise InvalidComputationalMethodException(
+                    parsed_line.number,
+                    f'invalid value `{value}`',
+                    COMPUTATIONAL_METHOD_EXPLAINER,
+                )
+            continue
+
         if key == 'computational_order':
             try:
                 properties['computational_order'] = int(value)
@@ -355,6 +381,78 @@ def parse_fault_tree_properties(parsed_assembly: ParsedAssembly) -> dict[str, An
             properties['computational_tolerance_line_number'] = parsed_line.number
             continue
 
+        if key == 'computational_pruning':
+            try:
+                properties['computational_pruning'] = float(value)
+            except ValueError:
+                raise InvalidFloatException(parsed_line.number, f'unable to convert `{value}` to float')
+
+            properties['computational_pruning_raw'] = value
+            properties['computational_pruning_line_number'] = parsed_line.number
+            continue
+
+        if key in ('computational_absolute_gap', 'computational_relative_gap'):
+            try:
+                properties[key] = float(value)
+            except ValueError:
+                raise InvalidFloatException(parsed_line.number, f'unable to convert `{value}` to float')
+
+            properties[f'{key}_raw'] = value
+            properties[f'{key}_line_number'] = parsed_line.number
+            continue
+
+        if key == 'computational_trials':
+            try:
+                properties['computational_trials'] = int(value)
+            except ValueError:
+                raise InvalidIntegerException(parsed_line.number, f'unable to convert `{value}` to integer')
+
+            properties['computational_trials_raw'] = value
+            properties['computational_trials_line_number'] = parsed_line.number
+            continue
+
+        if key == 'intensity_method':
+            try:
+                properties['intensity_method'] = INTENSITY_METHOD_FROM_STRING[value]
+            except KeyError:
+                raise InvalidIntensityMethodException(
+                    parsed_line.number,
+                    f'invalid value `{value}`',
+                    INTENSITY_METHOD_EXPLAINER,
+                )
+            continue
+
+        if key == 'cut_set_cutoff':
+            try:
+                properties['cut_set_cutoff'] = float(value)
+            except ValueError:
+                raise InvalidFloatException(parsed_line.number, f'unable to convert `{value}` to float')
+
+            properties['cut_set_cutoff_raw'] = value
+            properties['cut_set_cutoff_line_number'] = parsed_line.number
+            continue
+
+        if key == 'max_cut_set_order':
+            try:
+                properties['max_cut_set_order'] = int(value)
+            except ValueError:
+                raise InvalidIntegerException(parsed_line.number, f'unable to convert `{value}` to integer')
+
+            properties['max_cut_set_order_raw'] = value
+            properties['max_cut_set_order_line_number'] = parsed_line.number
+            continue
+
+        if key == 'cut_set_representation':
+            try:
+                properties['cut_set_representation'] = CUT_SET_REPRESENTATION_FROM_STRING[value]
+            except KeyError:
+                raise InvalidCutSetRepresentationException(
+                    parsed_line.number,
+                    f'invalid value `{value}`',
+                    CUT_SET_REPRESENTATION_EXPLAINER,
+                )
+            continue
+
         if key == 'significant_figures':
             try:
                 properties['significant_figures'] = int(value)
@@ -511,6 +609,17 @@ def parse_gate_properties(parsed_assembly: ParsedAssembly) -> dict[str, Any]:
             properties['input_ids_line_number'] = parsed_line.number
             continue
 
+        if key == 'computational_method':
+            try:
+                properties['computational_method'] = COMPUTATIONAL_METHOD_FROM_STRING[value]
+            except KeyError:
+                raise InvalidComputationalMethodException(
+                    parsed_line.number,
+                    f'invalid value `{value}`',
+                    COMPUTATIONAL_METHOD_EXPLAINER,
+                )
+            continue
+
         raise ImplementationError(f'bad key `{key}`')
 
     properties['unset_property_line_number'] = parsed_assembly.last_line_number() + 1
@@ -0,0 +1,310 @@
+"""
+# Public Fault Tree Analyser: simulation.py
+
+Bit-parallel Monte Carlo simulation.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import math
+import random
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from pfta.common import natural_repr
+from pfta.constants import GateType
+from pfta.utilities import vote_counts
+from pfta.woe import ImplementationError
+from pfta.zbdd import AnyExpression
+
+if TYPE_CHECKING:
+    from pfta.core import Event, Gate
+
+
+class BitParallelSimulator:
+    """
+    Bit-parallel Monte Carlo simulator of failure states.
+
+    The states of an event (or gate) across all trials are packed into a single (arbitrary-precision) integer,
+    with bit i being set if and only if the event (or gate) is failed in trial i.
+    Thus a gate is evaluated across all trials at once by bitwise operations on the states of its inputs,
+    costing one machine operation per 64 trials or so (see `conjunction_states`, `disjunction_states`, `vote_states`).
+
+    Event states are sampled (per flattened index) from the event failure probabilities (see `bernoulli_states`),
+    with each event having its own pseudo-random generator (seeded by the fault tree seed and the event index),
+    so that the states of an event do not depend on which gates are simulated, or in which order.
+    The same states are shared by every gate (common random numbers).
+    """
+    _qs_from_event_index: dict[int, list[float]]
+    _omegas_from_event_index: dict[int, list[float]]
+    _states_from_event_index: dict[int, list[int]]
+    _event_indices_from_gate_id: dict[str, frozenset[int]]
+    flattened_size: int
+    trial_count: int
+    seed: Optional[str]
+
+    def __init__(self, events: list['Event'], flattened_size: int, trial_count: int, seed: Optional[str]):
+        self._qs_from_event_index = {event.index: event.computed_probabilities for event in events}
+        self._omegas_from_event_index = {event.index: event.computed_intensities for event in events}
+        self._states_from_event_index = {}
+        self._event_indices_from_gate_id = {}
+        self.flattened_size = flattened_size
+        self.trial_count = trial_count
+        self.seed = seed
+
+    def __repr__(self):
+        return natural_repr(self, ellipsis_attributes=('flattened_size', 'trial_count', 'seed'))
+
+    def all_states(self) -> int:
+        return (1 << self.trial_count) - 1
+
+    def event_states(self, event_index: int) -> list[int]:
+        """
+        Sampled states of an event across trials, for each flattened index.
+        """
+        if event_index not in self._states_from_event_index:
+            random_ = random.Random() if self.seed is None else random.Random(f'{self.seed}:{event_index}')
+            self._states_from_event_index[event_index] = [
+                bernoulli_states(q, self.trial_count, random_)
+                for q in self._qs_from_event_index[event_index]
+            ]
+
+        return self._states_from_event_index[event_index]
+
+    def expression_probabilities(self, expression: AnyExpression) -> list[float]:
+        """
+        Estimated failure probabilities for a general Boolean expression (a disjunction of terms),
+        across flattened indices, being the fraction of trials in which some term has all its events failed.
+        """
+        term_event_indices = [term.event_indices() for term in sorted(expression.terms)]
+        all_states = self.all_states()
+
+        return [
+            float('nan')
+            if any(math.isnan(self._qs_from_event_index[e][index]) for t in term_event_indices for e in t)
+            else disjunction_states([
+                conjunction_states([self.event_states(e)[index] for e in t], all_states)
+                for t in term_event_indices
+            ]).bit_count() / self.trial_count
+            for index in range(self.flattened_size)
+        ]
+
+    def expression_quantities(self, expression: AnyExpression) -> tuple[list[float], list[float]]:
+        """
+        Estimated failure probabilities and intensities for a general Boolean expression (a disjunction of terms),
+        across flattened indices.
+
+        The failure probabilities are as per `expression_probabilities`.
+        The failure intensity is estimated by the product rule,
+            ω[T] = ∑{e} ω[e] Pr(T is critical with respect to e),
+        where T is critical with respect to e when T[e=1] holds but T[e=0] does not,
+        with T[e=1] being the disjunction of the terms containing e (with e removed),
+        and T[e=0] being the disjunction of the terms not containing e.
+        """
+        term_event_indices = [term.event_indices() for term in sorted(expression.terms)]
+        event_indices = sorted({event_index for event_indices_ in term_event_indices for event_index in event_indices_})
+        all_states = self.all_states()
+
+        qs = self.expression_probabilities(expression)
+        omegas = []
+
+        for index in range(self.flattened_size):
+            if any(math.isnan(self._qs_from_event_index[e][index]) for e in event_indices):
+                omegas.append(float('nan'))
+                continue
+
+            def term_states(event_indices_: Iterable[int]) -> int:
+                return conjunction_states([self.event_states(e)[index] for e in event_indices_], all_states)
+
+            critical_counts = {
+                e: (
+                    disjunction_states([term_states(f for f in t if f != e) for t in term_event_indices if e in t])
+                    & ~disjunction_states([term_states(t) for t in term_event_indices if e not in t])
+                ).bit_count()
+                for e in event_indices
+                if self._omegas_from_event_index[e][index] != 0
+            }
+
+            omegas.append(
+                sum(self._omegas_from_event_index[e][index] * count for e, count in critical_counts.items())
+                / self.trial_count
+            )
+
+        return qs, omegas
+
+    def gate_quantities(self, gate: 'Gate', event_from_id: dict[str, 'Event'],
+                        gate_from_id: dict[str, 'Gate']) -> tuple[list[float], list[float], list[float]]:
+        """
+        Estimated failure probabilities and intensities for a gate, along with the standard errors
+        of the estimated probabilities, across flattened indices.
+
+        The gate is evaluated directly from the gate graph (without its cut sets),
+        with the failure probability estimated by the fraction q of trials in which the gate is failed,
+        whose standard error is √[q (1 − q) / N] for N trials.
+        The failure intensity is estimated by the product rule (see `expression_quantities`),
+        with the gate re-evaluated (only for gates above e) with the states of e forced to True and to False.
+        """
+        event_indices = sorted(self.gate_event_indices(gate.id_, event_from_id, gate_from_id))
+        all_states = self.all_states()
+
+        qs = []
+        omegas = []
+        standard_errors = []
+
+        for index in range(self.flattened_size):
+            if any(math.isnan(self._qs_from_event_index[e][index]) for e in event_indices):
+                qs.append(float('nan'))
+                omegas.append(float('nan'))
+                standard_errors.append(float('nan'))
+                continue
+
+            def evaluate(id_: str, forced_states_from_event_index: dict[int, int],
+                         states_from_gate_id: dict[str, int]) -> int:
+                if id_ in event_from_id:
+                    event_index = event_from_id[id_].index
+
+                    if event_index in forced_states_from_event_index:
+                        return forced_states_from_event_index[event_index]
+
+                    return self.event_states(event_index)[index]
+
+                if id_ not in states_from_gate_id:
+                    input_gate = gate_from_id[id_]
+                    states_from_gate_id[id_] = gate_states(
+                        input_gate.type_, input_gate.vote_threshold,
+                        [
+                            evaluate(input_id, forced_states_from_event_index, states_from_gate_id)
+                            for input_id in input_gate.input_ids
+                        ],
+                        all_states,
+                    )
+
+                return states_from_gate_id[id_]
+
+            def evaluate_forced(event_index: int, forced_states: int) -> int:
+                states_from_gate_id = {  # gates not above the event are unaffected
+                    id_: states
+                    for id_, states in unforced_states_from_gate_id.items()
+                    if event_index not in self._event_indices_from_gate_id[id_]
+                }
+                return evaluate(gate.id_, {event_index: forced_states}, states_from_gate_id)
+
+            unforced_states_from_gate_id = {}
+            failure_count = evaluate(gate.id_, {}, unforced_states_from_gate_id).bit_count()
+            critical_counts = {
+                e: (evaluate_forced(e, all_states) & ~evaluate_forced(e, 0)).bit_count()
+                for e in event_indices
+                if self._omegas_from_event_index[e][index] != 0
+            }
+
+            q = failure_count / self.trial_count
+
+            qs.append(q)
+            omegas.append(
+                sum(self._omegas_from_event_index[e][index] * count for e, count in critical_counts.items())
+                / self.trial_count
+            )
+            standard_errors.append(math.sqrt(q * (1 - q) / self.trial_count))
+
+        return qs, omegas, standard_errors
+
+    def gate_event_indices(self, gate_id: str, event_from_id: dict[str, 'Event'],
+                           gate_from_id: dict[str, 'Gate']) -> frozenset[int]:
+        """
+        Indices of the events below a gate (memoised for every gate below it).
+        """
+        if gate_id not in self._event_indices_from_gate_id:
+            event_indices = set()
+
+            for input_id in gate_from_id[gate_id].input_ids:
+                if input_id in event_from_id:
+                    event_indices.add(event_from_id[input_id].index)
+                else:
+                    event_indices |= self.gate_event_indices(input_id, event_from_id, gate_from_id)
+
+            self._event_indices_from_gate_id[gate_id] = frozenset(event_indices)
+
+        return self._event_indices_from_gate_id[gate_id]
+
+
+def bernoulli_states(probability: float, trial_count: int, random_: random.Random) -> int:
+    """
+    Sample independent Bernoulli states across trials, packed into an integer.
+
+    Each trial compares a uniform variate U with the probability q digit-by-digit in binary,
+    drawing one random bit per trial per digit (for all trials at once), with the trials whose comparison is undecided
+    halving with each digit. The state is True if and only if U < q, being decided at the first digit where they differ
+    (or False if the digits of q run out first), so that the states are exactly Bernoulli(q).
+    """
+    all_states = (1 << trial_count) - 1
+
+    if probability >= 1:
+        return all_states
+
+    states = 0
+    undecided = all_states
+    remainder = probability
+
+    while undecided and remainder > 0:
+        remainder *= 2  # exact for floats
+        bits = random_.getrandbits(trial_count)
+
+        if remainder >= 1:  # digit of q is 1, so U < q where the digit of U is 0
+            remainder -= 1
+            states |= undecided & ~bits
+            undecided &= bits
+        else:  # digit of q is 0, so U > q where the digit of U is 1
+            undecided &= ~bits
+
+    return states
+
+
+def conjunction_states(input_states: Iterable[int], all_states: int) -> int:
+    states = all_states
+
+    for input_states_ in input_states:
+        states &= input_states_
+
+    return states
+
+
+def disjunction_states(input_states: list[int]) -> int:
+    states = 0
+
+    for input_states_ in input_states:
+        states |= input_states_
+
+    return states
+
+
+def vote_states(input_states: list[int], threshold: int, all_states: int) -> int:
+    """
+    States of a vote, via the "at least k of the first i inputs" recurrence
+        A'[k] = A[k] | (A[k−1] & x),
+    where A[0] is True, and x is the states of the ith input.
+    """
+    at_least_states = [all_states] + [0] * threshold
+    input_count = len(input_states)
+
+    for i, states in enumerate(input_states, start=1):
+        for k in vote_counts(i, input_count, threshold):
+            at_least_states[k] |= at_least_states[k-1] & states
+
+    return at_least_states[threshold]
+
+
+def gate_states(type_: GateType, vote_threshold: Optional[int], input_states: list[int], all_states: int) -> int:
+    if type_ == GateType.NULL:
+        return input_states[0]
+
+    if type_ == GateType.AND:
+        return conjunction_states(input_states, all_states)
+
+    if type_ == GateType.OR:
+        return disjunction_states(input_states)
+
+    if type_ == GateType.VOTE:
+        return vote_states(input_states, vote_threshold, all_states)
+
+    raise ImplementationError(f'bad gate type `{type_}`')
@@ -10,8 +10,9 @@ This is free software with NO WARRANTY etc. etc., see LICENSE.
 
 import itertools
 import math
+import operator
 import re
-from typing import Iterable, Optional, Collection, TypeVar
+from typing import Iterable, Optional, Sequence, TypeVar
 
 from pfta.woe import ImplementationError
 
@@ -128,14 +129,47 @@ def descending_sum(terms: Iterable[float]) -> float:
     return sum(sorted(terms, reverse=True))
 
 
-def concrete_combinations(items: Collection[T], order: int) -> list[tuple[T, ...]]:
+def elementwise_sum(columns: Iterable[Sequence[float]], size: int, chunk_size: int = 1 << 16) -> list[float]:
     """
-    Compute concrete term combinations (subset-tuples) of given order (size).
+    Compute the elementwise sum of a sequence of equal-length columns (an empty sequence summing to zeroes).
 
-    Concrete, because `itertools.combinations` returns an iterator (which gets consumed on first iteration),
-    and we convert it to a list so that it persists multiple iterations.
+    Each element is summed in descending order (as per `descending_sum`), over a batch of columns at a time
+    (of at most `chunk_size` values, bar a single column wider than that), with the running sums carried into the next.
+    This bounds memory usage when the columns are streamed.
     """
-    return list(itertools.combinations(items, order))
+    columns = iter(columns)
+    batch_column_count = max(1, chunk_size // max(1, size))
+    sums = [0.] * size
+
+    while batch := list(itertools.islice(columns, batch_column_count)):
+        if len(batch) == 1:  # order immaterial for a sum of two
+            sums = list(map(operator.add, sums, batch[0]))
+        else:
+            sums = [descending_sum(values) for values in zip(sums, *batch)]
+
+    return sums
+
+
+def elementwise_product(x: Sequence[float], y: Sequence[float]) -> list[float]:
+    """
+    Compute the elementwise product of two equal-length columns.
+    """
+    return list(map(operator.mul, x, y))
+
+
+def elementwise_scale(scalar: float, column: Sequence[float]) -> list[float]:
+    """
+    Compute the product of a scalar and a column.
+    """
+    return [scalar * value for value in column]
+
+
+def vote_counts(i: int, input_count: int, threshold: int) -> range:
+    """
+    Compute the counts k (in descending order) for which "at least k of the first i inputs" is updated
+    at step i of a vote, being those attainable with i inputs, and from which the threshold remains attainable.
+    """
+    return range(min(i, threshold), max(0, threshold - input_count + i - 1), -1)
 
 
 def find_cycles(adjacency_dict: dict[T, set[T]]) -> set[tuple[T, ...]]:
@@ -170,3 +204,79 @@ def find_cycles(adjacency_dict: dict[T, set[T]]) -> set[tuple[T, ...]]:
         infect(first_clean_node)
 
     return infection_cycles
+
+
+def find_modules(adjacency_dict: dict[T, list[T]]) -> set[T]:
+    """
+    Find modules of a directed acyclic graph, i.e. non-leaf nodes whose descendants are reachable only via the node,
+    via the linear-time visit-date algorithm of Dutuit & Rauzy (1996).
+
+    A depth-first traversal (from every root) dates the first visit, last visit, and second visit (after children)
+    of each node, revisits not being descended into. A node is then a module if and only if every descendant
+    is first visited after the node's first visit, and last visited before the node's second visit.
+    """
+    first_dates = {}
+    last_dates = {}
+    second_dates = {}
+    date = 0
+
+    all_children = {child for children in adjacency_dict.values() for child in children}
+    roots = sorted(set(adjacency_dict) - all_children)
+
+    visit_stack = [(root, None) for root in reversed(roots)]  # explicit stack, since fault trees may run deep
+
+    while visit_stack:
+        node, children = visit_stack.pop()
+
+        if children is None:  # arrival
+            date += 1
+            last_dates[node] = date
+
+            if node in first_dates:  # revisit
+                continue
+
+            first_dates[node] = date
+            children = iter(adjacency_dict.get(node, ()))
+
+        for child in children:
+            visit_stack.append((node, children))
+            visit_stack.append((child, None))
+            break
+        else:  # children exhausted
+            date += 1
+            second_dates[node] = date
+
+    earliest_dates = {}
+    latest_dates = {}
+    dating_stack = list(roots)
+
+    while dating_stack:
+        node = dating_stack[-1]
+
+        if node in earliest_dates:
+            dating_stack.pop()
+            continue
+
+        children = adjacency_dict.get(node, ())
+        undated_children = [child for child in children if child not in earliest_dates]
+
+        if undated_children:
+            dating_stack.extend(undated_children)
+            continue
+
+        earliest_date = math.inf
+        latest_date = -math.inf
+
+        for child in children:
+            earliest_date = min(earliest_date, first_dates[child], earliest_dates[child])
+            latest_date = max(latest_date, last_dates[child], latest_dates[child])
+
+        earliest_dates[node] = earliest_date
+        latest_dates[node] = latest_date
+        dating_stack.pop()
+
+    return {
+        node
+        for node, children in adjacency_dict.items()
+        if children and first_dates[node] < earliest_dates[node] and latest_dates[node] < second_dates[node]
+    }
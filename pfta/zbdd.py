@@ -0,0 +1,589 @@
+"""
+# Public Fault Tree Analyser: zbdd.py
+
+Zero-suppressed binary decision diagrams for storing families of minimal cut sets.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import math
+from typing import Generator, Iterator, Optional, Union
+
+from pfta.boolean import Term, Expression, ExpressionBuilder, Truncator
+from pfta.utilities import vote_counts
+from pfta.woe import ImplementationError
+
+EMPTY_NODE = 0  # the empty family, i.e. False
+BASE_NODE = 1  # the family containing only the empty set, i.e. True
+
+COMMUTATIVE_OPERATIONS = ('union', 'product')
+
+Request = tuple[str, int, Union[int, float]]
+
+
+class ZeroSuppressedDiagram:
+    """
+    A shared zero-suppressed binary decision diagram (ZBDD), representing families of sets of event indices,
+    i.e. disjunctions of terms, with event indices as variables (in ascending order).
+
+    Each internal node with variable x represents the family
+        F = F[x∉] ∪ {S ∪ {x} : S ∈ F[x∈]},
+    with the subfamilies F[x∉] (low) and F[x∈] (high) themselves being nodes.
+    Nodes whose high is the empty family are suppressed, so that sets are stored only via the events they contain,
+    and families of cut sets sharing many events are stored in a fraction of the memory of an explicit set of terms.
+
+    Operations are written as generators (yielding requests for sub-operations and receiving their results),
+    which are run by an explicit stack (rather than by recursion), so as not to be limited by recursion depth.
+
+    If a truncator is supplied, negligible sets are discarded after each conjunction, disjunction, or vote step.
+    """
+    _variables: list[float]
+    _lows: list[int]
+    _highs: list[int]
+    _node_from_triple: dict[tuple[int, int, int], int]
+    _computed_from_request: dict[Request, int]
+    _weight_from_node: dict[int, float]
+    truncator: Optional[Truncator]
+
+    def __init__(self, truncator: Optional[Truncator] = None):
+        self._variables = [math.inf, math.inf]  # terminals sit below all variables
+        self._lows = [EMPTY_NODE, BASE_NODE]
+        self._highs = [EMPTY_NODE, BASE_NODE]
+        self._node_from_triple = {}
+        self._computed_from_request = {}
+        self._weight_from_node = {EMPTY_NODE: 0., BASE_NODE: 1.}
+        self.truncator = truncator
+
+    def __repr__(self):
+        return f'ZeroSuppressedDiagram(<{len(self._variables)} nodes>)'
+
+    def make_node(self, variable: int, low: int, high: int) -> int:
+        """
+        Produce the (unique) node for a given variable and pair of subfamilies, applying the zero-suppression rule.
+        """
+        if high == EMPTY_NODE:  # no set contains the variable
+            return low
+
+        triple = (variable, low, high)
+
+        try:
+            return self._node_from_triple[triple]
+        except KeyError:
+            node = len(self._variables)
+
+            self._variables.append(variable)
+            self._lows.append(low)
+            self._highs.append(high)
+            self._node_from_triple[triple] = node
+
+            return node
+
+    def variable(self, node: int) -> float:
+        return self._variables[node]
+
+    def low(self, node: int) -> int:
+        return self._lows[node]
+
+    def high(self, node: int) -> int:
+        return self._highs[node]
+
+    def from_term(self, term: Term) -> int:
+        node = BASE_NODE
+
+        for event_index in reversed(term.event_indices()):
+            node = self.make_node(event_index, EMPTY_NODE, node)
+
+        return node
+
+    def from_expression(self, expression: Union[Expression, 'ZeroSuppressedExpression']) -> 'ZeroSuppressedExpression':
+        if isinstance(expression, ZeroSuppressedExpression):
+            return expression
+
+        node = EMPTY_NODE
+
+        for term in sorted(expression.terms):
+            node = self._evaluate('union', node, self.from_term(term))
+
+        return ZeroSuppressedExpression(self, self._evaluate('minimal', node, EMPTY_NODE))
+
+    def conjunction(self, *expressions: 'ZeroSuppressedExpression') -> 'ZeroSuppressedExpression':
+        """
+        Compute the conjunction (AND) of a sequence of expressions, with redundant terms removed.
+
+        The expressions are folded in fewest terms first, as for `Expression.conjunction`,
+        so that truncation after each step discards the same terms as it does there.
+        """
+        node = BASE_NODE
+
+        for expression in sorted(expressions, key=lambda e: e.term_count()):
+            node = self._evaluate('minimal', self._evaluate('product', node, expression.node), EMPTY_NODE)
+            node = self.truncate(node)
+
+        return ZeroSuppressedExpression(self, node)
+
+    def disjunction(self, *expressions: 'ZeroSuppressedExpression') -> 'ZeroSuppressedExpression':
+        """
+        Compute the disjunction (OR) of a sequence of expressions, with redundant terms removed.
+        """
+        node = EMPTY_NODE
+
+        for expression in expressions:
+            node = self._evaluate('union', node, expression.node)
+
+        return ZeroSuppressedExpression(self, self.truncate(self._evaluate('minimal', node, EMPTY_NODE)))
+
+    def vote(self, *input_expressions: 'ZeroSuppressedExpression', threshold: int) -> 'ZeroSuppressedExpression':
+        """
+        Compute the vote of a sequence of expressions.
+
+        Rather than enumerating every combination of inputs, we use the recurrence
+            (at least k of the first i inputs) = (at least k of the first i−1 inputs)
+                                                 + (at least k−1 of the first i−1 inputs) . (ith input),
+        with redundant terms removed at each step.
+        """
+        at_least_nodes = [BASE_NODE] + [EMPTY_NODE] * threshold
+        input_count = len(input_expressions)
+
+        for i, expression in enumerate(input_expressions, start=1):
+            for k in vote_counts(i, input_count, threshold):
+                product_node = self._evaluate('product', at_least_nodes[k-1], expression.node)
+                union_node = self._evaluate('union', at_least_nodes[k], product_node)
+                at_least_nodes[k] = self.truncate(self._evaluate('minimal', union_node, EMPTY_NODE))
+
+        return ZeroSuppressedExpression(self, at_least_nodes[threshold])
+
+    def truncate(self, node: int) -> int:
+        """
+        Discard negligible sets (per the truncator, if any), accumulating their weight in the truncator.
+        """
+        if self.truncator is None:
+            return node
+
+        retained_node = node
+
+        if self.truncator.max_order is not None:
+            retained_node = self._evaluate('max_order', retained_node, self.truncator.max_order)
+
+        if self.truncator.cutoff > 0:
+            retained_node = self._evaluate('cutoff', retained_node, self.truncator.cutoff)
+
+        if retained_node != node:
+            discarded_node = self._evaluate('difference', node, retained_node)
+            self.truncator.discarded_weight += self.weight(discarded_node)
+
+        return retained_node
+
+    def weight(self, node: int) -> float:
+        """
+        Compute the total weight (per the truncator) of the sets in the family at a node, without enumerating them.
+        """
+        weight_from_node = self._weight_from_node
+        weight_from_event_index = self.truncator.weight_from_event_index
+
+        for internal_node in self.internal_nodes(node):
+            if internal_node in weight_from_node:
+                continue
+
+            low_weight = weight_from_node[self._lows[internal_node]]
+            high_weight = weight_from_node[self._highs[internal_node]]
+            variable_weight = weight_from_event_index[self._variables[internal_node]]
+
+            weight_from_node[internal_node] = low_weight + variable_weight * high_weight
+
+        return weight_from_node[node]
+
+    def substitute_true(self, node: int, event_index: int) -> int:
+        without_node = self._evaluate('subset_without', node, event_index)
+        with_node = self._evaluate('subset_with', node, event_index)
+
+        return self._evaluate('minimal', self._evaluate('union', without_node, with_node), EMPTY_NODE)
+
+    def substitute_false(self, node: int, event_index: int) -> int:
+        return self._evaluate('subset_without', node, event_index)
+
+    def filter_terms(self, node: int, event_index: int) -> int:
+        with_node = self._evaluate('subset_with', node, event_index)
+        event_node = self.make_node(event_index, EMPTY_NODE, BASE_NODE)
+
+        return self._evaluate('product', with_node, event_node)
+
+    def iterate_encodings(self, node: int) -> Iterator[int]:
+        """
+        Enumerate (on demand) the term encodings of the family at a node.
+        """
+        stack = [(node, 0)]
+
+        while stack:
+            node, encoding = stack.pop()
+
+            if node == EMPTY_NODE:
+                continue
+
+            if node == BASE_NODE:
+                yield encoding
+                continue
+
+            stack.append((self._lows[node], encoding))
+            stack.append((self._highs[node], encoding | 1 << self._variables[node]))
+
+    def count(self, node: int) -> int:
+        """
+        Count the sets in the family at a node, without enumerating them.
+        """
+        count_from_node = {EMPTY_NODE: 0, BASE_NODE: 1}
+
+        for internal_node in self.internal_nodes(node):
+            count_from_node[internal_node] = (
+                count_from_node[self._lows[internal_node]] + count_from_node[self._highs[internal_node]]
+            )
+
+        return count_from_node[node]
+
+    def event_indices(self, node: int) -> tuple[int, ...]:
+        return tuple(sorted(set(self._variables[internal_node] for internal_node in self.internal_nodes(node))))
+
+    def internal_nodes(self, node: int) -> list[int]:
+        """
+        Produce the internal nodes reachable from a node, children first (since children are created first).
+        """
+        reachable_nodes = set()
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node in reachable_nodes or node in (EMPTY_NODE, BASE_NODE):
+                continue
+
+            reachable_nodes.add(node)
+            stack.append(self._lows[node])
+            stack.append(self._highs[node])
+
+        return sorted(reachable_nodes)
+
+    def _evaluate(self, operation: str, f: int, g: int) -> int:
+        """
+        Run an operation via an explicit stack of generators, with memoisation of every (sub-)operation.
+        """
+        computed = self._computed_from_request
+        request = self._normalise((operation, f, g))
+
+        if request in computed:
+            return computed[request]
+
+        stack = [(request, self._generate(*request))]
+        result = None
+
+        while stack:
+            request, generator = stack[-1]
+
+            try:
+                sub_request = self._normalise(generator.send(result))
+            except StopIteration as stop:
+                stack.pop()
+                result = computed[request] = stop.value
+                continue
+
+            if sub_request in computed:
+                result = computed[sub_request]
+            else:
+                stack.append((sub_request, self._generate(*sub_request)))
+                result = None
+
+        return result
+
+    @staticmethod
+    def _normalise(request: Request) -> Request:
+        operation, f, g = request
+
+        if operation in COMMUTATIVE_OPERATIONS and g < f:
+            return operation, g, f
+
+        return request
+
+    def _generate(self, operation: str, f: int, g: int) -> Generator[Request, int, int]:
+        if operation == 'union':
+            return self._union(f, g)
+
+        if operation == 'product':
+            return self._product(f, g)
+
+        if operation == 'minimal':
+            return self._minimal(f)
+
+        if operation == 'without':
+            return self._without(f, g)
+
+        if operation == 'difference':
+            return self._difference(f, g)
+
+        if operation == 'cutoff':
+            return self._cutoff(f, g)
+
+        if operation == 'max_order':
+            return self._max_order(f, g)
+
+        if operation == 'subset_without':
+            return self._subset_without(f, g)
+
+        if operation == 'subset_with':
+            return self._subset_with(f, g)
+
+        raise ImplementationError(f'bad operation `{operation}`')
+
+    def _cofactors(self, node: int, variable: float) -> tuple[int, int]:
+        if self._variables[node] == variable:
+            return self._lows[node], self._highs[node]
+
+        return node, EMPTY_NODE  # no set of the family contains the variable
+
+    def _union(self, f: int, g: int) -> Generator[Request, int, int]:
+        """
+        Union of families F ∪ G.
+        """
+        if f == EMPTY_NODE:
+            return g
+
+        if g == EMPTY_NODE or f == g:
+            return f
+
+        variable = min(self._variables[f], self._variables[g])
+        f_low, f_high = self._cofactors(f, variable)
+        g_low, g_high = self._cofactors(g, variable)
+
+        low = yield 'union', f_low, g_low
+        high = yield 'union', f_high, g_high
+
+        return self.make_node(variable, low, high)
+
+    def _product(self, f: int, g: int) -> Generator[Request, int, int]:
+        """
+        Product of families {S ∪ T : S ∈ F, T ∈ G}, i.e. the conjunction of the corresponding expressions.
+
+        Decomposing F = F₀ ∪ x F₁ and G = G₀ ∪ x G₁, we have F G = F₀ G₀ ∪ x (F₁ (G₀ ∪ G₁) ∪ F₀ G₁).
+        """
+        if f == EMPTY_NODE or g == EMPTY_NODE:
+            return EMPTY_NODE
+
+        if f == BASE_NODE:
+            return g
+
+        if g == BASE_NODE:
+            return f
+
+        variable = min(self._variables[f], self._variables[g])
+        f_low, f_high = self._cofactors(f, variable)
+        g_low, g_high = self._cofactors(g, variable)
+
+        low = yield 'product', f_low, g_low
+        g_either = yield 'union', g_low, g_high
+        high_via_f = yield 'product', f_high, g_either
+        high_via_g = yield 'product', f_low, g_high
+        high = yield 'union', high_via_f, high_via_g
+
+        return self.make_node(variable, low, high)
+
+    def _minimal(self, f: int) -> Generator[Request, int, int]:
+        """
+        Minimal sets of a family, i.e. the expression with redundant terms removed as per the absorption law.
+        """
+        if f in (EMPTY_NODE, BASE_NODE):
+            return f
+
+        low = yield 'minimal', self._lows[f], EMPTY_NODE
+        high_minimal = yield 'minimal', self._highs[f], EMPTY_NODE
+        high = yield 'without', high_minimal, low
+
+        return self.make_node(self._variables[f], low, high)
+
+    def _without(self, f: int, g: int) -> Generator[Request, int, int]:
+        """
+        Sets of family F that are not supersets of any set of family G.
+        """
+        if f == EMPTY_NODE or g == BASE_NODE or f == g:
+            return EMPTY_NODE
+
+        if g == EMPTY_NODE:
+            return f
+
+        f_variable = self._variables[f]
+        g_variable = self._variables[g]
+
+        if f_variable < g_variable:
+            low = yield 'without', self._lows[f], g
+            high = yield 'without', self._highs[f], g
+            return self.make_node(f_variable, low, high)
+
+        if g_variable < f_variable:  # sets of F lack the variable, so can only contain sets of G that lack it
+            return (yield 'without', f, self._lows[g])
+
+        low = yield 'without', self._lows[f], self._lows[g]
+        high_partial = yield 'without', self._highs[f], self._lows[g]
+        high = yield 'without', high_partial, self._highs[g]
+
+        return self.make_node(f_variable, low, high)
+
+    def _difference(self, f: int, g: int) -> Generator[Request, int, int]:
+        """
+        Sets of family F that are not in family G.
+        """
+        if f == EMPTY_NODE or f == g:
+            return EMPTY_NODE
+
+        if g == EMPTY_NODE:
+            return f
+
+        f_variable = self._variables[f]
+        g_variable = self._variables[g]
+
+        if f_variable < g_variable:
+            low = yield 'difference', self._lows[f], g
+            return self.make_node(f_variable, low, self._highs[f])
+
+        if g_variable < f_variable:
+            return (yield 'difference', f, self._lows[g])
+
+        low = yield 'difference', self._lows[f], self._lows[g]
+        high = yield 'difference', self._highs[f], self._highs[g]
+
+        return self.make_node(f_variable, low, high)
+
+    def _cutoff(self, f: int, cutoff: float) -> Generator[Request, int, int]:
+        """
+        Sets of family F whose weight (per the truncator) is not less than the cutoff.
+
+        Since weights are multiplicative, sets containing the variable x are subject to the cutoff divided by w[x].
+        """
+        if f == EMPTY_NODE or cutoff <= 0:
+            return f
+
+        if f == BASE_NODE:
+            return BASE_NODE if 1 >= cutoff else EMPTY_NODE
+
+        variable = self._variables[f]
+        weight = self.truncator.weight_from_event_index[variable]
+
+        low = yield 'cutoff', self._lows[f], cutoff
+
+        if weight == 0:
+            return low
+
+        high = yield 'cutoff', self._highs[f], cutoff / weight
+
+        return self.make_node(variable, low, high)
+
+    def _max_order(self, f: int, max_order: int) -> Generator[Request, int, int]:
+        """
+        Sets of family F whose size (order) does not exceed the maximum order.
+        """
+        if f in (EMPTY_NODE, BASE_NODE):
+            return f
+
+        low = yield 'max_order', self._lows[f], max_order
+
+        if max_order == 0:
+            return low
+
+        high = yield 'max_order', self._highs[f], max_order - 1
+
+        return self.make_node(self._variables[f], low, high)
+
+    def _subset_without(self, f: int, event_index: int) -> Generator[Request, int, int]:
+        """
+        Sets of family F not containing the event.
+        """
+        variable = self._variables[f]
+
+        if variable > event_index:
+            return f
+
+        if variable == event_index:
+            return self._lows[f]
+
+        low = yield 'subset_without', self._lows[f], event_index
+        high = yield 'subset_without', self._highs[f], event_index
+
+        return self.make_node(variable, low, high)
+
+    def _subset_with(self, f: int, event_index: int) -> Generator[Request, int, int]:
+        """
+        Sets of family F containing the event, with the event removed.
+        """
+        variable = self._variables[f]
+
+        if variable > event_index:
+            return EMPTY_NODE
+
+        if variable == event_index:
+            return self._highs[f]
+
+        low = yield 'subset_with', self._lows[f], event_index
+        high = yield 'subset_with', self._highs[f], event_index
+
+        return self.make_node(variable, low, high)
+
+
+class ZeroSuppressedExpression:
+    """
+    A general disjunction (OR) of minimal cut sets, stored as a node of a zero-suppressed binary decision diagram.
+
+    Presents the same interface as `Expression`, with terms enumerated on demand.
+    Since diagram nodes are canonical, equality (and hashing) is by node.
+    """
+    __slots__ = ('diagram', 'node')
+
+    diagram: ZeroSuppressedDiagram
+    node: int
+
+    def __init__(self, diagram: ZeroSuppressedDiagram, node: int):
+        self.diagram = diagram
+        self.node = node
+
+    def __eq__(self, other):
+        if not isinstance(other, ZeroSuppressedExpression):
+            return NotImplemented  # never equal to an `Expression` (hashed by terms)
+
+        return self.diagram is other.diagram and self.node == other.node
+
+    def __hash__(self):
+        return hash((id(self.diagram), self.node))
+
+    def __repr__(self):
+        return f'ZeroSuppressedExpression(<{self.term_count()} terms>)'
+
+    @property
+    def terms(self) -> frozenset[Term]:
+        return frozenset(Term(encoding) for encoding in self.diagram.iterate_encodings(self.node))
+
+    def term_count(self) -> int:
+        return self.diagram.count(self.node)
+
+    def encodings(self) -> frozenset[int]:
+        return frozenset(self.diagram.iterate_encodings(self.node))
+
+    def event_indices(self) -> tuple[int, ...]:
+        return self.diagram.event_indices(self.node)
+
+    def sole_term_encoding(self) -> Optional[int]:
+        if self.node == EMPTY_NODE:  # expression is False
+            return None
+
+        if self.term_count() != 1:
+            raise ImplementationError(f'`{self}` does not have a sole term')
+
+        return next(self.diagram.iterate_encodings(self.node))
+
+    def substitute_true(self, event_index: int) -> 'ZeroSuppressedExpression':
+        return ZeroSuppressedExpression(self.diagram, self.diagram.substitute_true(self.node, event_index))
+
+    def substitute_false(self, event_index: int) -> 'ZeroSuppressedExpression':
+        return ZeroSuppressedExpression(self.diagram, self.diagram.substitute_false(self.node, event_index))
+
+    def filter_terms(self, event_index: int) -> 'ZeroSuppressedExpression':
+        return ZeroSuppressedExpression(self.diagram, self.diagram.filter_terms(self.node, event_index))
+
+
+AnyExpression = Union[Expression, ZeroSuppressedExpression]
+AnyExpressionBuilder = Union[ExpressionBuilder, ZeroSuppressedDiagram]
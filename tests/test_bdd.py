@@ -0,0 +1,160 @@
+"""
+# Public Fault Tree Analyser: test_bdd.py
+
+Unit testing for `bdd.py`.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import unittest
+
+from pfta.bdd import FALSE_NODE, TRUE_NODE, BinaryDecisionDiagram
+from pfta.boolean import Term, Expression
+from pfta.zbdd import ZeroSuppressedDiagram
+
+
+class TestBdd(unittest.TestCase):
+    def test_make_node(self):
+        diagram = BinaryDecisionDiagram()
+
+        # Redundant test
+        self.assertEqual(diagram.make_node(0, TRUE_NODE, TRUE_NODE), TRUE_NODE)
+
+        # Uniqueness
+        self.assertEqual(diagram.make_node(0, FALSE_NODE, TRUE_NODE), diagram.make_node(0, FALSE_NODE, TRUE_NODE))
+        self.assertNotEqual(diagram.make_node(0, FALSE_NODE, TRUE_NODE), diagram.make_node(1, FALSE_NODE, TRUE_NODE))
+
+    def test_from_expression(self):
+        diagram = BinaryDecisionDiagram()
+
+        # False, True
+        self.assertEqual(diagram.from_expression(Expression()), FALSE_NODE)
+        self.assertEqual(diagram.from_expression(Expression(Term(0))), TRUE_NODE)
+
+        # A + AB = A
+        self.assertEqual(
+            diagram.from_expression(Expression(Term(0b01), Term(0b11))),
+            diagram.from_expression(Expression(Term(0b01))),
+        )
+
+        # AB + AC = A(B + C)
+        self.assertEqual(
+            diagram.from_expression(Expression(Term(0b011), Term(0b101))),
+            diagram.conjunction(
+                diagram.from_term(Term(0b001)),
+                diagram.disjunction(diagram.from_term(Term(0b010)), diagram.from_term(Term(0b100))),
+            ),
+        )
+
+        # AB + BC + CA has 4 internal nodes (plus 2 terminals)
+        node = diagram.from_expression(Expression(Term(0b011), Term(0b110), Term(0b101)))
+        self.assertEqual(diagram.node_count(node), 6)
+
+    def test_from_cut_set_diagram(self):
+        diagram = BinaryDecisionDiagram()
+        cut_set_diagram = ZeroSuppressedDiagram()
+
+        for expression in [
+            Expression(),
+            Expression(Term(0)),
+            Expression(Term(0b011), Term(0b110), Term(0b101)),
+            Expression(Term(0b0001), Term(0b0110), Term(0b1100)),
+        ]:
+            cut_set_expression = cut_set_diagram.from_expression(expression)
+            self.assertEqual(
+                diagram.from_cut_set_diagram(cut_set_diagram, cut_set_expression.node),
+                diagram.from_expression(expression),
+            )
+
+    def test_probabilities(self):
+        diagram = BinaryDecisionDiagram()
+        qs_from_variable = {0: [0.1, 0.5], 1: [0.2, 0.5], 2: [0.3, 0.5]}
+
+        # A + B
+        self.assertEqual(
+            diagram.probabilities(diagram.from_expression(Expression(Term(0b01), Term(0b10))), qs_from_variable, 2),
+            [0.1 + 0.2 - 0.1 * 0.2, 0.75],
+        )
+
+        # AB + BC + CA
+        node = diagram.from_expression(Expression(Term(0b011), Term(0b110), Term(0b101)))
+        probabilities = diagram.probabilities(node, qs_from_variable, 2)
+        self.assertAlmostEqual(probabilities[0], 0.02 + 0.06 + 0.03 - 2 * 0.006, places=15)
+        self.assertAlmostEqual(probabilities[1], 0.5, places=15)
+
+    def test_intensities(self):
+        diagram = BinaryDecisionDiagram()
+        qs_from_variable = {0: [0.1], 1: [0.2]}
+        omegas_from_variable = {0: [0.01], 1: [0.02]}
+
+        # A + B: ω = ω[A] (1 − q[B]) + ω[B] (1 − q[A])
+        node = diagram.from_expression(Expression(Term(0b01), Term(0b10)))
+        self.assertAlmostEqual(
+            diagram.intensities(node, qs_from_variable, omegas_from_variable, 1)[0],
+            0.01 * 0.8 + 0.02 * 0.9,
+            places=15,
+        )
+
+        # A + B (both quantities together)
+        probabilities, intensities = diagram.quantities(node, qs_from_variable, omegas_from_variable, 1)
+        self.assertAlmostEqual(probabilities[0], 1 - 0.9 * 0.8, places=15)
+        self.assertAlmostEqual(intensities[0], 0.01 * 0.8 + 0.02 * 0.9, places=15)
+
+        # AB: ω = ω[A] q[B] + q[A] ω[B]
+        node = diagram.from_expression(Expression(Term(0b11)))
+        self.assertAlmostEqual(
+            diagram.intensities(node, qs_from_variable, omegas_from_variable, 1)[0],
+            0.01 * 0.2 + 0.1 * 0.02,
+            places=15,
+        )
+
+    def test_birnbaum_importances(self):
+        diagram = BinaryDecisionDiagram()
+        qs_from_variable = {0: [0.1, 0.5], 1: [0.2, 0.5], 2: [0.3, 0.5]}
+
+        # A + BC: I_B[A] = 1 − q[B] q[C], I_B[B] = (1 − q[A]) q[C], I_B[C] = (1 − q[A]) q[B]
+        node = diagram.from_expression(Expression(Term(0b001), Term(0b110)))
+        probabilities, importances_from_variable = diagram.birnbaum_importances(node, qs_from_variable, 2)
+        self.assertAlmostEqual(probabilities[0], 0.1 + 0.06 - 0.006, places=15)
+        self.assertAlmostEqual(importances_from_variable[0][0], 1 - 0.06, places=15)
+        self.assertAlmostEqual(importances_from_variable[1][0], 0.9 * 0.3, places=15)
+        self.assertAlmostEqual(importances_from_variable[2][0], 0.9 * 0.2, places=15)
+        self.assertAlmostEqual(importances_from_variable[2][1], 0.25, places=15)
+
+        # AB + BC + CA: I_B[A] = q[B] + q[C] − 2 q[B] q[C]
+        node = diagram.from_expression(Expression(Term(0b011), Term(0b110), Term(0b101)))
+        _, importances_from_variable = diagram.birnbaum_importances(node, qs_from_variable, 2)
+        self.assertAlmostEqual(importances_from_variable[0][0], 0.2 + 0.3 - 2 * 0.06, places=15)
+        self.assertAlmostEqual(importances_from_variable[1][0], 0.1 + 0.3 - 2 * 0.03, places=15)
+
+        # True
+        probabilities, importances_from_variable = diagram.birnbaum_importances(TRUE_NODE, qs_from_variable, 2)
+        self.assertEqual(probabilities, [1., 1.])
+        self.assertEqual(importances_from_variable, {})
+
+    def test_cofactor_probabilities(self):
+        diagram = BinaryDecisionDiagram()
+        qs_from_variable = {0: [0.1, 0.5], 1: [0.2, 0.5], 2: [0.3, 0.5], 3: [0.4, 0.5]}
+
+        # A + BC (with D absent): q[f[x=1]] and q[f[x=0]] for each variable
+        node = diagram.from_expression(Expression(Term(0b001), Term(0b110)))
+        probabilities, cofactor_qs_from_boolean_from_variable = diagram.cofactor_probabilities(
+            node, qs_from_variable, [0, 1, 2, 3], 2,
+        )
+        self.assertAlmostEqual(probabilities[0], 0.1 + 0.06 - 0.006, places=15)
+        self.assertEqual(cofactor_qs_from_boolean_from_variable[0][True], [1., 1.])
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[0][False][0], 0.06, places=15)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[1][True][0], 0.1 + 0.3 - 0.03, places=15)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[1][False][0], 0.1, places=15)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[2][True][1], 0.75, places=15)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[3][True][0], probabilities[0], places=15)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[3][False][0], probabilities[0], places=15)
+
+        # ABC: q[f[x=0]] exactly zero for every variable (no cancellation)
+        node = diagram.from_expression(Expression(Term(0b111)))
+        _, cofactor_qs_from_boolean_from_variable = diagram.cofactor_probabilities(node, qs_from_variable, [0, 1, 2], 2)
+        self.assertAlmostEqual(cofactor_qs_from_boolean_from_variable[1][True][0], 0.1 * 0.3, places=15)
+        for cofactor_qs_from_boolean in cofactor_qs_from_boolean_from_variable.values():
+            self.assertEqual(cofactor_qs_from_boolean[False], [0., 0.])
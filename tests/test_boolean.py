@@ -10,7 +10,7 @@ This is free software with NO WARRANTY etc. etc., see LICENSE.
 
 import unittest
 
-from pfta.boolean import Term, Expression
+from pfta.boolean import Term, Expression, Truncator
 
 
 class TestBoolean(unittest.TestCase):
@@ -446,3 +446,74 @@ class TestBoolean(unittest.TestCase):
                 Term(0b11100),  # CDE
             ),
         )
+
+        # (2 out of 3)(A + B, AB + C, BC) = A.AB + A.C + A.BC + B.AB + B.C + B.BC + AB.BC + C.BC = AB + AC + BC
+        self.assertEqual(
+            Expression.vote(
+                Expression(Term(0b001), Term(0b010)),
+                Expression(Term(0b011), Term(0b100)),
+                Expression(Term(0b110)),
+                threshold=2,
+            ),
+            Expression(Term(0b011), Term(0b101), Term(0b110)),
+        )
+
+    def test_expression_truncation(self):
+        truncator = Truncator({0: 0.1, 1: 0.01, 2: 0.001}, cutoff=1e-4)
+
+        # (A + B)(A + C) = A + BC, with BC (weight 1e-5) discarded
+        self.assertEqual(
+            Expression.conjunction(
+                Expression(Term(0b001), Term(0b010)),
+                Expression(Term(0b001), Term(0b100)),
+                truncator=truncator,
+            ),
+            Expression(Term(0b001)),
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 1e-5, places=15)
+
+        # A + BC, with BC discarded again
+        self.assertEqual(
+            Expression.disjunction(Expression(Term(0b001)), Expression(Term(0b110)), truncator=truncator),
+            Expression(Term(0b001)),
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 2e-5, places=15)
+
+        # (A + B)(C + D) with maximum order 1, all products discarded
+        truncator = Truncator({0: 0.1, 1: 0.2, 2: 0.3, 3: 0.4}, max_order=1)
+        self.assertEqual(
+            Expression.conjunction(
+                Expression(Term(0b0001), Term(0b0010)),
+                Expression(Term(0b0100), Term(0b1000)),
+                truncator=truncator,
+            ),
+            Expression(),
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, (0.1 + 0.2) * (0.3 + 0.4), places=15)
+
+        # (A + B)(A + C) with maximum order 1 = A, with AB and BC discarded as formed (AB conservatively counted)
+        truncator = Truncator({0: 0.1, 1: 0.01, 2: 0.001}, max_order=1)
+        self.assertEqual(
+            Expression.conjunction(
+                Expression(Term(0b001), Term(0b010)),
+                Expression(Term(0b001), Term(0b100)),
+                truncator=truncator,
+            ),
+            Expression(Term(0b001)),
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 1e-3 + 1e-5, places=15)
+
+        # (2 out of 3)(A + B, A + C, A) with maximum order 1 = A,
+        # with AB, AC, BC discarded at the second input, and AB, AC discarded again at the third
+        truncator = Truncator({0: 0.1, 1: 0.01, 2: 0.001}, max_order=1)
+        self.assertEqual(
+            Expression.vote(
+                Expression(Term(0b001), Term(0b010)),
+                Expression(Term(0b001), Term(0b100)),
+                Expression(Term(0b001)),
+                threshold=2,
+                truncator=truncator,
+            ),
+            Expression(Term(0b001)),
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 2 * (1e-3 + 1e-4) + 1e-5, places=15)
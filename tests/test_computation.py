@@ -8,16 +8,28 @@ Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
 This is free software with NO WARRANTY etc. etc., see LICENSE.
 """
 
+import array
 import math
 import unittest
 
-from pfta.computation import constant_rate_model_probability, constant_rate_model_intensity
+from pfta.boolean import Term, Expression
+from pfta.computation import (
+    float_column, constant_rate_model_probability, constant_rate_model_intensity,
+    event_disjoint_components, enumerate_combinations, compile_probability_polynomials, compile_quantity_polynomials,
+    compile_omega_dagger_polynomials, minimal_path_sets, compile_disjoint_products, BonferroniBounds,
+    conjunction_probabilities, conjunction_intensities, disjunction_probabilities, disjunction_intensities,
+    vote_probabilities, vote_intensities,
+)
 
 INF = float('inf')
 NAN = float('nan')
 
 
 class TestComputation(unittest.TestCase):
+    def test_float_column(self):
+        self.assertEqual(float_column([]), array.array('d'))
+        self.assertEqual(float_column([1, 0.5, 0]), array.array('d', [1., 0.5, 0.]))
+        self.assertEqual(float_column([1, 0.5, 0]).itemsize, 8)
 
     def test_constant_rate_model_probability(self):
         self.assertTrue(math.isnan(constant_rate_model_probability(lambda_=0, mu=0, t=INF)))
@@ -219,3 +231,223 @@ class TestComputation(unittest.TestCase):
                 rel_tol=1e-15,
             ),
         )
+
+    def test_event_disjoint_components(self):
+        self.assertEqual(event_disjoint_components([]), [])
+        self.assertEqual(
+            event_disjoint_components([Term(0b0011), Term(0b0110), Term(0b1000), Term(0b0000)]),
+            [Expression(Term(0b0000)), Expression(Term(0b1000)), Expression(Term(0b0011), Term(0b0110))],
+        )
+        self.assertEqual(
+            event_disjoint_components([Term(0b10001), Term(0b00100), Term(0b01000), Term(0b01100), Term(0b00011)]),
+            [Expression(Term(0b00100), Term(0b01000), Term(0b01100)), Expression(Term(0b10001), Term(0b00011))],
+        )
+
+    def test_enumerate_combinations(self):
+        terms = [Term(0b0001), Term(0b0010), Term(0b0100), Term(0b1000)]
+
+        self.assertEqual(sorted(enumerate_combinations(terms, 1)), [(0b0001, 0b0001), (0b0010, 0b0010),
+                                                                     (0b0100, 0b0100), (0b1000, 0b1000)])
+        self.assertEqual(
+            sorted(conjunction for conjunction, _ in enumerate_combinations(terms, 2)),
+            [0b0011, 0b0101, 0b0110, 0b1001, 0b1010, 0b1100],
+        )
+        self.assertEqual(sorted(enumerate_combinations(terms, 0)), [(0b0000, -1)])
+        self.assertEqual(sorted(enumerate_combinations(terms, 4)), [(0b1111, 0b0000)])
+        self.assertEqual(sorted(enumerate_combinations(terms, 5)), [])
+
+        # Greatest common divisors
+        self.assertEqual(
+            sorted(enumerate_combinations([Term(0b011), Term(0b101), Term(0b111)], 2)),
+            [(0b111, 0b001), (0b111, 0b011), (0b111, 0b101)],
+        )
+
+        # Pruning by weight
+        weight_from_event_index = {0: 0.5, 1: 0.1, 2: 0.01, 3: 0.001}
+
+        def weight(encoding: int) -> float:
+            return math.prod(weight_from_event_index[event_index] for event_index in Term(encoding).event_indices())
+
+        def pruned_conjunctions(order: int, pruning_threshold: float) -> list[int]:
+            combinations = enumerate_combinations(terms, order, weight, pruning_threshold)
+            return sorted(conjunction for conjunction, _ in combinations)
+
+        self.assertEqual(pruned_conjunctions(2, 0.5 * 0.01), [0b0011, 0b0101])
+        self.assertEqual(pruned_conjunctions(3, 0.5 * 0.01), [])
+        self.assertEqual(pruned_conjunctions(3, 0.5 * 0.1 * 0.01), [0b0111])
+
+        # Pruning by cover
+        self.assertEqual(
+            sorted(conjunction for conjunction, _ in enumerate_combinations(terms, 2, pruning_cover=0b0011)),
+            [0b0101, 0b0110, 0b1001, 0b1010, 0b1100],
+        )
+        self.assertEqual(
+            sorted(conjunction for conjunction, _ in enumerate_combinations(terms, 2, pruning_cover=0b0001)),
+            [0b0110, 0b1010, 0b1100],
+        )
+
+    def test_compile_probability_polynomials(self):
+        terms = [Term(0b011), Term(0b101), Term(0b110)]  # AB + AC + BC
+
+        self.assertEqual(
+            list(compile_probability_polynomials(terms, 1)),
+            [[(1, Term(0b011)), (1, Term(0b101)), (1, Term(0b110))]],
+        )
+        self.assertEqual(list(compile_probability_polynomials(terms, 2)), [[(-3, Term(0b111))]])
+        self.assertEqual(list(compile_probability_polynomials(terms, 3)), [[(1, Term(0b111))]])
+        self.assertEqual(list(compile_probability_polynomials(terms, 4)), [])
+
+    def test_compile_quantity_polynomials(self):
+        terms = [Term(0b011), Term(0b101), Term(0b110)]  # AB + AC + BC
+
+        self.assertEqual(
+            list(compile_quantity_polynomials(terms, 1)),
+            [(
+                [(1, Term(0b011)), (1, Term(0b101)), (1, Term(0b110))],
+                [(1, Term(0b011), Term(0)), (1, Term(0b101), Term(0)), (1, Term(0b110), Term(0))],
+            )],
+        )
+        self.assertEqual(
+            list(compile_quantity_polynomials(terms, 2)),
+            [(
+                [(-3, Term(0b111))],
+                [(-1, Term(0b001), Term(0b110)), (-1, Term(0b010), Term(0b101)), (-1, Term(0b100), Term(0b011))],
+            )],
+        )
+        self.assertEqual(list(compile_quantity_polynomials(terms, 3)), [([(1, Term(0b111))], [])])  # gcd True
+
+        # Pruning by weight, of both probability and intensity combinations
+        weight_from_event_index = {0: 0.5, 1: 0.1, 2: 0.01}
+
+        def weight(encoding: int) -> float:
+            return math.prod(weight_from_event_index[event_index] for event_index in Term(encoding).event_indices())
+
+        self.assertEqual(
+            list(compile_quantity_polynomials(terms, 1, weight, pruning_threshold=0.01)),
+            [([(1, Term(0b011))], [(1, Term(0b011), Term(0))])],  # AC and BC pruned
+        )
+        self.assertEqual(list(compile_quantity_polynomials(terms, 2, weight, pruning_threshold=0.01)), [])
+
+    def test_compile_omega_dagger_polynomials(self):
+        terms = [Term(0b011), Term(0b101), Term(0b110)]  # AB + AC + BC
+
+        # Combination AB, AC, with gcd A and quotient BC (failed terms containing A being pruned)
+        self.assertEqual(
+            list(compile_omega_dagger_polynomials(terms, 1, 0b001, 0b110)),
+            [[(1, Term(0b001), Term(0b110))]],
+        )
+        self.assertEqual(list(compile_omega_dagger_polynomials(terms, 2, 0b001, 0b110)), [])
+
+        # Combination AB, with gcd AB and quotient True
+        self.assertEqual(
+            list(compile_omega_dagger_polynomials(terms, 1, 0b011, 0b000)),
+            [[(1, Term(0b001), Term(0b110)), (1, Term(0b010), Term(0b101))]],
+        )
+        self.assertEqual(list(compile_omega_dagger_polynomials(terms, 2, 0b011, 0b000)), [])  # AC BC covers AB
+
+    def test_minimal_path_sets(self):
+        self.assertEqual(minimal_path_sets(Expression()), Expression(Term(0)))  # False has the empty path set
+        self.assertEqual(minimal_path_sets(Expression(Term(0))), Expression())  # True has no path sets
+        self.assertEqual(minimal_path_sets(Expression(Term(0b011))), Expression(Term(0b001), Term(0b010)))
+        self.assertEqual(
+            minimal_path_sets(Expression(Term(0b001), Term(0b110))),  # A + BC
+            Expression(Term(0b011), Term(0b101)),  # AB, AC
+        )
+        self.assertEqual(
+            minimal_path_sets(Expression(Term(0b011), Term(0b101), Term(0b110))),  # 2-out-of-3 is self-dual
+            Expression(Term(0b011), Term(0b101), Term(0b110)),
+        )
+
+    def test_compile_disjoint_products(self):
+        self.assertEqual(compile_disjoint_products([], 1), [])
+        self.assertEqual(compile_disjoint_products([Term(0)], 1), [(Term(0), Term(0))])
+        self.assertEqual(
+            compile_disjoint_products([Term(0b110), Term(0b101), Term(0b011)], 3),  # BC + AC + AB
+            [
+                (Term(0b011), Term(0)),  # AB
+                (Term(0b101), Term(0b010)),  # AC (not B)
+                (Term(0b110), Term(0b001)),  # BC (not A)
+            ],
+        )
+        self.assertEqual(
+            compile_disjoint_products([Term(0b0011), Term(0b1100)], 3),  # AB + CD
+            [
+                (Term(0b0011), Term(0)),  # AB
+                (Term(0b1101), Term(0b0010)),  # A (not B) C D
+                (Term(0b1100), Term(0b0001)),  # (not A) C D
+            ],
+        )
+        self.assertIsNone(compile_disjoint_products([Term(0b110), Term(0b101), Term(0b011)], 2))  # size guard
+
+    def test_bonferroni_bounds(self):
+        bounds = BonferroniBounds(size=2, ceiling=1., final_order=3, absolute_gap=0., relative_gap=0.1)
+        self.assertFalse(bounds.tighten(0, 0.03, order=1))
+        self.assertEqual((bounds.lower_bounds, bounds.upper_bounds), ([0., 0.], [0.03, 1.]))
+        self.assertTrue(bounds.tighten(0, 0.0275, order=2))  # gap 0.0025 within 0.1 * 0.03
+        self.assertEqual((bounds.lower_bounds, bounds.upper_bounds), ([0.0275, 0.], [0.03, 1.]))
+        self.assertTrue(bounds.tighten(1, 0.5, order=3))  # final order is exact
+        self.assertEqual((bounds.lower_bounds, bounds.upper_bounds), ([0.0275, 0.5], [0.03, 0.5]))
+
+        bounds = BonferroniBounds(size=1, ceiling=math.inf, final_order=3, absolute_gap=0., relative_gap=0.)
+        self.assertFalse(bounds.tighten(0, 0.03, order=1))
+        self.assertFalse(bounds.tighten(0, 0.03, order=2))  # no targets set
+        self.assertEqual((bounds.lower_bounds, bounds.upper_bounds), ([0.03], [0.03]))
+
+    def test_conjunction_probabilities(self):
+        self.assertEqual(conjunction_probabilities([], 2), [1, 1])
+        self.assertEqual(conjunction_probabilities([[0.1, 0.5], [0.2, 0.5], [0.3, 0.5]], 2), [0.1 * 0.2 * 0.3, 0.125])
+
+    def test_conjunction_intensities(self):
+        self.assertEqual(conjunction_intensities([], [], 1), [0])
+
+        # ω = ω_A q_B q_C + q_A ω_B q_C + q_A q_B ω_C
+        self.assertAlmostEqual(
+            conjunction_intensities([[0.1], [0.2], [0.3]], [[0.01], [0.02], [0.03]], 1)[0],
+            0.01 * 0.2 * 0.3 + 0.1 * 0.02 * 0.3 + 0.1 * 0.2 * 0.03,
+            places=15,
+        )
+        self.assertEqual(conjunction_intensities([[1.], [0.]], [[0.], [0.02]], 1), [0.02])
+
+    def test_disjunction_probabilities(self):
+        self.assertEqual(disjunction_probabilities([], 2), [0, 0])
+
+        probabilities = disjunction_probabilities([[0.1, 0.5], [0.2, 0.5], [0.3, 0.5]], 2)
+        self.assertAlmostEqual(probabilities[0], 1 - 0.9 * 0.8 * 0.7, places=15)
+        self.assertAlmostEqual(probabilities[1], 0.875, places=15)
+
+    def test_disjunction_intensities(self):
+        self.assertEqual(disjunction_intensities([], [], 1), [0])
+
+        # ω = ω_A (1 − q_B) (1 − q_C) + (1 − q_A) ω_B (1 − q_C) + (1 − q_A) (1 − q_B) ω_C
+        self.assertAlmostEqual(
+            disjunction_intensities([[0.1], [0.2], [0.3]], [[0.01], [0.02], [0.03]], 1)[0],
+            0.01 * 0.8 * 0.7 + 0.9 * 0.02 * 0.7 + 0.9 * 0.8 * 0.03,
+            places=15,
+        )
+        self.assertEqual(disjunction_intensities([[0.], [1.]], [[0.01], [0.]], 1), [0])
+
+    def test_vote_probabilities(self):
+        qs = [[0.1, 0.5], [0.2, 0.5], [0.3, 0.5]]
+
+        # 0 out of 3, 4 out of 3
+        self.assertEqual(vote_probabilities(qs, 0, 2), [1, 1])
+        self.assertEqual(vote_probabilities(qs, 4, 2), [0, 0])
+
+        # 2 out of 3: q = q_A q_B + q_B q_C + q_C q_A − 2 q_A q_B q_C
+        probabilities = vote_probabilities(qs, 2, 2)
+        self.assertAlmostEqual(probabilities[0], 0.02 + 0.06 + 0.03 - 2 * 0.006, places=15)
+        self.assertAlmostEqual(probabilities[1], 0.5, places=15)
+
+    def test_vote_intensities(self):
+        qs = [[0.1], [0.2], [0.3]]
+        omegas = [[0.01], [0.02], [0.03]]
+
+        # 0 out of 3
+        self.assertEqual(vote_intensities(qs, omegas, 0, 1), [0])
+
+        # 2 out of 3: ω = ∑ ω_i ∂q/∂q_i, where ∂q/∂q_A = q_B + q_C − 2 q_B q_C etc.
+        self.assertAlmostEqual(
+            vote_intensities(qs, omegas, 2, 1)[0],
+            0.01 * (0.2 + 0.3 - 2 * 0.06) + 0.02 * (0.1 + 0.3 - 2 * 0.03) + 0.03 * (0.1 + 0.2 - 2 * 0.02),
+            places=15,
+        )
@@ -8,13 +8,16 @@ Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
 This is free software with NO WARRANTY etc. etc., see LICENSE.
 """
 
+import math
 import textwrap
 import unittest
 
-from pfta.constants import ModelType, GateType
+from pfta.boolean import Term, Expression
+from pfta.constants import ModelType, GateType, IntensityMethod, COMPUTATIONAL_METHOD_FROM_STRING
 from pfta.core import (
     DuplicateIdException, UnsetPropertyException, ModelPropertyClashException, InvalidModelKeyComboException,
     NegativeValueException, SubUnitValueException, InvalidComputationalToleranceException,
+    InvalidComputationalPruningException, InvalidComputationalGapException, InvalidCutSetCutoffException,
     UnknownModelException, UnknownInputException, InputCountException, CircularInputsException,
     DistributionSamplingError, InvalidProbabilityValueException,
     FaultTree, Model, Event, Gate,
@@ -22,6 +25,22 @@ from pfta.core import (
 from pfta.sampling import DegenerateDistribution, LogNormalDistribution, UniformDistribution
 
 
+def two_out_of_three_text(*property_lines: str, probabilities: tuple = (0.1, 0.1, 0.1),
+                          top_property_lines: tuple = ()) -> str:
+    """
+    Fault tree text for TOP = AB + BC + CA, with events A, B, C of intensity 0.01.
+    """
+    return '\n\n'.join([
+        '\n'.join(['- times: 1', *property_lines]),
+        *(
+            f'Event: {event_id}\n- model_type: Fixed\n- probability: {probability}\n- intensity: 0.01'
+            for event_id, probability in zip('ABC', probabilities)
+        ),
+        *(f'Gate: {gate_id}\n- type: AND\n- inputs: {gate_id[0]}, {gate_id[1]}' for gate_id in ('AB', 'BC', 'CA')),
+        '\n'.join(['Gate: TOP', '- type: OR', '- inputs: AB, BC, CA', *top_property_lines]),
+    ])
+
+
 class TestCore(unittest.TestCase):
     def test_fault_tree(self):
         # Duplicate identifier
@@ -251,6 +270,467 @@ class TestCore(unittest.TestCase):
             '''),
         )
 
+    def test_cut_set_cutoff(self):
+        # Invalid cut set cutoff
+        self.assertRaises(
+            InvalidCutSetCutoffException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - cut_set_cutoff: -1e-9
+            '''),
+        )
+        self.assertRaises(
+            InvalidCutSetCutoffException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - cut_set_cutoff: 1
+            '''),
+        )
+
+        # Sub-unit maximum cut set order
+        self.assertRaises(
+            SubUnitValueException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - max_cut_set_order: 0
+            '''),
+        )
+
+        # Cut set cutoff
+        for cut_set_representation in ('Explicit', 'ZeroSuppressedDiagram'):
+            fault_tree = FaultTree(textwrap.dedent(f'''
+                - times: 1
+                - cut_set_representation: {cut_set_representation}
+                - cut_set_cutoff: 1e-3
+
+                Event: A
+                - model_type: Fixed
+                - probability: 0.2
+                - intensity: 0
+
+                Event: B
+                - model_type: Fixed
+                - probability: 0.01
+                - intensity: 0
+
+                Event: C
+                - model_type: Fixed
+                - probability: 0.001
+                - intensity: 0
+
+                Gate: OR
+                - type: OR
+                - inputs: A, C
+
+                Gate: AND
+                - type: AND
+                - inputs: OR, B
+
+                Gate: OR_AB
+                - type: OR
+                - inputs: A, B
+
+                Gate: ABSORBING
+                - type: AND
+                - inputs: OR, OR_AB
+            '''))
+            or_gate, and_gate, or_ab_gate, absorbing_gate = fault_tree.gates
+            self.assertEqual(or_gate.computed_expression.terms, Expression(Term(0b001), Term(0b100)).terms)
+            self.assertEqual(or_gate.computed_cutoff_error, 0)
+            self.assertEqual(and_gate.computed_expression.terms, Expression(Term(0b011)).terms)  # BC discarded
+            self.assertAlmostEqual(and_gate.computed_cutoff_error, 0.01 * 0.001, places=15)
+            self.assertEqual(or_ab_gate.computed_cutoff_error, 0)
+
+            # (A + C)(A + B) = A + BC, with BC discarded but AC (negligible, yet absorbed by A) not
+            self.assertEqual(absorbing_gate.computed_expression.terms, Expression(Term(0b001)).terms)
+            self.assertAlmostEqual(absorbing_gate.computed_cutoff_error, 0.01 * 0.001, places=15)
+
+        # Cut set cutoff independent of representation (inputs folded in fewest terms first)
+        gate_from_representation = {}
+
+        for cut_set_representation in ('Explicit', 'ZeroSuppressedDiagram'):
+            fault_tree = FaultTree(textwrap.dedent(f'''
+                - times: 1
+                - cut_set_representation: {cut_set_representation}
+                - cut_set_cutoff: 1e-3
+
+                Model: M
+                - model_type: Fixed
+                - probability: 0.1
+                - intensity: 0
+
+                Event: A
+                - model: M
+
+                Event: B
+                - model: M
+
+                Event: C
+                - model: M
+
+                Event: D
+                - model_type: Fixed
+                - probability: 0.005
+                - intensity: 0
+
+                Event: E
+                - model_type: Fixed
+                - probability: 0.5
+                - intensity: 0
+
+                Gate: AB
+                - type: OR
+                - inputs: A, B
+
+                Gate: CD
+                - type: OR
+                - inputs: C, D
+
+                Gate: AND
+                - type: AND
+                - inputs: AB, CD, E
+            '''))
+            gate_from_representation[cut_set_representation] = fault_tree.gates[-1]
+
+        explicit_gate, zbdd_gate = gate_from_representation.values()
+        self.assertEqual(explicit_gate.computed_expression.terms, zbdd_gate.computed_expression.terms)
+        self.assertEqual(explicit_gate.computed_expression.terms, Expression(Term(0b10101), Term(0b10110)).terms)
+        self.assertAlmostEqual(explicit_gate.computed_cutoff_error, 2 * 0.1 * 0.005 * 0.5, places=15)  # ADE, BDE
+        self.assertAlmostEqual(zbdd_gate.computed_cutoff_error, explicit_gate.computed_cutoff_error, places=15)
+
+    def test_computational_pruning(self):
+        # Bad computational pruning
+        self.assertRaises(
+            InvalidComputationalPruningException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_pruning: -1e-16
+            '''),
+        )
+        self.assertRaises(
+            InvalidComputationalPruningException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_pruning: 1
+            '''),
+        )
+        self.assertRaises(
+            InvalidComputationalPruningException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_pruning: nan
+            '''),
+        )
+
+        # Computational pruning
+        for computational_pruning in ('0', '1e-6'):
+            fault_tree = FaultTree(two_out_of_three_text(
+                f'- computational_pruning: {computational_pruning}',
+                probabilities=(0.1, 0.1, 1e-9),
+            ))
+            top = fault_tree.gates[-1]
+            q_first_order = 0.1 * 0.1 + 2 * 0.1 * 1e-9
+            q_exact = q_first_order - 2 * 0.1 * 0.1 * 1e-9
+
+            if computational_pruning == '0':
+                self.assertAlmostEqual(top.computed_probabilities[0], q_exact, places=17)
+            else:  # every higher-order combination contains C, and is pruned
+                self.assertAlmostEqual(top.computed_probabilities[0], q_first_order, places=17)
+
+            # Bounds remain valid despite pruning
+            self.assertLessEqual(top.computed_probability_lower_bounds[0], q_exact)
+            self.assertGreaterEqual(top.computed_probability_upper_bounds[0], q_exact)
+
+    def test_computational_methods(self):
+        for computational_method, q_expected, omega_expected in [
+            ('InclusionExclusion', 3 * 0.1**2 - 2 * 0.1**3, 3 * 2 * 0.01 * 0.1 - 2 * 3 * 0.01 * 0.1**2),
+            ('RareEvent', 3 * 0.1**2, 3 * 2 * 0.01 * 0.1),
+            ('MinCutUpperBound', 1 - (1 - 0.1**2)**3, 3 * 2 * 0.01 * 0.1 * (1 - 0.1**2)**2),
+            ('EsaryProschan', (1 - 0.9**2)**3, 3 * 2 * 0.01 * 0.9 * (1 - 0.9**2)**2),
+            ('SumOfDisjointProducts', 3 * 0.1**2 - 2 * 0.1**3, 3 * 2 * 0.01 * 0.1 - 2 * 3 * 0.01 * 0.1**2),
+        ]:
+            # Set on the fault tree, or overridden on the gate
+            for top_property_lines in ((), (f'- computational_method: {computational_method}',)):
+                fault_tree = FaultTree(two_out_of_three_text(
+                    f'- computational_method: {"InclusionExclusion" if top_property_lines else computational_method}',
+                    top_property_lines=top_property_lines,
+                ))
+                top = fault_tree.gates[-1]
+                self.assertEqual(
+                    top.actual_computational_method, COMPUTATIONAL_METHOD_FROM_STRING[computational_method],
+                )
+                self.assertAlmostEqual(top.computed_probabilities[0], q_expected, places=15)
+                self.assertAlmostEqual(top.computed_intensities[0], omega_expected, places=15)
+
+    def test_monte_carlo(self):
+        # Sub-unit trial count
+        self.assertRaises(
+            SubUnitValueException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_trials: 0
+            '''),
+        )
+
+        # Monte Carlo
+        fault_tree_text = '\n\n'.join([
+            two_out_of_three_text(
+                '- seed: 123', '- computational_method: MonteCarlo', '- computational_trials: 100000',
+            ),
+            'Event: D\n- model_type: Fixed\n- probability: 0.1\n- intensity: 0.01',
+            'Gate: TOP_AND_D\n- type: AND\n- inputs: TOP, D',
+        ])
+        fault_tree = FaultTree(fault_tree_text)
+        ab_gate, vote_gate, top = fault_tree.gates[0], fault_tree.gates[3], fault_tree.gates[4]
+        q_vote = 3 * 0.1**2 - 2 * 0.1**3
+        omega_vote = 3 * 2 * 0.01 * 0.1 - 2 * 3 * 0.01 * 0.1**2
+        standard_error = (q_vote * (1 - q_vote) / 100000) ** 0.5
+
+        self.assertAlmostEqual(ab_gate.computed_probabilities[0], 0.01, places=15)  # independent inputs, so exact
+        self.assertEqual(ab_gate.computed_probability_standard_errors[0], 0)
+        self.assertLess(abs(vote_gate.computed_probabilities[0] - q_vote), 4 * standard_error)
+        self.assertAlmostEqual(vote_gate.computed_probability_standard_errors[0], standard_error, places=5)
+        self.assertLess(abs(vote_gate.computed_intensities[0] - omega_vote), 0.05 * omega_vote)
+        self.assertTrue(math.isnan(vote_gate.computed_probability_lower_bounds[0]))
+        self.assertAlmostEqual(  # propagated from independent inputs
+            top.computed_probability_standard_errors[0], 0.1 * vote_gate.computed_probability_standard_errors[0],
+            places=15,
+        )
+        self.assertEqual(  # reproducible by seed
+            vote_gate.computed_probabilities, FaultTree(fault_tree_text).gates[3].computed_probabilities,
+        )
+        self.assertAlmostEqual(  # marginal importance of A, simulated from cut sets
+            fault_tree.compile_importance_tables()['TOP'].data[0][4], 2 * 0.1 - 2 * 0.1**2, places=2,
+        )
+
+    def test_probability_bounds(self):
+        # Bad computational gap
+        self.assertRaises(
+            InvalidComputationalGapException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_absolute_gap: -1e-16
+            '''),
+        )
+        self.assertRaises(
+            InvalidComputationalGapException,
+            FaultTree,
+            textwrap.dedent('''
+                - times: 1
+                - computational_relative_gap: 1
+            '''),
+        )
+
+        # Bonferroni bounds and adaptive truncation
+        for property_line, q_expected, q_lower_expected, q_upper_expected in [
+            ('', 0.028, 0.028, 0.028),
+            ('- computational_order: 1', 0.03, 0, 0.03),
+            ('- computational_order: 2', 0.027, 0.027, 0.03),
+            ('- computational_absolute_gap: 0.005', 0.027, 0.027, 0.03),
+            ('- computational_absolute_gap: 0.001', 0.028, 0.028, 0.028),
+            ('- computational_relative_gap: 0.2', 0.027, 0.027, 0.03),
+            ('- computational_relative_gap: 0.05', 0.028, 0.028, 0.028),
+        ]:
+            fault_tree = FaultTree(two_out_of_three_text(property_line))
+            ab_gate = fault_tree.gates[0]
+            top = fault_tree.gates[-1]
+            self.assertAlmostEqual(ab_gate.computed_probability_lower_bounds[0], 0.01, places=15)
+            self.assertAlmostEqual(ab_gate.computed_probability_upper_bounds[0], 0.01, places=15)
+            self.assertAlmostEqual(top.computed_probabilities[0], q_expected, places=15)
+            self.assertAlmostEqual(top.computed_probability_lower_bounds[0], q_lower_expected, places=15)
+            self.assertAlmostEqual(top.computed_probability_upper_bounds[0], q_upper_expected, places=15)
+
+    def test_birnbaum_intensities(self):
+        for property_line, q_expected, omega_expected in [
+            ('', 0.028, 0.0054),
+            ('- computational_order: 1', 0.03, 0.0054),  # probability truncated, but intensity exact
+        ]:
+            fault_tree = FaultTree(two_out_of_three_text('- intensity_method: BirnbaumSum', property_line))
+            top = fault_tree.gates[-1]
+            self.assertEqual(fault_tree.intensity_method, IntensityMethod.BIRNBAUM_SUM)
+            self.assertAlmostEqual(top.computed_probabilities[0], q_expected, places=15)
+            self.assertAlmostEqual(top.computed_probability_upper_bounds[0], q_expected, places=15)
+            self.assertAlmostEqual(top.computed_intensities[0], omega_expected, places=15)
+
+    def test_importance_measures(self):
+        # Importance measures
+        for property_line in ('', '- computational_method: RareEvent', '- computational_order: 2'):
+            fault_tree = FaultTree(two_out_of_three_text(property_line))
+            importance_table_from_gate_id = fault_tree.compile_importance_tables()
+            is_rare_event = 'RareEvent' in property_line
+            q_top = fault_tree.gates[-1].computed_probabilities[0]
+            q_partial_true = 0.2 if is_rare_event else 0.19  # q[B + C]
+            q_partial_false = 0.01  # q[BC]
+            q_filtered = 0.02 if is_rare_event else 0.019  # q[AB + CA]
+            expected_values = [
+                q_partial_true - q_partial_false,
+                (q_partial_true - q_partial_false) * 0.1 / q_top,
+                q_filtered / q_top,
+                (q_top - q_partial_false) / q_top,
+                q_partial_true / q_top,
+                q_top / q_partial_false,
+            ]
+
+            for value, expected_value in zip(importance_table_from_gate_id['TOP'].data[0][4:], expected_values):
+                self.assertAlmostEqual(value, expected_value, places=12)
+
+            self.assertEqual(importance_table_from_gate_id['AB'].data[0][-1], float('inf'))  # q[AB] / q[B (A=False)]
+
+        # Exact importances of an event that cannot fail (cofactors bracketing the gate probability)
+        fault_tree = FaultTree(textwrap.dedent('''
+            - times: 1
+            - computational_method: BinaryDecisionDiagram
+
+            Event: A
+            - model_type: Fixed
+            - probability: 0.1
+            - intensity: 0
+
+            Event: B
+            - model_type: Fixed
+            - probability: 0.2
+            - intensity: 0
+
+            Event: C
+            - model_type: Fixed
+            - probability: 0.3
+            - intensity: 0
+
+            Event: D
+            - model_type: Fixed
+            - probability: 0
+            - intensity: 600
+
+            Event: E
+            - model_type: Fixed
+            - probability: 0.4
+            - intensity: 0
+
+            Gate: VOTE
+            - type: VOTE(3)
+            - inputs: A, B, C, D, E
+        '''))
+        d_row = next(row for row in fault_tree.compile_importance_tables()['VOTE'].data if row[0] == 'D')
+        self.assertGreater(d_row[4], 0)  # marginal
+        self.assertEqual(d_row[7], 0)  # prognostic
+        self.assertEqual(d_row[9], 1)  # risk reduction worth
+
+        # Staircase importances with tolerance truncation only (no combinations pruned), against the diagram
+        depth = 20
+        importance_data_from_method = {}
+
+        for computational_method in ('InclusionExclusion', 'BinaryDecisionDiagram'):
+            fault_tree = FaultTree('\n\n'.join([
+                textwrap.dedent(f'''
+                    - times: nan
+                    - computational_tolerance: 5e-3
+                    - computational_method: {computational_method}
+
+                    Model: MODEL
+                    - model_type: Fixed
+                    - probability: 0.1
+                    - intensity: 0
+
+                    Event: BASE
+                    - model: MODEL
+                '''),
+                *(f'Event: {kind}_CHILD_{level}\n- model: MODEL' for kind in ('AND', 'OR') for level in range(depth)),
+                *(
+                    f'Gate: AND_GATE_{level}\n- type: AND\n- inputs: AND_CHILD_{level}, OR_GATE_{level}'
+                    for level in range(depth)
+                ),
+                *(
+                    f'Gate: OR_GATE_{level}\n- type: OR\n- inputs: OR_CHILD_{level}, '
+                    + (f'AND_GATE_{level + 1}' if level < depth - 1 else 'BASE')
+                    for level in range(depth)
+                ),
+            ]))
+            importance_table = fault_tree.compile_importance_tables()['AND_GATE_0']
+            importance_data_from_method[computational_method] = importance_table.data
+
+        for row, exact_row in zip(*importance_data_from_method.values()):
+            for column_index in (4, 7):  # marginal and prognostic importance
+                self.assertGreaterEqual(row[column_index], 0)
+                self.assertAlmostEqual(row[column_index], exact_row[column_index], delta=1e-4)
+
+    def test_modularisation(self):
+        # Modularisation
+        for computational_method in ('InclusionExclusion', 'BinaryDecisionDiagram'):
+            fault_tree = FaultTree(textwrap.dedent(f'''
+                - times: 1
+                - computational_method: {computational_method}
+
+                Model: M
+                - model_type: Fixed
+                - probability: 0.1
+                - intensity: 0.01
+
+                Event: A
+                - model: M
+
+                Event: B
+                - model: M
+
+                Event: C
+                - model: M
+
+                Event: D
+                - model: M
+
+                Event: E
+                - model: M
+
+                Event: F
+                - model: M
+
+                Gate: TOP
+                - type: OR
+                - inputs: SHARING_1, SHARING_2, MODULE
+
+                Gate: SHARING_1
+                - type: AND
+                - inputs: A, B
+
+                Gate: SHARING_2
+                - type: AND
+                - inputs: A, C
+
+                Gate: MODULE
+                - type: AND
+                - inputs: D_OR_E, F
+
+                Gate: D_OR_E
+                - type: OR
+                - inputs: D, E
+            '''))
+            top, sharing_1, sharing_2, module, d_or_e = fault_tree.gates
+            self.assertEqual(
+                [gate.module_index for gate in fault_tree.gates],
+                [8, None, None, 7, 6],  # pseudo-event indices follow the 6 event indices, in identifier order
+            )
+            self.assertEqual(
+                top.computed_expression,
+                Expression(Term(0b000011), Term(0b000101), Term(0b101000), Term(0b110000)),
+            )
+            self.assertEqual(
+                top.computed_modular_expression,
+                Expression(Term(0b000011), Term(0b000101), Term(0b10000000)),
+            )
+            self.assertEqual(module.computed_modular_expression, Expression(Term(0b1100000)))  # (D_OR_E) F
+            self.assertIs(d_or_e.computed_modular_expression, d_or_e.computed_expression)
+
+            q_sharing = 0.1 * (1 - 0.9**2)  # A (B + C)
+            q_module = (1 - 0.9**2) * 0.1  # (D + E) F
+            self.assertAlmostEqual(top.computed_probabilities[0], 1 - (1 - q_sharing) * (1 - q_module), places=15)
+
     def test_model(self):
         # Unset model type
         self.assertRaises(
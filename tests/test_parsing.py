@@ -15,6 +15,7 @@ from pfta.parsing import (
     InvalidKeyException, DuplicateKeyException, InvalidClassException,
     InvalidFloatException, InvalidIntegerException,
     InvalidModelTypeException, InvalidBooleanException, InvalidGateTypeException,
+    InvalidComputationalMethodException, InvalidIntensityMethodException, InvalidCutSetRepresentationException,
     InvalidDistributionException,
     ParsedLine, ParsedParagraph, ParsedAssembly,
     split_by_comma, is_valid_id,
@@ -462,6 +463,48 @@ class TestParsing(unittest.TestCase):
             ),
         )
 
+        # Invalid computational method
+        self.assertRaises(
+            InvalidComputationalMethodException,
+            parse_fault_tree_properties,
+            ParsedAssembly(
+                class_='FaultTree',
+                id_=None,
+                object_line=None,
+                property_lines=[
+                    ParsedLine(1, LineType.PROPERTY, info={'key': 'computational_method', 'value': 'BDD'})
+                ],
+            ),
+        )
+
+        # Invalid intensity method
+        self.assertRaises(
+            InvalidIntensityMethodException,
+            parse_fault_tree_properties,
+            ParsedAssembly(
+                class_='FaultTree',
+                id_=None,
+                object_line=None,
+                property_lines=[
+                    ParsedLine(1, LineType.PROPERTY, info={'key': 'intensity_method', 'value': 'Birnbaum'})
+                ],
+            ),
+        )
+
+        # Invalid cut set representation
+        self.assertRaises(
+            InvalidCutSetRepresentationException,
+            parse_fault_tree_properties,
+            ParsedAssembly(
+                class_='FaultTree',
+                id_=None,
+                object_line=None,
+                property_lines=[
+                    ParsedLine(1, LineType.PROPERTY, info={'key': 'cut_set_representation', 'value': 'ZBDD'})
+                ],
+            ),
+        )
+
     def test_parse_event_properties(self):
         # Reasonable event
         try:
@@ -638,3 +681,17 @@ class TestParsing(unittest.TestCase):
                 ],
             ),
         )
+
+        # Invalid computational method
+        self.assertRaises(
+            InvalidComputationalMethodException,
+            parse_gate_properties,
+            ParsedAssembly(
+                class_='Gate',
+                id_='GT-001',
+                object_line=ParsedLine(4, LineType.OBJECT, info={'class': 'Gate', 'id': 'GT-001'}),
+                property_lines=[
+                    ParsedLine(5, LineType.PROPERTY, info={'key': 'computational_method', 'value': 'MCUB'})
+                ],
+            ),
+        )
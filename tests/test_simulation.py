@@ -0,0 +1,54 @@
+"""
+# Public Fault Tree Analyser: test_simulation.py
+
+Unit testing for `simulation.py`.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import random
+import unittest
+
+from pfta.constants import GateType
+from pfta.simulation import bernoulli_states, conjunction_states, disjunction_states, vote_states, gate_states
+
+
+class TestSimulation(unittest.TestCase):
+    def test_bernoulli_states(self):
+        trial_count = 1 << 16
+        random_ = random.Random('test')
+
+        self.assertEqual(bernoulli_states(0, trial_count, random_), 0)
+        self.assertEqual(bernoulli_states(1, trial_count, random_), (1 << trial_count) - 1)
+        self.assertEqual(  # reproducible by seed
+            bernoulli_states(0.5, trial_count, random.Random('seed')),
+            bernoulli_states(0.5, trial_count, random.Random('seed')),
+        )
+
+        for probability in (0.5, 0.1, 1e-3):
+            fraction = bernoulli_states(probability, trial_count, random_).bit_count() / trial_count
+            standard_error = (probability * (1 - probability) / trial_count) ** 0.5
+            self.assertLess(abs(fraction - probability), 4 * standard_error)
+
+    def test_conjunction_states(self):
+        self.assertEqual(conjunction_states([], 0b1111), 0b1111)
+        self.assertEqual(conjunction_states([0b1100, 0b1010], 0b1111), 0b1000)
+
+    def test_disjunction_states(self):
+        self.assertEqual(disjunction_states([]), 0)
+        self.assertEqual(disjunction_states([0b1100, 0b1010]), 0b1110)
+
+    def test_vote_states(self):
+        a, b, c = 0b11110000, 0b11001100, 0b10101010  # all eight combinations
+
+        self.assertEqual(vote_states([a, b, c], 1, 0b11111111), a | b | c)
+        self.assertEqual(vote_states([a, b, c], 2, 0b11111111), a & b | b & c | c & a)
+        self.assertEqual(vote_states([a, b, c], 3, 0b11111111), a & b & c)
+
+    def test_gate_states(self):
+        self.assertEqual(gate_states(GateType.NULL, None, [0b1100], 0b1111), 0b1100)
+        self.assertEqual(gate_states(GateType.AND, None, [0b1100, 0b1010], 0b1111), 0b1000)
+        self.assertEqual(gate_states(GateType.OR, None, [0b1100, 0b1010], 0b1111), 0b1110)
+        self.assertEqual(gate_states(GateType.VOTE, 2, [0b1100, 0b1010, 0b0110], 0b1111), 0b1110)
@@ -12,7 +12,11 @@ import math
 import sys
 import unittest
 
-from pfta.utilities import format_number, descending_product, descending_sum, find_cycles
+from pfta.utilities import (
+    format_number, descending_product, descending_sum,
+    elementwise_sum, elementwise_product, elementwise_scale,
+    vote_counts, find_cycles, find_modules,
+)
 
 
 class TestUtilities(unittest.TestCase):
@@ -168,6 +172,40 @@ class TestUtilities(unittest.TestCase):
         self.assertNotEqual(sum(terms_1), sum(terms_2)) if sys.version_info < (3, 12) else None
         self.assertEqual(descending_sum(terms_1), descending_sum(terms_2))
 
+    def test_elementwise_sum(self):
+        self.assertEqual(elementwise_sum([], 0), [])
+        self.assertEqual(elementwise_sum([], 3), [0., 0., 0.])
+        self.assertEqual(elementwise_sum([[1, 2, 3]], 3), [1, 2, 3])
+        self.assertEqual(elementwise_sum([[1, 2, 3], [0.5, 0.25, 0.125], [-1, -2, -3]], 3), [0.5, 0.25, 0.125])
+
+        # Summed in descending order, independent of column order (see `test_descending_sum`)
+        columns_1 = [[1e-9], [2.5e-12], [5e-13], [5e-10], [2.5e-12]]
+        columns_2 = [[1e-9], [5e-10], [2.5e-12], [2.5e-12], [5e-13]]
+        self.assertEqual(elementwise_sum(columns_1, 1), [1.5055e-09])
+        self.assertEqual(elementwise_sum(columns_1, 1), elementwise_sum(columns_2, 1))
+
+        # Summed a batch of columns at a time
+        self.assertEqual(elementwise_sum(iter([[1, 2], [3, 4], [5, 6]]), 2, chunk_size=4), [9, 12])
+        self.assertEqual(elementwise_sum(iter([[1, 2], [3, 4], [5, 6]]), 2, chunk_size=1), [9, 12])
+
+    def test_elementwise_product(self):
+        self.assertEqual(elementwise_product([], []), [])
+        self.assertEqual(elementwise_product([1, 2, 3], [0.5, 0.25, 0.125]), [0.5, 0.5, 0.375])
+
+    def test_elementwise_scale(self):
+        self.assertEqual(elementwise_scale(-1, []), [])
+        self.assertEqual(elementwise_scale(-1, [1, 2, 3]), [-1, -2, -3])
+
+    def test_vote_counts(self):
+        # 2 out of 4: at least 1 not needed after step 3, at least 2 not attainable before step 2
+        self.assertEqual(list(vote_counts(1, 4, 2)), [1])
+        self.assertEqual(list(vote_counts(2, 4, 2)), [2, 1])
+        self.assertEqual(list(vote_counts(3, 4, 2)), [2, 1])
+        self.assertEqual(list(vote_counts(4, 4, 2)), [2])
+
+        # 0 out of 4: nothing to update
+        self.assertEqual(list(vote_counts(1, 4, 0)), [])
+
     def test_find_cycles(self):
         self.assertEqual(
             find_cycles({}),
@@ -212,3 +250,51 @@ class TestUtilities(unittest.TestCase):
             }),
             {(1, 2, 5, 4), (2, 5, 4), (6,), (2, 5, 6, 3)},
         )
+
+    def test_find_modules(self):
+        self.assertEqual(
+            find_modules({}),
+            set(),
+        )
+        self.assertEqual(
+            find_modules({
+                1: [2, 'a'],
+                2: ['b', 'c'],
+            }),
+            {1, 2},
+        )
+        self.assertEqual(
+            find_modules({
+                1: [2, 3],
+                2: ['a', 'b'],
+                3: ['b', 'c'],
+            }),
+            {1},
+        )
+        self.assertEqual(
+            find_modules({
+                1: [2, 3, 'a'],
+                2: [4, 'b'],
+                3: [4, 'c'],
+                4: ['d', 'e'],
+            }),
+            {1, 4},
+        )
+        self.assertEqual(
+            find_modules({
+                1: [3, 'a'],
+                2: [3, 'a'],
+                3: ['b', 'c'],
+            }),
+            {3},
+        )
+
+        # Chain of gates deeper than the recursion limit
+        chain_length = 5000
+        self.assertEqual(
+            find_modules({
+                i: [i + 1, f'e{i}'] if i < chain_length - 1 else [f'e{i}']
+                for i in range(chain_length)
+            }),
+            set(range(chain_length)),
+        )
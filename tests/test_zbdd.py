@@ -0,0 +1,123 @@
+"""
+# Public Fault Tree Analyser: test_zbdd.py
+
+Unit testing for `zbdd.py`.
+
+**Copyright 2025 Conway.**
+Licensed under the GNU General Public License v3.0 (GPL-3.0-only).
+This is free software with NO WARRANTY etc. etc., see LICENSE.
+"""
+
+import unittest
+
+from pfta.boolean import Term, Expression, Truncator
+from pfta.zbdd import EMPTY_NODE, BASE_NODE, ZeroSuppressedDiagram
+
+
+class TestZbdd(unittest.TestCase):
+    def test_make_node(self):
+        diagram = ZeroSuppressedDiagram()
+
+        # Zero suppression
+        self.assertEqual(diagram.make_node(0, BASE_NODE, EMPTY_NODE), BASE_NODE)
+
+        # Uniqueness
+        self.assertEqual(diagram.make_node(0, EMPTY_NODE, BASE_NODE), diagram.make_node(0, EMPTY_NODE, BASE_NODE))
+        self.assertNotEqual(diagram.make_node(0, EMPTY_NODE, BASE_NODE), diagram.make_node(1, EMPTY_NODE, BASE_NODE))
+
+    def test_from_expression(self):
+        diagram = ZeroSuppressedDiagram()
+
+        # False, True
+        self.assertEqual(diagram.from_expression(Expression()).node, EMPTY_NODE)
+        self.assertEqual(diagram.from_expression(Expression(Term(0))).node, BASE_NODE)
+
+        # A + AB = A
+        self.assertEqual(
+            diagram.from_expression(Expression(Term(0b01), Term(0b11))),
+            diagram.from_expression(Expression(Term(0b01))),
+        )
+
+        # Round trip
+        expression = Expression(Term(0b011), Term(0b110), Term(0b101))
+        self.assertEqual(diagram.from_expression(expression).terms, expression.terms)
+        self.assertNotEqual(diagram.from_expression(expression), expression)  # never equal, being hashed differently
+
+    def test_conjunction(self):
+        diagram = ZeroSuppressedDiagram()
+        a, b, c = (diagram.from_expression(Expression(Term(1 << i))) for i in range(3))
+
+        # (A + B) (A + C) = A + BC
+        self.assertEqual(
+            diagram.conjunction(diagram.disjunction(a, b), diagram.disjunction(a, c)).terms,
+            Expression(Term(0b001), Term(0b110)).terms,
+        )
+
+        # Empty conjunction is True
+        self.assertEqual(diagram.conjunction().node, BASE_NODE)
+
+    def test_disjunction(self):
+        diagram = ZeroSuppressedDiagram()
+        a, b = (diagram.from_expression(Expression(Term(1 << i))) for i in range(2))
+
+        # A + AB = A
+        self.assertEqual(diagram.disjunction(a, diagram.conjunction(a, b)), a)
+
+        # Empty disjunction is False
+        self.assertEqual(diagram.disjunction().node, EMPTY_NODE)
+
+    def test_vote(self):
+        diagram = ZeroSuppressedDiagram()
+        expressions = [Expression(Term(0b0011)), Expression(Term(0b0101)), Expression(Term(0b1000))]
+        diagram_expressions = [diagram.from_expression(expression) for expression in expressions]
+
+        for threshold in range(5):
+            self.assertEqual(
+                diagram.vote(*diagram_expressions, threshold=threshold).terms,
+                Expression.vote(*expressions, threshold=threshold).terms,
+            )
+
+    def test_substitutions(self):
+        diagram = ZeroSuppressedDiagram()
+        expression = Expression(Term(0b011), Term(0b101), Term(0b110))
+        diagram_expression = diagram.from_expression(expression)
+
+        for event_index in range(3):
+            for method_name in ('substitute_true', 'substitute_false', 'filter_terms'):
+                self.assertEqual(
+                    getattr(diagram_expression, method_name)(event_index).terms,
+                    getattr(expression, method_name)(event_index).terms,
+                )
+
+    def test_count(self):
+        diagram = ZeroSuppressedDiagram()
+        inputs = [
+            diagram.disjunction(*(diagram.from_expression(Expression(Term(1 << (4*k + j)))) for j in range(4)))
+            for k in range(10)
+        ]
+
+        # Product of ten 4-term disjunctions has 4^10 terms, counted without enumeration
+        self.assertEqual(diagram.conjunction(*inputs).term_count(), 4 ** 10)
+
+    def test_truncate(self):
+        truncator = Truncator({0: 0.1, 1: 0.01, 2: 0.001}, cutoff=1e-4)
+        diagram = ZeroSuppressedDiagram(truncator)
+        a, b, c = (diagram.from_expression(Expression(Term(1 << i))) for i in range(3))
+
+        # (A + B)(A + C) = A + BC, with BC (weight 1e-5) discarded
+        self.assertEqual(
+            diagram.conjunction(diagram.disjunction(a, b), diagram.disjunction(a, c)).terms,
+            Expression(Term(0b001)).terms,
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 1e-5, places=15)
+
+        # (A + B)(A + C) with maximum order 1 = A, with BC discarded
+        truncator = Truncator({0: 0.1, 1: 0.01, 2: 0.001}, max_order=1)
+        diagram = ZeroSuppressedDiagram(truncator)
+        a, b, c = (diagram.from_expression(Expression(Term(1 << i))) for i in range(3))
+
+        self.assertEqual(
+            diagram.conjunction(diagram.disjunction(a, b), diagram.disjunction(a, c)).terms,
+            Expression(Term(0b001)).terms,
+        )
+        self.assertAlmostEqual(truncator.discarded_weight, 1e-5, places=15)